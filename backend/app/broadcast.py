@@ -0,0 +1,223 @@
+# app/broadcast.py
+"""Broadcast backends behind the SSE manager.
+
+The event pipeline (app.events) hands batches to `broadcaster.publish_many()`,
+which is safe to call from the event loop or from a threadpool worker:
+
+- InProcessBroadcaster delivers straight into this process's SSEManager.
+- SQLiteOutboxBroadcaster appends the event to an `sse_outbox` table; every
+  worker tails that table and delivers rows in id order, using the row id as
+  the SSE sequence number. Event ids (and Last-Event-ID replay) are therefore
+  identical on every worker, with no external services required.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import FrozenSet, List, Optional, Tuple
+
+import anyio
+from sqlalchemy import create_engine, text
+
+from .config import settings
+from .realtime import EventMeta, SSEManager, sse
+
+OUTBOX_DDL = [
+    """CREATE TABLE IF NOT EXISTS sse_outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        payload TEXT NOT NULL,
+        labels TEXT NOT NULL DEFAULT '{}',
+        created_at REAL NOT NULL
+    )""",
+    "CREATE TABLE IF NOT EXISTS sse_outbox_epoch (epoch TEXT NOT NULL)",
+]
+FETCH_BATCH = 1000
+PRUNE_EVERY_S = 5.0
+
+# (event, owners, statuses) as produced by the event pipeline
+Item = Tuple[dict, FrozenSet[str], FrozenSet[str]]
+
+
+def _on_loop(loop: Optional[asyncio.AbstractEventLoop]) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+class InProcessBroadcaster:
+    """Events only reach clients connected to this process."""
+
+    def __init__(self, manager: SSEManager) -> None:
+        self.manager = manager
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        pass
+
+    def _deliver(self, items: List[Item]) -> None:
+        for data, owners, statuses in items:
+            self.manager.publish(data, owners=owners, statuses=statuses)
+
+    def publish_many(self, items: List[Item]) -> None:
+        if self.loop is None:
+            # not started (no lifespan): fall back to whatever loop we can reach
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                anyio.from_thread.run_sync(self._deliver, items)
+            else:
+                self._deliver(items)
+        elif _on_loop(self.loop):
+            self._deliver(items)
+        else:
+            self.loop.call_soon_threadsafe(self._deliver, items)
+
+
+class SQLiteOutboxBroadcaster:
+    """Cross-process fan-out through an append-only SQLite table."""
+
+    def __init__(
+        self,
+        manager: SSEManager,
+        url: str,
+        *,
+        poll_interval: float,
+        retention: int,
+    ) -> None:
+        self.manager = manager
+        self.engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000},
+        )
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.last_id = 0
+        self._kick: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # one writer thread keeps batches in emission order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sse-outbox")
+
+    # ---------- lifecycle ----------
+    def _setup(self) -> Tuple[str, int]:
+        with self.engine.begin() as conn:
+            for stmt in OUTBOX_DDL:
+                conn.execute(text(stmt))
+            conn.execute(
+                text(
+                    "INSERT INTO sse_outbox_epoch (epoch) SELECT :e "
+                    "WHERE NOT EXISTS (SELECT 1 FROM sse_outbox_epoch)"
+                ),
+                {"e": uuid.uuid4().hex[:12]},
+            )
+            epoch = conn.execute(text("SELECT epoch FROM sse_outbox_epoch LIMIT 1")).scalar_one()
+            head = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM sse_outbox")).scalar_one()
+        return epoch, head
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self._kick = asyncio.Event()
+        epoch, head = await anyio.to_thread.run_sync(self._setup)
+        self.manager.epoch = epoch
+        # backfill the ring so Last-Event-ID replay works right after a restart
+        self.last_id = max(0, head - self.manager.capacity)
+        await self._poll()
+        self._task = asyncio.create_task(self._tail())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._writer.shutdown(wait=True)
+        self.engine.dispose()
+
+    # ---------- write side ----------
+    def _insert(self, rows: List[dict]) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO sse_outbox (payload, labels, created_at) VALUES (:p, :l, :t)"),
+                rows,
+            )
+
+    def publish_many(self, items: List[Item]) -> None:
+        now = time.time()
+        rows = [
+            {
+                "p": json.dumps(data, default=str),
+                "l": json.dumps({"owners": sorted(owners), "statuses": sorted(statuses)}),
+                "t": now,
+            }
+            for data, owners, statuses in items
+        ]
+        fut = self._writer.submit(self._insert, rows)
+        if self.loop is not None:
+            # local writes show up without waiting for the next poll tick
+            fut.add_done_callback(lambda _: self.loop.call_soon_threadsafe(self._kick.set))  # type: ignore[union-attr]
+
+    # ---------- read side ----------
+    def _fetch(self, after: int) -> List[Tuple[int, str, str]]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT id, payload, labels FROM sse_outbox WHERE id > :after ORDER BY id LIMIT :n"),
+                {"after": after, "n": FETCH_BATCH},
+            )
+            return [tuple(r) for r in rows]  # type: ignore[misc]
+
+    def _prune(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM sse_outbox WHERE id <= (SELECT MAX(id) FROM sse_outbox) - :keep"),
+                {"keep": self.retention},
+            )
+
+    async def _poll(self) -> None:
+        while True:
+            rows = await anyio.to_thread.run_sync(self._fetch, self.last_id)
+            for row_id, payload, labels in rows:
+                lab = json.loads(labels)
+                meta = EventMeta(json.loads(payload), lab.get("owners"), lab.get("statuses"))
+                self.manager.deliver(row_id, payload, meta)
+                self.last_id = row_id
+            if len(rows) < FETCH_BATCH:
+                return
+
+    async def _tail(self) -> None:
+        assert self._kick is not None
+        next_prune = time.monotonic() + PRUNE_EVERY_S
+        while True:
+            try:
+                await asyncio.wait_for(self._kick.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._kick.clear()
+            try:
+                await self._poll()
+                if time.monotonic() >= next_prune:
+                    next_prune = time.monotonic() + PRUNE_EVERY_S
+                    await anyio.to_thread.run_sync(self._prune)
+            except Exception:  # pragma: no cover - keep tailing through transient lock errors
+                await asyncio.sleep(self.poll_interval)
+
+
+def create_broadcaster(manager: SSEManager):
+    if settings.sse_backend == "sqlite":
+        return SQLiteOutboxBroadcaster(
+            manager,
+            settings.sse_outbox_url,
+            poll_interval=settings.sse_poll_interval_ms / 1000,
+            retention=settings.sse_outbox_retention,
+        )
+    return InProcessBroadcaster(manager)
+
+
+broadcaster = create_broadcaster(sse)
@@ -0,0 +1,60 @@
+# app/changes.py
+"""Trigger-maintained change sequence for delta sync (GET /projects/changes).
+
+`change_counter` holds one global sequence. Every write that alters what a
+client shows for a project takes the next value and stores it in
+`projects.change_seq`. That covers the project row itself (create, update,
+soft delete, recover), its team and milestones, and new activity events.
+SQLite runs one writer at a time, so sequence order is commit order. A
+client that synced up to N therefore sees every later change by asking
+for `change_seq > N`, whatever the clocks say.
+
+Event deletes do not stamp. Retention compaction moving old rows to
+`events_archive` is not a change clients need to see.
+"""
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+def _stamp(pid: str) -> str:
+    return (
+        "UPDATE change_counter SET seq = seq + 1;\n"
+        f"UPDATE projects SET change_seq = (SELECT seq FROM change_counter) WHERE id = {pid};"
+    )
+
+DDL = [
+    """CREATE TABLE IF NOT EXISTS change_counter (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        seq INTEGER NOT NULL
+    )""",
+    "INSERT OR IGNORE INTO change_counter (id, seq) SELECT 0, coalesce(max(change_seq), 0) FROM projects",
+    f"""CREATE TRIGGER IF NOT EXISTS projects_changes_ai AFTER INSERT ON projects BEGIN
+        {_stamp('new.id')}
+    END""",
+    # any column but change_seq itself (which the stamp writes)
+    f"""CREATE TRIGGER IF NOT EXISTS projects_changes_au AFTER UPDATE ON projects
+        WHEN new.change_seq IS old.change_seq BEGIN
+        {_stamp('new.id')}
+    END""",
+    *[
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_changes_{suffix} AFTER {op} ON {table} BEGIN
+            {_stamp(f'{row}.project_id')}
+        END"""
+        for table in ("team_members", "milestones")
+        for suffix, op, row in (("ai", "INSERT", "new"), ("au", "UPDATE", "new"), ("ad", "DELETE", "old"))
+    ],
+    f"""CREATE TRIGGER IF NOT EXISTS events_changes_ai AFTER INSERT ON events BEGIN
+        {_stamp('new.project_id')}
+    END""",
+]
+
+def ensure_changes(engine: Engine) -> None:
+    """Create the counter (starting after any existing change_seq) and triggers if missing."""
+    with engine.begin() as conn:
+        for stmt in DDL:
+            conn.execute(text(stmt))
+
+def current_seq(conn) -> int:
+    """The newest change number (`conn`: Connection or Session)."""
+    return conn.execute(text("SELECT seq FROM change_counter")).scalar_one()
@@ -0,0 +1,107 @@
+# app/config.py
+"""Runtime settings, read once from the environment at import time."""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    return int(raw) if raw not in (None, "") else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: str = "sqlite:///./projects.db"
+    # DB_ASYNC=1 serves requests from an asyncio engine (requires aiosqlite)
+    db_async: bool = False
+
+    # "default": one engine with SQLite defaults (development).
+    # "production": WAL + tuned pragmas, a single writer connection and a
+    # pool of read-only connections for GET endpoints.
+    db_profile: str = "default"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # bytes
+    sqlite_cache_size: int = -64_000  # negative = KiB, i.e. ~64 MB per connection
+    sqlite_busy_timeout_ms: int = 5_000
+    db_reader_pool_size: int = 4
+
+    # domain events are buffered this long and coalesced before broadcasting
+    event_batch_window_ms: int = 5
+
+    # GET /projects response cache (0 entries disables it)
+    list_cache_size: int = 256
+    list_cache_ttl_s: int = 30
+
+    # serve GET /projects filter/sort/page from an in-memory index of live projects
+    read_model: bool = False
+
+    # background bulk jobs: projects handled (and committed) per chunk
+    bulk_job_chunk_size: int = 1_000
+
+    # "manual": progress is whatever clients set.
+    # "derived": progress = share of done milestones, kept current by the
+    # milestone endpoints from the projects.milestones_total/_done counters.
+    progress_mode: str = "manual"
+
+    # events older than this many days move to events_archive (0 keeps everything)
+    event_retention_days: int = 0
+    event_compaction_interval_s: int = 3_600
+
+    # SSE: frames kept for replay / slow clients, and backlog counted as "lagging"
+    sse_buffer_size: int = 2048
+    sse_lag_threshold: int = 256
+    # "memory": events reach clients of this process only (single worker).
+    # "sqlite": events go through an outbox table that every worker tails,
+    # so `uvicorn --workers N` delivers every event to every client.
+    sse_backend: str = "memory"
+    sse_outbox_url: str = ""  # defaults to database_url
+    sse_poll_interval_ms: int = 50
+    sse_outbox_retention: int = 10_000  # rows kept for replay / slow workers
+
+    @property
+    def production_profile(self) -> bool:
+        return self.db_profile == "production"
+
+    @property
+    def derived_progress(self) -> bool:
+        return self.progress_mode == "derived"
+
+
+def load_settings() -> Settings:
+    d = Settings()
+    return Settings(
+        database_url=os.getenv("DATABASE_URL", d.database_url),
+        db_async=_env_bool("DB_ASYNC", d.db_async),
+        db_profile=os.getenv("DB_PROFILE", d.db_profile).strip().lower(),
+        sqlite_synchronous=os.getenv("SQLITE_SYNCHRONOUS", d.sqlite_synchronous).upper(),
+        sqlite_mmap_size=_env_int("SQLITE_MMAP_SIZE", d.sqlite_mmap_size),
+        sqlite_cache_size=_env_int("SQLITE_CACHE_SIZE", d.sqlite_cache_size),
+        sqlite_busy_timeout_ms=_env_int("SQLITE_BUSY_TIMEOUT_MS", d.sqlite_busy_timeout_ms),
+        db_reader_pool_size=_env_int("DB_READER_POOL_SIZE", d.db_reader_pool_size),
+        event_batch_window_ms=_env_int("EVENT_BATCH_WINDOW_MS", d.event_batch_window_ms),
+        list_cache_size=_env_int("LIST_CACHE_SIZE", d.list_cache_size),
+        list_cache_ttl_s=_env_int("LIST_CACHE_TTL_S", d.list_cache_ttl_s),
+        read_model=_env_bool("READ_MODEL", d.read_model),
+        bulk_job_chunk_size=_env_int("BULK_JOB_CHUNK_SIZE", d.bulk_job_chunk_size),
+        progress_mode=os.getenv("PROGRESS_MODE", d.progress_mode).strip().lower(),
+        event_retention_days=_env_int("EVENT_RETENTION_DAYS", d.event_retention_days),
+        event_compaction_interval_s=_env_int("EVENT_COMPACTION_INTERVAL_S", d.event_compaction_interval_s),
+        sse_buffer_size=_env_int("SSE_BUFFER_SIZE", d.sse_buffer_size),
+        sse_lag_threshold=_env_int("SSE_LAG_THRESHOLD", d.sse_lag_threshold),
+        sse_backend=os.getenv("SSE_BACKEND", d.sse_backend).strip().lower(),
+        sse_outbox_url=os.getenv("SSE_OUTBOX_URL", "") or os.getenv("DATABASE_URL", d.database_url),
+        sse_poll_interval_ms=_env_int("SSE_POLL_INTERVAL_MS", d.sse_poll_interval_ms),
+        sse_outbox_retention=_env_int("SSE_OUTBOX_RETENTION", d.sse_outbox_retention),
+    )
+
+
+settings = load_settings()
@@ -1,26 +1,124 @@
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-# Define the database URL (using SQLite in this case)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./projects.db"
+from .config import settings
 
-# Create the SQLAlchemy engine with SQLite-specific connection arguments
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+# Database URL comes from the environment (DATABASE_URL), SQLite by default
+SQLALCHEMY_DATABASE_URL = settings.database_url
+ASYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+DB_ASYNC = settings.db_async
+_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+_PRODUCTION = _SQLITE and settings.production_profile
+
+
+def _apply_pragmas(engine: Engine, *, read_only: bool) -> None:
+    """Per-connection SQLite tuning for the production profile."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cur = dbapi_connection.cursor()
+        if not read_only:
+            # persistent in the file; readers inherit it
+            cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cur.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cur.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+        cur.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        if read_only:
+            cur.execute("PRAGMA query_only=ON")
+        cur.close()
+
+
+def _make_engine(url: str, *, read_only: bool, is_async: bool = False) -> Engine:
+    kwargs = {}
+    if _SQLITE and not is_async:
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if _PRODUCTION:
+        # one writer connection serializes mutations inside this process;
+        # readers get a pool so GETs never queue behind a write
+        kwargs["poolclass"] = AsyncAdaptedQueuePool if is_async else QueuePool
+        kwargs["pool_size"] = settings.db_reader_pool_size if read_only else 1
+        kwargs["max_overflow"] = 0
+    if is_async:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        async_eng = create_async_engine(url, **kwargs)
+        if _PRODUCTION:
+            _apply_pragmas(async_eng.sync_engine, read_only=read_only)
+        return async_eng
+    eng = create_engine(url, **kwargs)
+    if _PRODUCTION:
+        _apply_pragmas(eng, read_only=read_only)
+    return eng
+
+
+# Writer engine (all mutations, startup DDL, seed); in the default profile it
+# also serves reads, exactly as before
+engine = _make_engine(SQLALCHEMY_DATABASE_URL, read_only=False)
+read_engine = (
+    _make_engine(SQLALCHEMY_DATABASE_URL, read_only=True) if _PRODUCTION else engine
 )
 
-# Create a configured "Session" class
+# Create configured "Session" classes
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Async engines/sessions, only built when enabled so aiosqlite stays optional
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = _make_engine(ASYNC_DATABASE_URL, read_only=False, is_async=True)
+    async_read_engine = (
+        _make_engine(ASYNC_DATABASE_URL, read_only=True, is_async=True)
+        if _PRODUCTION else async_engine
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False)
 
 # Create a base class for declarative class definitions
 Base = declarative_base()
 
-# Import models to ensure tables are registered with SQLAlchemy's metadata
-from . import models
 
-# Automatically create database tables based on the models (for development/demo purposes)
-from app.database import Base, engine
-from app import models
+def init_db() -> None:
+    """Create tables and auxiliary SQLite structures (idempotent).
+
+    Called once at startup (app lifespan, seed script) rather than at import
+    time, so the models module is fully loaded before create_all runs.
+    Several workers may start at once; every step is check-then-create, so a
+    lost race ("already exists") is simply retried.
+    """
+    # Import models to ensure tables are registered with SQLAlchemy's metadata
+    from . import changes, models, search, migrations, stats  # noqa: F401
+
+    for attempt in range(5):
+        try:
+            Base.metadata.create_all(bind=engine)
+            migrations.migrate_tags_to_table(engine)
+            migrations.add_milestone_counters(engine)
+            migrations.add_change_seq(engine)
+            migrations.add_events_autoincrement(engine)
+            migrations.create_missing_indexes(engine)
+            search.ensure_search_index(engine)
+            stats.ensure_stats(engine)
+            changes.ensure_changes(engine)
+            return
+        except OperationalError:
+            if attempt == 4:
+                raise
+            time.sleep(0.2 * (attempt + 1))
+
 
-Base.metadata.create_all(bind=engine)
-print("Tables created!")
\ No newline at end of file
+async def dispose_engines() -> None:
+    for eng in {async_engine, async_read_engine} - {None}:
+        await eng.dispose()
+    for eng in {engine, read_engine}:
+        eng.dispose()
@@ -1,25 +1,160 @@
-from typing import List, Callable
-from asyncio import Queue
+# app/events.py
+"""Domain-event pipeline: the single path from routers to SSE clients.
 
-subscribers: List[Queue] = []
+Routers emit through `routers/projects/sse.notify`, which lands here. Events
+are buffered on the event loop for a few milliseconds, coalesced, and handed
+to the broadcast backend as one batch:
 
-async def publish(event: dict):
-    dead = []
-    for q in subscribers:
+- repeated `project_updated` events for the same id merge into one (union
+  of `changed`, later patch values win);
+- `project_updated` events for different ids with an identical change
+  collapse into a single `projects_updated` event carrying `ids`, so a bulk
+  status change of 5,000 projects is one event, not 5,000. /stream filters
+  on `type=project_updated` match it as well (realtime.TYPE_ALIASES);
+- neither happens across another event about the same project, so the
+  order a client sees for one project is the order it happened in.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .broadcast import Item, broadcaster
+from .config import settings
+from .realtime import EventMeta, Labels, _labels
+
+def coalesce(items: List[Item]) -> List[Item]:
+    """Merge same-project updates, then group identical updates across projects.
+
+    Any other event about a project (delete, recover, new activity) is a
+    barrier for it: its updates are not merged or grouped across that event,
+    so a subscriber never sees an update arrive after the delete that
+    followed it.
+    """
+    merged: Dict[Tuple[int, int], Item] = {}  # (project id, barriers before it) -> update
+    last_pos: Dict[Tuple[int, int], int] = {}
+    barriers: Dict[int, List[int]] = {}  # positions of the other events about each project
+    for pos, (ev, owners, statuses) in enumerate(items):
+        if ev.get("type") != "project_updated":
+            for pid in EventMeta(ev).project_ids:
+                barriers.setdefault(pid, []).append(pos)
+            continue
+        key = (ev["id"], len(barriers.get(ev["id"], ())))
+        prev = merged.get(key)
+        if prev is None:
+            merged[key] = (dict(ev, changed=list(ev.get("changed") or []), patch=dict(ev.get("patch") or {})), owners, statuses)
+        else:
+            pev = prev[0]
+            pev["changed"] += [c for c in ev.get("changed") or [] if c not in pev["changed"]]
+            pev["patch"].update(ev.get("patch") or {})
+            merged[key] = (pev, prev[1] | owners, prev[2] | statuses)
+        last_pos[key] = pos
+
+    def bound(key: Tuple[int, int]) -> int:
+        """Position of the next barrier after this update (end of batch if none)."""
+        pid, seen = key
+        later = barriers.get(pid, ())
+        return later[seen] if seen < len(later) else len(items)
+
+    # group by identical (changed, patch); a group sits where its last member was,
+    # so members whose barrier comes before that position start a new group
+    groups: Dict[str, List[Tuple[int, int]]] = {}
+    for key, (ev, _, _) in merged.items():
+        groups.setdefault(json.dumps([ev["changed"], ev["patch"]], sort_keys=True, default=str), []).append(key)
+    placed: Dict[int, Item] = {}
+    for keys in groups.values():
+        run: List[Tuple[int, int]] = []
+        limit = len(items)
+        for key in sorted(keys, key=last_pos.__getitem__):
+            if run and last_pos[key] >= limit:
+                placed[last_pos[run[-1]]] = _grouped([merged[k] for k in run])
+                run, limit = [], len(items)
+            run.append(key)
+            limit = min(limit, bound(key))
+        placed[last_pos[run[-1]]] = _grouped([merged[k] for k in run])
+
+    out: List[Item] = []
+    for pos, item in enumerate(items):
+        if item[0].get("type") == "project_updated":
+            if pos in placed:
+                out.append(placed[pos])
+        else:
+            out.append(item)
+    return out
+
+def _grouped(updates: List[Item]) -> Item:
+    """One update as is, several identical ones as a `projects_updated` event."""
+    if len(updates) == 1:
+        return updates[0]
+    first = updates[0][0]
+    return (
+        {"type": "projects_updated", "ids": sorted(ev["id"] for ev, _, _ in updates),
+         "changed": first["changed"], "patch": first["patch"]},
+        frozenset().union(*(owners for _, owners, _ in updates)),
+        frozenset().union(*(statuses for _, _, statuses in updates)),
+    )
+
+
+class EventPipeline:
+    """Thread-safe, micro-batching front of the broadcast backend."""
+
+    def __init__(self, publish_many: Callable[[List[Item]], None], window: float) -> None:
+        self.publish_many = publish_many
+        self.window = window
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._buffer: List[Item] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.emitted_total = 0
+        self.published_total = 0
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self.flush()
+        self.loop = None
+
+    def emit(self, event: dict, owners: Labels = None, statuses: Labels = None) -> None:
+        self.emit_many([(event, _labels(owners), _labels(statuses))])
+
+    def emit_many(self, items: List[Item]) -> None:
+        """Queue several events with a single hop onto the loop."""
+        if not items:
+            return
+        loop = self.loop
+        if loop is None:
+            # pipeline not running (no lifespan, e.g. scripts): publish directly
+            self.publish_many(items)
+            return
         try:
-            await q.put(event)
-        except Exception:
-            dead.append(q)
-    for d in dead:
-        subscribers.remove(d)
-
-async def subscribe() -> Queue:
-    q: Queue = Queue()
-    subscribers.append(q)
-    return q
-
-def unsubscribe(q: Queue):
-    try:
-        subscribers.remove(q)
-    except ValueError:
-        pass
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._append(items)
+        else:
+            loop.call_soon_threadsafe(self._append, items)
+
+    def _append(self, items: List[Item]) -> None:
+        self._buffer.extend(items)
+        self.emitted_total += len(items)
+        if self._flush_handle is None and self.loop is not None:
+            self._flush_handle = self.loop.call_later(self.window, self.flush)
+
+    def flush(self) -> None:
+        self._flush_handle = None
+        items, self._buffer = self._buffer, []
+        if not items:
+            return
+        batch = coalesce(items)
+        self.published_total += len(batch)
+        self.publish_many(batch)
+
+    def metrics(self) -> Dict[str, int]:
+        return {"emitted_total": self.emitted_total, "published_total": self.published_total}
+
+
+pipeline = EventPipeline(broadcaster.publish_many, window=settings.event_batch_window_ms / 1000)
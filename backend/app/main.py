@@ -1,11 +1,40 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket
 from . import models, schemas, database, events
 from app.routers.projects import router as projects_router
 from fastapi.middleware.cors import CORSMiddleware
-from .realtime import router as realtime_router  # exposes GET /stream (SSE)
+from .realtime import router as realtime_router, sse  # exposes GET /stream (SSE)
+from .broadcast import broadcaster
+from .events import pipeline
+from .routers.projects.jobs import runner as bulk_jobs
+from .routers.projects.cache import list_cache
+from .routers.projects.readmodel import read_model
+from .routers.projects.stats import stats_feed
+from .retention import compactor
 
 
-app = FastAPI(title="Project Management Dashboard")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.init_db()
+    if read_model.enabled:
+        with database.SessionLocal() as db:
+            read_model.load(db)
+    await broadcaster.start()
+    await pipeline.start()
+    bulk_jobs.start()  # resumes jobs interrupted by a restart
+    stats_feed.start()
+    compactor.start()  # no-op unless EVENT_RETENTION_DAYS is set
+    yield
+    await asyncio.to_thread(compactor.stop)
+    await asyncio.to_thread(stats_feed.stop)
+    await asyncio.to_thread(bulk_jobs.stop)  # finishes the current chunk
+    await pipeline.stop()  # flushes whatever is still buffered
+    await broadcaster.stop()
+    await database.dispose_engines()
+
+
+app = FastAPI(title="Project Management Dashboard", lifespan=lifespan)
 
 # Allow requests from your frontend
 origins = [
@@ -19,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],    # GET, POST, PUT, DELETE, etc.
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # include routers
@@ -27,4 +57,10 @@ app.include_router(realtime_router)  # <-- exposes GET /stream
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@app.get("/metrics")
+def metrics():
+    return {"sse": sse.metrics(), "events": pipeline.metrics(), "list_cache": list_cache.metrics(),
+            "read_model": read_model.metrics(), "stats": stats_feed.metrics(),
+            "event_compaction": compactor.metrics()}
@@ -0,0 +1,59 @@
+# app/maintenance.py
+"""Maintenance commands: repairs of denormalized data and event compaction.
+
+    python -m app.maintenance repair-milestones   # milestones_total/_done (+ progress when PROGRESS_MODE=derived)
+    python -m app.maintenance rebuild-stats       # the project_stats summary table
+    python -m app.maintenance compact-events      # move old events to events_archive
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import timedelta
+
+from . import stats
+from .config import settings
+from .database import engine, init_db
+from .migrations import sync_milestone_counters
+from .retention import compact_events
+
+
+def repair_milestones(derive_progress: bool = settings.derived_progress) -> int:
+    with engine.begin() as conn:
+        return sync_milestone_counters(conn, derive_progress=derive_progress)
+
+
+def rebuild_stats() -> None:
+    with engine.begin() as conn:
+        stats.rebuild_stats(conn)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.maintenance", description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    repair = commands.add_parser("repair-milestones", help="recompute milestone counters from the milestones table")
+    repair.add_argument(
+        "--derive-progress", action=argparse.BooleanOptionalAction, default=settings.derived_progress,
+        help="also set progress from the counters (default: on when PROGRESS_MODE=derived)",
+    )
+    commands.add_parser("rebuild-stats", help="recompute the dashboard aggregates from the base tables")
+    compact = commands.add_parser("compact-events", help="archive events older than the retention age")
+    compact.add_argument(
+        "--older-than-days", type=int, default=settings.event_retention_days or None,
+        required=not settings.event_retention_days, help="default: EVENT_RETENTION_DAYS",
+    )
+    args = parser.parse_args(argv)
+
+    init_db()
+    if args.command == "repair-milestones":
+        fixed = repair_milestones(args.derive_progress)
+        print(f"Repaired milestone counters of {fixed} project(s)")
+    elif args.command == "rebuild-stats":
+        rebuild_stats()
+        print("Rebuilt project_stats")
+    else:
+        moved = compact_events(engine, timedelta(days=args.older_than_days))
+        print(f"Archived {moved} event(s) older than {args.older_than_days} day(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# app/migrations.py
+"""Idempotent data migrations run by database.init_db() after create_all."""
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+BATCH = 1000
+
+
+def migrate_tags_to_table(engine: Engine) -> None:
+    """One-time copy of the comma-separated `projects.tags` into `project_tags`.
+
+    Only runs while `project_tags` is empty, so it is a no-op once migrated.
+    """
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM project_tags LIMIT 1")).first():
+            return
+        rows = conn.execute(
+            text("SELECT id, tags FROM projects WHERE tags IS NOT NULL AND tags != ''")
+        )
+        batch = []
+        for pid, tags in rows:
+            batch.extend(
+                {"project_id": pid, "tag": t.strip()} for t in set(tags.split(",")) if t.strip()
+            )
+            if len(batch) >= BATCH:
+                _insert_tags(conn, batch)
+                batch = []
+        if batch:
+            _insert_tags(conn, batch)
+
+
+def _insert_tags(conn, batch) -> None:
+    conn.execute(
+        text("INSERT OR IGNORE INTO project_tags (project_id, tag) VALUES (:project_id, :tag)"),
+        batch,
+    )
+
+
+MILESTONE_COUNTERS = ("milestones_total", "milestones_done")
+
+_COUNT_TOTAL = "(SELECT count(*) FROM milestones m WHERE m.project_id = projects.id)"
+_COUNT_DONE = "(SELECT count(*) FROM milestones m WHERE m.project_id = projects.id AND m.done)"
+_DERIVED = (
+    f"CASE WHEN {_COUNT_TOTAL} > 0 THEN 100.0 * {_COUNT_DONE} / {_COUNT_TOTAL} ELSE 0.0 END"
+)
+
+
+def create_missing_indexes(engine: Engine) -> None:
+    """Indexes declared on the models after their table already existed
+    (create_all only creates the indexes of tables it creates)."""
+    from .database import Base
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def add_milestone_counters(engine: Engine) -> None:
+    """Add `projects.milestones_total/_done` (and the progress index) to older databases.
+
+    The counters are filled from the milestones table when the columns are
+    first created; afterwards the milestone endpoints keep them current.
+    """
+    with engine.begin() as conn:
+        present = {row[1] for row in conn.execute(text("PRAGMA table_info(projects)"))}
+        missing = [c for c in MILESTONE_COUNTERS if c not in present]
+        for column in missing:
+            conn.execute(text(f"ALTER TABLE projects ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_projects_progress ON projects (progress)"))
+        if missing:
+            sync_milestone_counters(conn)
+
+
+def add_change_seq(engine: Engine) -> None:
+    """Add `projects.change_seq` to older databases.
+
+    Existing rows are numbered by id. No client holds a watermark from
+    before the column existed, so any order works.
+    """
+    with engine.begin() as conn:
+        present = {row[1] for row in conn.execute(text("PRAGMA table_info(projects)"))}
+        if "change_seq" not in present:
+            conn.execute(text("ALTER TABLE projects ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0"))
+            conn.execute(text("UPDATE projects SET change_seq = id"))
+
+
+def add_events_autoincrement(engine: Engine) -> None:
+    """Rebuild an older `events` table as AUTOINCREMENT.
+
+    Without it SQLite hands out max(id) + 1, so once compaction has moved the
+    newest ids to `events_archive` new events reuse them and collide there.
+    The table is recreated from the model and its rows copied over with
+    their ids; triggers are dropped first and put back afterwards (so the
+    copy fires none of them). The sequence starts above every id in either
+    table.
+    """
+    from .models import Event
+
+    with engine.begin() as conn:
+        ddl = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'events'")
+        ).scalar_one()
+        if "AUTOINCREMENT" in ddl.upper():
+            return
+        triggers = conn.execute(
+            text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'events'")
+        ).all()
+        for name, _ in triggers:
+            conn.execute(text(f'DROP TRIGGER "{name}"'))
+        # legacy mode: leave references to `events` in other tables' triggers alone
+        conn.execute(text("PRAGMA legacy_alter_table = ON"))
+        conn.execute(text("ALTER TABLE events RENAME TO events_old"))
+        conn.execute(text("PRAGMA legacy_alter_table = OFF"))
+        indexes = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'events_old' AND sql IS NOT NULL")
+        ).scalars().all()
+        for name in indexes:
+            conn.execute(text(f'DROP INDEX "{name}"'))
+        Event.__table__.create(bind=conn)
+        conn.execute(text(
+            "INSERT INTO events (id, project_id, kind, message, at) "
+            "SELECT id, project_id, kind, message, at FROM events_old"
+        ))
+        conn.execute(text("DROP TABLE events_old"))
+        high = conn.execute(text(
+            "SELECT max(coalesce((SELECT max(id) FROM events), 0), coalesce((SELECT max(id) FROM events_archive), 0))"
+        )).scalar_one()
+        conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'events'"))
+        conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('events', :seq)"), {"seq": high})
+        for _, sql in triggers:
+            conn.execute(text(sql))
+
+
+def sync_milestone_counters(conn, derive_progress: bool = False) -> int:
+    """Recompute the counters (and optionally progress) of every project whose
+    stored values disagree with its milestones. Returns the number of projects fixed."""
+    columns = {"milestones_total": _COUNT_TOTAL, "milestones_done": _COUNT_DONE}
+    if derive_progress:
+        columns["progress"] = _DERIVED
+    assignments = ", ".join(f"{name} = {expr}" for name, expr in columns.items())
+    stale = " OR ".join(f"{name} IS NOT {expr}" for name, expr in columns.items())
+    return conn.execute(text(f"UPDATE projects SET {assignments} WHERE {stale}")).rowcount
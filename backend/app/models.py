@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, Boolean, Index, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from .database import Base
@@ -11,15 +11,27 @@ class Project(Base):
     owner = Column(String(120), index=True)
     status = Column(String(50), index=True, default="active")
     health = Column(String(20), index=True, default="green")
-    tags = Column(String(255), default="")
-    progress = Column(Float, default=0.0)
+    tags = Column(String(255), default="")  # denormalized copy of project_tags, for output/search
+    progress = Column(Float, default=0.0, index=True)
+    # denormalized milestone counts, maintained by the milestone endpoints
+    milestones_total = Column(Integer, default=0, nullable=False, server_default="0")
+    milestones_done = Column(Integer, default=0, nullable=False, server_default="0")
     last_updated = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
     version = Column(Integer, default=1)
     deleted_at = Column(DateTime, nullable=True)
+    # last value of the global change sequence, stamped by triggers (app/changes.py)
+    change_seq = Column(Integer, default=0, nullable=False, server_default="0", index=True)
 
     team = relationship("TeamMember", back_populates="project", cascade="all, delete-orphan")
     events = relationship("Event", back_populates="project", cascade="all, delete-orphan")
     milestones = relationship("Milestone", back_populates="project", cascade="all, delete-orphan")  # ✅
+    tag_links = relationship("ProjectTag", cascade="all, delete-orphan")
+
+class ProjectTag(Base):
+    __tablename__ = "project_tags"
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(64), primary_key=True)
+    __table_args__ = (Index("ix_project_tags_tag_project", "tag", "project_id"),)
 
 class TeamMember(Base):
     __tablename__ = "team_members"
@@ -38,6 +50,22 @@ class Event(Base):
     message = Column(Text, default="")
     at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
     project = relationship("Project", back_populates="events")
+    # per-project timelines, newest first, and their (at, id) cursors.
+    # AUTOINCREMENT: ids are never reused, so they stay unique across events_archive
+    __table_args__ = (
+        Index("ix_events_project_at_id", "project_id", "at", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+class EventArchive(Base):
+    """Events moved out of `events` by compaction (same ids and columns)."""
+    __tablename__ = "events_archive"
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, nullable=False)
+    kind = Column(String(50), default="update")
+    message = Column(Text, default="")
+    at = Column(DateTime, nullable=False)
+    __table_args__ = (Index("ix_events_archive_project_at_id", "project_id", "at", "id"),)
 
 class Milestone(Base):  
     __tablename__ = "milestones"
@@ -48,3 +76,22 @@ class Milestone(Base):
     due_at = Column(DateTime, nullable=True)
     sort = Column(Integer, default=0)
     project = relationship("Project", back_populates="milestones")
+
+class BulkJob(Base):
+    """A background bulk action, processed in committed chunks so it can resume."""
+    __tablename__ = "bulk_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    action = Column(String(32), nullable=False)
+    params = Column(JSON, default=dict)    # new_status / tag
+    selector = Column(JSON, default=dict)  # {"filter": {...}} or {"ids": [...], "versions": {...}}
+    status = Column(String(20), index=True, default="pending")  # pending | running | done | failed
+    total = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    updated = Column(Integer, default=0)
+    conflicts = Column(JSON, default=list)
+    cursor = Column(Integer, default=0)  # highest project id already handled
+    error = Column(Text, nullable=True)
+    worker = Column(String(64), nullable=True)  # runner that claimed the job
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    finished_at = Column(DateTime, nullable=True)
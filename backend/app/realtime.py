@@ -2,46 +2,297 @@
 from __future__ import annotations
 import asyncio
 import json
-from typing import Set
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Header, Query, Request
 from fastapi.responses import StreamingResponse
 
+from .config import settings
+
+# Sent instead of a replay when a client's cursor fell out of the buffer (or
+# belongs to a previous server run): the client must refetch its state.
+RESYNC_FRAME = 'data: {"type": "resync"}\n\n'
+
+Labels = Union[None, str, Iterable[Optional[str]]]
+
+# A coalesced `projects_updated` (app.events) stands for several
+# `project_updated` events, so type filters on the latter must see it too.
+TYPE_ALIASES: Dict[str, FrozenSet[str]] = {"projects_updated": frozenset(("project_updated",))}
+
+
+def _labels(value: Labels) -> FrozenSet[str]:
+    if value is None:
+        return frozenset()
+    if isinstance(value, str):
+        return frozenset((value,))
+    return frozenset(v for v in value if v is not None)
+
+
+class EventMeta:
+    """Routing attributes of one broadcast (what subscribers can filter on)."""
+
+    __slots__ = ("type", "types", "project_ids", "owners", "statuses", "changed")
+
+    def __init__(self, data: dict, owners: Labels = None, statuses: Labels = None) -> None:
+        self.type: Optional[str] = data.get("type")
+        # the type plus the types it stands for, as matched by `type` filters
+        self.types = _labels(self.type) | TYPE_ALIASES.get(self.type or "", frozenset())
+        ids: Set[int] = set(data.get("ids") or ())
+        for key in ("id", "project_id"):
+            if isinstance(data.get(key), int):
+                ids.add(data[key])
+        self.project_ids = frozenset(ids)
+        patch = data.get("patch") or {}
+        self.owners = _labels(owners) | _labels(patch.get("owner"))
+        self.statuses = _labels(statuses) | _labels(patch.get("status"))
+        self.changed = frozenset(data.get("changed") or ())
+
+
+class Filter:
+    """Conjunction of the optional /stream predicates; empty means everything."""
+
+    __slots__ = ("project_ids", "types", "owner", "status")
+
+    def __init__(
+        self,
+        project_ids: Iterable[int] = (),
+        types: Iterable[str] = (),
+        owner: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> None:
+        self.project_ids = frozenset(project_ids)
+        self.types = frozenset(types)
+        self.owner = owner
+        self.status = status
+
+    def matches(self, meta: EventMeta) -> bool:
+        if self.project_ids and self.project_ids.isdisjoint(meta.project_ids):
+            return False
+        if self.types and self.types.isdisjoint(meta.types):
+            return False
+        if self.owner is not None and self.owner not in meta.owners:
+            return False
+        if self.status is not None and self.status not in meta.statuses:
+            return False
+        return True
+
+    def index_key(self) -> Tuple[str, Iterable]:
+        """The most selective dimension, used to register in the topic index."""
+        if self.project_ids:
+            return "project", self.project_ids
+        if self.owner is not None:
+            return "owner", (self.owner,)
+        if self.status is not None:
+            return "status", (self.status,)
+        if self.types:
+            return "type", self.types
+        return "all", ("*",)
+
+
+class Subscriber:
+    """A connected client: its filter, pending sequence numbers and a wakeup flag."""
+
+    __slots__ = ("filter", "cursor", "pending", "wakeup", "needs_resync")
+
+    def __init__(self, flt: Filter, cursor: int, needs_resync: bool = False) -> None:
+        self.filter = flt
+        self.cursor = cursor  # last sequence number delivered
+        self.pending: Deque[int] = deque()
+        self.wakeup = asyncio.Event()
+        self.needs_resync = needs_resync
+
+
 class SSEManager:
-    def __init__(self) -> None:
-        self.clients: Set[asyncio.Queue[str]] = set()
-        self._lock = asyncio.Lock()
-
-    async def subscribe(self) -> asyncio.Queue[str]:
-        q: asyncio.Queue[str] = asyncio.Queue()
-        async with self._lock:
-            self.clients.add(q)
-        return q
-
-    async def unsubscribe(self, q: asyncio.Queue[str]) -> None:
-        async with self._lock:
-            self.clients.discard(q)
-
-    async def broadcast(self, data: dict) -> None:
-        payload = json.dumps(data, default=str)
-        async with self._lock:
-            targets = list(self.clients)
-        for q in targets:
-            # prevent slow-client buildup
-            if q.qsize() > 100:
-                try:
-                    q.get_nowait()
-                except Exception:
-                    pass
-            await q.put(f"data: {payload}\n\n")
+    """Sequence-numbered ring buffer of encoded frames, routed through a topic index.
+
+    Each broadcast is JSON-encoded once into an `id:`/`data:` frame and stored
+    at `seq % capacity`. When several frames are waiting for one client they
+    go out as a single `batch` frame built from the already-encoded payloads.
+    Subscribers are indexed by their most selective filter dimension, so a
+    publish only touches clients whose filter can match and only queues the
+    sequence number for them. A client whose pending work falls out of the
+    window is evicted and told to resync, so memory stays bounded no matter
+    how slow it is.
+    """
+
+    def __init__(self, capacity: int = settings.sse_buffer_size, epoch: Optional[str] = None) -> None:
+        self.capacity = max(1, capacity)
+        self._ring: List[Optional[Tuple[int, str, str, EventMeta]]] = [None] * self.capacity
+        self._seq = 0  # last sequence number seen
+        self._first: Optional[int] = None  # first sequence number held by this process
+        # ids are "<epoch>-<seq>" so ids from another sequence space are detected;
+        # the broadcast backend may replace it with an epoch shared by all workers
+        self.epoch = epoch or format(int(time.time() * 1000), "x")
+        self.clients: Set[Subscriber] = set()
+        # called with the meta of every delivered event (e.g. cache invalidation)
+        self.listeners: List[Callable[[EventMeta], None]] = []
+        self._index: Dict[str, Dict[object, Set[Subscriber]]] = {
+            "project": {}, "owner": {}, "status": {}, "type": {}, "all": {},
+        }
+        self.published_total = 0
+        self.delivered_total = 0
+        self.replayed_total = 0
+        self.evicted_total = 0
+        self.batched_total = 0
+
+    # ---------- subscription ----------
+    def _oldest(self) -> int:
+        return max(self._first or 1, self._seq - self.capacity + 1)
+
+    def _entry(self, seq: int) -> Optional[Tuple[int, str, str, EventMeta]]:
+        entry = self._ring[seq % self.capacity]
+        return entry if entry is not None and entry[0] == seq else None
+
+    def _parse_event_id(self, last_event_id: Optional[str]) -> Optional[int]:
+        if not last_event_id:
+            return None
+        epoch, _, seq = last_event_id.strip().rpartition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def subscribe(self, last_event_id: Optional[str] = None, flt: Optional[Filter] = None) -> Subscriber:
+        flt = flt or Filter()
+        if last_event_id is None:
+            sub = Subscriber(flt, self._seq)
+        else:
+            seq = self._parse_event_id(last_event_id)
+            if seq is None or seq > self._seq or seq + 1 < self._oldest():
+                # unknown, future or already overwritten: cannot replay exactly
+                sub = Subscriber(flt, self._seq, needs_resync=True)
+            else:
+                sub = Subscriber(flt, seq)
+                for s in range(seq + 1, self._seq + 1):
+                    entry = self._entry(s)
+                    if entry is not None and flt.matches(entry[3]):
+                        sub.pending.append(s)
+                self.replayed_total += len(sub.pending)
+                if sub.pending:
+                    sub.wakeup.set()
+        self.clients.add(sub)
+        dim, keys = flt.index_key()
+        for key in keys:
+            self._index[dim].setdefault(key, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self.clients.discard(sub)
+        dim, keys = sub.filter.index_key()
+        for key in keys:
+            bucket = self._index[dim].get(key)
+            if bucket is not None:
+                bucket.discard(sub)
+                if not bucket:
+                    del self._index[dim][key]
+
+    def _candidates(self, meta: EventMeta) -> Set[Subscriber]:
+        idx = self._index
+        found: Set[Subscriber] = set(idx["all"].get("*", ()))
+        for pid in meta.project_ids:
+            found.update(idx["project"].get(pid, ()))
+        for owner in meta.owners:
+            found.update(idx["owner"].get(owner, ()))
+        for status in meta.statuses:
+            found.update(idx["status"].get(status, ()))
+        for type_ in meta.types:
+            found.update(idx["type"].get(type_, ()))
+        return found
+
+    # ---------- publishing ----------
+    def publish(self, data: dict, *, owners: Labels = None, statuses: Labels = None) -> int:
+        """Assign the next local sequence number and deliver. Loop thread only."""
+        seq = self._seq + 1
+        self.deliver(seq, json.dumps(data, default=str), EventMeta(data, owners, statuses))
+        return seq
+
+    def deliver(self, seq: int, payload: str, meta: EventMeta) -> None:
+        """Store an already-encoded payload under `seq` and queue it for interested subscribers.
+
+        Sequence numbers must increase; the outbox backend passes its row ids
+        here so every worker uses the same ids for the same event.
+        """
+        if seq <= self._seq:
+            return
+        if self._first is None:
+            self._first = seq
+        self._seq = seq
+        self._ring[seq % self.capacity] = (seq, f"id: {self.epoch}-{seq}\ndata: {payload}\n\n", payload, meta)
+        self.published_total += 1
+        for listener in self.listeners:
+            listener(meta)
+        for sub in self._candidates(meta):
+            if not sub.filter.matches(meta):
+                continue
+            if len(sub.pending) >= self.capacity:
+                sub.pending.clear()
+                sub.needs_resync = True
+                self.evicted_total += 1
+            else:
+                sub.pending.append(seq)
+            sub.wakeup.set()
+
+    # ---------- consuming ----------
+    def drain(self, sub: Subscriber) -> List[str]:
+        """Frames queued for the subscriber since the last drain."""
+        sub.wakeup.clear()
+        if sub.pending and sub.pending[0] < self._oldest():
+            sub.pending.clear()
+            sub.needs_resync = True
+            self.evicted_total += 1
+        if sub.needs_resync:
+            sub.needs_resync = False
+            sub.cursor = self._seq
+            return [RESYNC_FRAME]
+        entries = [entry for entry in map(self._entry, sub.pending) if entry is not None]
+        if sub.pending:
+            sub.cursor = sub.pending[-1]
+            sub.pending.clear()
+        self.delivered_total += len(entries)
+        if len(entries) <= 1:
+            return [entry[1] for entry in entries]
+        # one frame, id of the last event, so Last-Event-ID resumes after all of them
+        payloads = ",".join(entry[2] for entry in entries)
+        self.batched_total += 1
+        return [f'id: {self.epoch}-{entries[-1][0]}\ndata: {{"type": "batch", "events": [{payloads}]}}\n\n']
+
+    def metrics(self) -> Dict[str, int]:
+        backlog = [len(s.pending) for s in self.clients]
+        return {
+            "clients": len(self.clients),
+            "filtered_clients": len(self.clients) - len(self._index["all"].get("*", ())),
+            "head_seq": self._seq,
+            "buffer_capacity": self.capacity,
+            "published_total": self.published_total,
+            "delivered_total": self.delivered_total,
+            "replayed_total": self.replayed_total,
+            "evicted_total": self.evicted_total,
+            "batched_total": self.batched_total,
+            "lagging_clients": sum(1 for b in backlog if b > settings.sse_lag_threshold),
+            "max_backlog": max(backlog, default=0),
+        }
 
 sse = SSEManager()
 router = APIRouter()
 
 @router.get("/stream")
-async def stream(request: Request):
-    q = await sse.subscribe()
+async def stream(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    last_event_id_param: Optional[str] = Query(None, alias="last_event_id"),
+    project_id: Optional[List[int]] = Query(None, description="Only events for these projects"),
+    type: Optional[List[str]] = Query(
+        None, description="Only these event types, e.g. project_updated (also matches projects_updated)"
+    ),
+    owner: Optional[str] = Query(None, description="Only projects with this owner"),
+    status: Optional[str] = Query(None, description="Only projects with this status"),
+):
+    # EventSource resends Last-Event-ID on reconnect; the query param covers
+    # clients that open a fresh EventSource themselves.
+    flt = Filter(project_ids=project_id or (), types=type or (), owner=owner, status=status)
+    sub = sse.subscribe(last_event_id or last_event_id_param, flt)
 
     async def gen():
         try:
@@ -49,13 +300,16 @@ async def stream(request: Request):
             while True:
                 if await request.is_disconnected():
                     break
+                frames = sse.drain(sub)
+                if frames:
+                    yield frames[0]
+                    continue
                 try:
-                    msg = await asyncio.wait_for(q.get(), timeout=25)
-                    yield msg
+                    await asyncio.wait_for(sub.wakeup.wait(), timeout=25)
                 except asyncio.TimeoutError:
                     # keep-alive comment (OK by SSE spec)
                     yield f": ping {datetime.now(timezone.utc).isoformat()}\n\n"
         finally:
-            await sse.unsubscribe(q)
+            sse.unsubscribe(sub)
 
     return StreamingResponse(gen(), media_type="text/event-stream")
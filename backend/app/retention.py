@@ -0,0 +1,109 @@
+# app/retention.py
+"""Event retention: move old activity from `events` into `events_archive`.
+
+The live table then only holds recent history, so project timelines and
+the recent-events embed on list pages stay small however long projects
+live. Archived rows keep their ids and columns, and GET
+/projects/{id}/events pages across both tables with one (at, id) cursor.
+
+Rows move in batches, each one a short transaction (copy, then delete), so
+a batch is never half done and two workers compacting at once serialize on
+the write lock. Event ids come from an AUTOINCREMENT sequence and are never
+reused, so the copy is a plain INSERT: an id already in the archive is a
+bug, and the batch fails instead of silently dropping the live row.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from .config import settings
+from .database import engine
+
+BATCH = 1000
+logger = logging.getLogger(__name__)
+
+_COPY = text(
+    "INSERT INTO events_archive (id, project_id, kind, message, at) "
+    "SELECT id, project_id, kind, message, at FROM events WHERE id IN (SELECT value FROM json_each(:ids))"
+)
+_DELETE = text("DELETE FROM events WHERE id IN (SELECT value FROM json_each(:ids))")
+
+
+def compact_events(
+    engine: Engine, older_than: timedelta, batch: int = BATCH, stop: Optional[threading.Event] = None
+) -> int:
+    """Archive every event older than `older_than`; returns the number moved."""
+    cutoff = datetime.now(timezone.utc) - older_than
+    moved = 0
+    while stop is None or not stop.is_set():
+        with engine.begin() as conn:
+            ids = conn.execute(
+                text("SELECT id FROM events WHERE at < :cutoff ORDER BY at, id LIMIT :batch"),
+                {"cutoff": cutoff.strftime("%Y-%m-%d %H:%M:%S.%f"), "batch": batch},
+            ).scalars().all()
+            if not ids:
+                return moved
+            params = {"ids": json.dumps(ids)}
+            conn.execute(_COPY, params)
+            conn.execute(_DELETE, params)
+        moved += len(ids)
+    return moved
+
+
+class EventCompactor:
+    """Background thread running `compact_events` every EVENT_COMPACTION_INTERVAL_S
+    (only when EVENT_RETENTION_DAYS is set)."""
+
+    def __init__(
+        self,
+        retention_days: int = settings.event_retention_days,
+        interval: float = settings.event_compaction_interval_s,
+    ) -> None:
+        self.retention_days = retention_days
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.runs = 0
+        self.archived = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.retention_days > 0
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="event-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.archived += compact_events(engine, timedelta(days=self.retention_days), stop=self._stop)
+            except OperationalError:
+                pass  # database busy: try again next round
+            except Exception:
+                logger.exception("event compaction failed")
+            self.runs += 1
+            self._stop.wait(self.interval)
+
+    def metrics(self) -> dict:
+        return {"enabled": int(self.enabled), "runs": self.runs, "archived": self.archived}
+
+
+compactor = EventCompactor()
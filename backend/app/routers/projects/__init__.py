@@ -1,14 +1,26 @@
 from fastapi import APIRouter
 
+from .tags import router as tags_router
+from .stats import router as stats_router
+from .changes import router as changes_router
+from .transfer import router as transfer_router
+from .batch import router as batch_router
 from .crud import router as crud_router
 from .bulk import router as bulk_router
+from .jobs import router as jobs_router
 from .team import router as team_router
 from .milestones import router as milestones_router
 from .events import router as events_router
 
 router = APIRouter()
+router.include_router(tags_router)        # /projects/tags (before /{project_id})
+router.include_router(stats_router)       # /projects/stats (before /{project_id})
+router.include_router(changes_router)     # /projects/changes (before /{project_id})
+router.include_router(transfer_router)    # /projects/export, /projects/import (before /{project_id})
+router.include_router(batch_router)       # /projects/batch
 router.include_router(crud_router)        # /projects ...
 router.include_router(bulk_router)        # /projects/bulk ...
+router.include_router(jobs_router)        # /projects/bulk/jobs ...
 router.include_router(team_router)        # /projects/{id}/team ...
 router.include_router(milestones_router)  # /projects/{id}/milestones ...
 router.include_router(events_router)      # /projects/{id}/events ...
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from ... import models, schemas
+from .deps import get_read_db, db_route, offload, BATCH_MAX_IDS
+from .helpers import (
+    event_out, json_response, load_milestones, load_recent_events, load_team, milestone_out, parse_fieldset,
+    project_columns, project_to_out, team_member_out,
+)
+
+router = APIRouter()
+
+@router.post("/batch", response_model=schemas.ProjectBatchResponse)
+@db_route
+def batch_projects(body: schemas.ProjectBatchRequest, db: Session = Depends(get_read_db)):
+    """Many projects and their sub-resources in one round trip.
+
+    Replaces GET /{id} + /team + /milestones + /events per project: the
+    projects are one narrow SELECT and every requested relation is one IN
+    (or UNION ALL) query over all ids. `events` are the newest
+    `events_limit` live events, like `recent_events`; older history pages
+    through GET /{id}/events.
+    """
+    ids = list(dict.fromkeys(body.ids))
+    if len(ids) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IDS} ids per batch")
+    fieldset = parse_fieldset(body.fields, "")
+    query = db.query(*project_columns(fieldset)).filter(models.Project.id.in_(ids))
+    if not body.include_deleted:
+        query = query.filter(models.Project.deleted_at.is_(None))
+    by_id = {p.id: p for p in query}
+    found = [pid for pid in ids if pid in by_id]
+
+    include = set(body.include)
+    team = load_team(db, found) if "team" in include else {}
+    milestones = load_milestones(db, found) if "milestones" in include else {}
+    events = load_recent_events(db, found, limit=body.events_limit) if "events" in include else {}
+
+    def build() -> schemas.ProjectBatchResponse:
+        items = {}
+        for pid in found:
+            relations = {}
+            if "team" in include:
+                relations["team"] = [team_member_out(m) for m in team[pid]]
+            if "milestones" in include:
+                relations["milestones"] = [milestone_out(m) for m in milestones[pid]]
+            if "events" in include:
+                relations["events"] = [event_out(e) for e in events[pid]]
+            items[pid] = schemas.ProjectBatchItem.model_construct(
+                project=project_to_out(by_id[pid], fields=fieldset.fields), **relations
+            )
+        return schemas.ProjectBatchResponse.model_construct(
+            projects=items, missing=[pid for pid in ids if pid not in by_id],
+        )
+
+    # every row is loaded: building and encoding need no session
+    return json_response(offload(build), offload_encoding=True)
@@ -1,16 +1,15 @@
-from typing import Dict, List, Literal, Optional
+from datetime import datetime
+from typing import Dict, List, Literal, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import case, insert, literal_column, select, update
 from sqlalchemy.orm import Session
 from ... import models
-from .deps import get_db
-from .helpers import str_to_tags, tags_to_str, now_utc
-from .sse import notify
-
-try:
-    from ...events import publish  # optional
-except Exception:  # pragma: no cover
-    publish = None  # type: ignore
+from .deps import IN_CHUNK_SIZE, get_db, db_route
+from .helpers import (
+    TAG_STRING_SQL, add_tag_to, chunked, now_utc, remove_tag_from, str_to_tags, tagged_project_ids,
+)
+from .sse import notify_many
 
 router = APIRouter()
 
@@ -32,30 +31,112 @@ class BulkResponse(BaseModel):
     updated_count: int
     conflicts: Optional[List[BulkConflict]] = None
 
-@router.post("/bulk", response_model=BulkResponse)
-def bulk_update(payload: BulkRequest, db: Session = Depends(get_db)):
-    projects = (
-        db.query(models.Project)
-        .filter(models.Project.id.in_(payload.ids))
-        .with_for_update()
-        .all()
+class BulkConflictError(Exception):
+    """A guarded UPDATE matched fewer rows than expected (concurrent writer)."""
+
+def current_rows(db: Session, ids: List[int]) -> Dict[int, Tuple[int, str]]:
+    """id -> (version, status) for the existing ids, as plain tuples."""
+    found: Dict[int, Tuple[int, str]] = {}
+    P = models.Project
+    for chunk in chunked(ids, IN_CHUNK_SIZE):
+        for pid, version, status in db.execute(select(P.id, P.version, P.status).where(P.id.in_(chunk))):
+            found[pid] = (version, status)
+    return found
+
+def apply_bulk_action(
+    db: Session,
+    action: str,
+    targets: List[int],
+    *,
+    versions: Optional[Dict[int, int]] = None,
+    new_status: Optional[str] = None,
+    tag: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> List[Tuple[int, str, str, str]]:
+    """Apply `action` to `targets` with set-based statements; no commit.
+
+    Per chunk of ids: one UPDATE (guarded by `version = CASE id ...` when
+    `versions` is given) whose RETURNING rows feed the events and SSE
+    patches, and one executemany INSERT of the activity events. Returns
+    (id, owner, status, tags) of every changed project. Raises
+    BulkConflictError if a guarded UPDATE misses a row.
+    """
+    P = models.Project
+    now = now or now_utc()
+    changed: List[Tuple[int, str, str, str]] = []
+    for chunk in chunked(targets, IN_CHUNK_SIZE):
+        if action == "update_status":
+            values = {"status": new_status}
+            label = "status"
+        else:
+            if action == "add_tag":
+                add_tag_to(db, chunk, tag)  # type: ignore[arg-type]
+            else:
+                remove_tag_from(db, chunk, tag)  # type: ignore[arg-type]
+            values = {"tags": literal_column(f"({TAG_STRING_SQL})")}
+            label = "tags"
+        stmt = update(P).where(P.id.in_(chunk))
+        if versions is not None:
+            stmt = stmt.where(P.version == case({pid: versions[pid] for pid in chunk}, value=P.id))
+        rows = db.execute(
+            stmt.values(version=P.version + 1, last_updated=now, **values)
+            .returning(P.id, P.owner, P.status, P.tags)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if versions is not None and len(rows) != len(chunk):
+            raise BulkConflictError()
+        if rows:
+            db.execute(
+                insert(models.Event),
+                [
+                    {"project_id": r[0], "kind": "bulk", "message": f"Bulk updated: {label}", "at": now}
+                    for r in rows
+                ],
+            )
+        changed.extend(tuple(r) for r in rows)
+    return changed
+
+def bulk_targets(
+    db: Session, action: str, current: Dict[int, Tuple[int, str]], ids: List[int],
+    *, new_status: Optional[str] = None, tag: Optional[str] = None,
+) -> List[int]:
+    """The ids among `ids` the action would actually change."""
+    if action == "update_status":
+        return [pid for pid in ids if current[pid][1] != new_status]
+    has_tag: set = set()
+    for chunk in chunked(ids, IN_CHUNK_SIZE):
+        has_tag |= tagged_project_ids(db, chunk, tag)  # type: ignore[arg-type]
+    if action == "add_tag":
+        return [pid for pid in ids if pid not in has_tag]
+    return [pid for pid in ids if pid in has_tag]
+
+def notify_bulk(action: str, changed: List[Tuple[int, str, str, str]], previous_status: Dict[int, str]) -> None:
+    """One project_updated per changed row, patch taken from the RETURNING data."""
+    field = "status" if action == "update_status" else "tags"
+    notify_many(
+        (
+            {
+                "type": "project_updated", "id": pid, "changed": [field],
+                "patch": {"status": status} if field == "status" else {"tags": str_to_tags(tags)},
+            },
+            owner,
+            {previous_status.get(pid), status},
+        )
+        for pid, owner, status, tags in changed
     )
-    if not projects:
-        return BulkResponse(updated_count=0, conflicts=[
-            BulkConflict(id=i, expected=payload.versions.get(i, -1), found=-1)
-            for i in payload.ids
-        ])
 
-    current_versions = {p.id: p.version for p in projects}
+def version_conflicts(ids: List[int], versions: Dict[int, int], current: Dict[int, Tuple[int, str]]) -> List[BulkConflict]:
     conflicts: List[BulkConflict] = []
-    for pid in payload.ids:
-        exp = payload.versions.get(pid)
-        found = current_versions.get(pid)
+    for pid in ids:
+        exp = versions.get(pid)
+        found = current[pid][0] if pid in current else None
         if exp is None or found is None or exp != found:
             conflicts.append(BulkConflict(id=pid, expected=exp or -1, found=found or -1))
-    if conflicts:
-        return BulkResponse(updated_count=0, conflicts=conflicts)
+    return conflicts
 
+@router.post("/bulk", response_model=BulkResponse)
+@db_route
+def bulk_update(payload: BulkRequest, db: Session = Depends(get_db)):
     if payload.action == "update_status":
         if not payload.new_status:
             raise HTTPException(status_code=400, detail="new_status is required")
@@ -65,57 +146,27 @@ def bulk_update(payload: BulkRequest, db: Session = Depends(get_db)):
     else:
         raise HTTPException(status_code=400, detail="Unsupported action")
 
-    now = now_utc()
-    changed_ids: List[int] = []
-    changed_fields_by_id: Dict[int, List[str]] = {}
+    ids = list(dict.fromkeys(payload.ids))
+    current = current_rows(db, ids)
+    conflicts = version_conflicts(ids, payload.versions, current)
+    if conflicts:
+        return BulkResponse(updated_count=0, conflicts=conflicts)
 
+    previous_status = {pid: status for pid, (_, status) in current.items()}
     try:
-        for p in projects:
-            changed: List[str] = []
-            if payload.action == "update_status":
-                if p.status != payload.new_status:
-                    p.status = payload.new_status  # type: ignore
-                    changed.append("status")
-            elif payload.action == "add_tag":
-                cur = set(str_to_tags(p.tags))
-                if payload.tag not in cur:      # type: ignore
-                    cur.add(payload.tag)        # type: ignore
-                    p.tags = tags_to_str(list(cur)); changed.append("tags")
-            elif payload.action == "remove_tag":
-                cur = set(str_to_tags(p.tags))
-                if payload.tag in cur:          # type: ignore
-                    cur.remove(payload.tag)     # type: ignore
-                    p.tags = tags_to_str(list(cur)); changed.append("tags")
-            if changed:
-                p.version += 1
-                p.last_updated = now
-                db.add(models.Event(
-                    project_id=p.id, kind="bulk",
-                    message=f"Bulk updated: {', '.join(changed)}", at=now
-                ))
-                changed_ids.append(p.id)
-                changed_fields_by_id[p.id] = changed
+        targets = bulk_targets(db, payload.action, current, ids, new_status=payload.new_status, tag=payload.tag)
+        changed = apply_bulk_action(
+            db, payload.action, targets,
+            versions=payload.versions, new_status=payload.new_status, tag=payload.tag,
+        )
         db.commit()
+    except BulkConflictError:
+        # another writer bumped a version between the read and the guarded UPDATE
+        db.rollback()
+        return BulkResponse(updated_count=0, conflicts=version_conflicts(ids, payload.versions, current_rows(db, ids)))
     except Exception:
         db.rollback()
         raise
 
-    if publish and changed_ids:
-        try: publish("project.bulk_updated", {"ids": changed_ids})
-        except Exception: pass
-
-    for pid in changed_ids:
-        patch_fields = changed_fields_by_id.get(pid, [])
-        from sqlalchemy.orm import Session  # for type hints
-        _ = db  # keep handle
-        # emit minimal patch
-        from .helpers import str_to_tags  # local import for clarity
-        p = db.get(models.Project, pid)
-        if not p: 
-            continue
-        patch = {k: getattr(p, k) for k in patch_fields if hasattr(p, k)}
-        if "tags" in patch_fields:
-            patch["tags"] = str_to_tags(p.tags)
-        notify({"type": "project_updated", "id": pid, "changed": patch_fields, "patch": patch})
-
-    return BulkResponse(updated_count=len(changed_ids))
+    notify_bulk(payload.action, changed, previous_status)
+    return BulkResponse(updated_count=len(changed))
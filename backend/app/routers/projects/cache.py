@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Hashable, Iterable, Optional, Tuple
+
+from ...config import settings
+from ...realtime import EventMeta, sse
+from .helpers import is_relevance_sort, sort_column
+
+# columns a list predicate reads (q searches title/description/tags/owner)
+_FILTER_FIELDS = {
+    "q": ("title", "description", "tags", "owner"),
+    "status": ("status",),
+    "owner": ("owner",),
+    "tag": ("tags",),
+    "health": ("health",),
+}
+
+# columns every update bumps, whatever `changed` lists
+_UPDATE_BUMPED = frozenset({"version", "last_updated", "change_seq"})
+
+# events that do not change any list page (anything not handled explicitly clears the cache)
+_NEUTRAL_EVENTS = {"bulk_job_progress", "stats_updated"}
+
+def dependent_fields(params: Dict[str, object]) -> FrozenSet[str]:
+    """Project columns whose change can alter membership, order or totals of a list query."""
+    fields = set()
+    for name, cols in _FILTER_FIELDS.items():
+        if params.get(name):
+            fields.update(cols)
+    if not is_relevance_sort(str(params.get("sort_by")), params.get("q")):  # type: ignore[arg-type]
+        fields.add(sort_column(str(params.get("sort_by"))).key)
+    return frozenset(fields)
+
+class _Entry:
+    __slots__ = ("body", "expires", "ids", "fields", "by_last_updated")
+
+    def __init__(self, body: bytes, expires: float, ids: FrozenSet[int], fields: FrozenSet[str]) -> None:
+        self.body = body
+        self.expires = expires
+        self.ids = ids  # projects on the page (their rows are embedded in the body)
+        self.fields = fields
+        self.by_last_updated = "last_updated" in fields
+
+class ListCache:
+    """LRU + TTL cache of serialized GET /projects responses.
+
+    Entries are keyed on the normalized query parameters and invalidated
+    from the mutation events: an update drops the pages that show the
+    project plus the queries whose filter/sort reads a changed column
+    (including version, last_updated and change_seq, which every update
+    bumps);
+    activity on a project drops the pages showing it (and last_updated
+    orderings); creates, deletes, recovers and imports clear everything.
+    Every invalidation bumps `generation`, and a response computed under
+    an older generation is not stored, so a read racing a write never
+    caches the pre-write page.
+    """
+
+    def __init__(self, max_entries: int = settings.list_cache_size, ttl: float = settings.list_cache_ttl_s) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Tuple[Optional[bytes], int]:
+        """(cached body or None, generation to pass back to `put`)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.body, self.generation
+            if entry is not None:
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None, self.generation
+
+    def put(self, key: Hashable, generation: int, body: bytes, ids: Iterable[int], fields: FrozenSet[str]) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return  # a mutation landed while this page was being built
+            self._entries[key] = _Entry(body, time.monotonic() + self.ttl, frozenset(ids), fields)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def invalidate(self, meta: EventMeta) -> None:
+        """Drop the entries a published event can affect."""
+        self.invalidate_many((meta,))
+
+    def invalidate_many(self, metas: Iterable[EventMeta]) -> None:
+        """`invalidate` for a batch of events, in a single pass over the entries."""
+        shown: set = set()  # pages showing these projects are stale
+        changed: set = set()  # queries reading these columns are stale
+        touched = False  # last_updated orderings are stale
+        for meta in metas:
+            if meta.type in _NEUTRAL_EVENTS:
+                continue
+            if meta.type in ("project_updated", "projects_updated"):
+                shown |= meta.project_ids
+                changed |= meta.changed | _UPDATE_BUMPED
+                touched = True
+            elif meta.type == "event_created":
+                # new activity is embedded in the page; comments also touch last_updated
+                shown |= meta.project_ids
+                touched = True
+            else:  # creates, deletes, recovers, imports, anything unknown
+                self.clear()
+                return
+        if not (shown or changed or touched):
+            return
+        with self._lock:
+            self.generation += 1
+            doomed = [
+                key for key, e in self._entries.items()
+                if not e.ids.isdisjoint(shown) or not e.fields.isdisjoint(changed) or (touched and e.by_last_updated)
+            ]
+            for key in doomed:
+                del self._entries[key]
+            self.invalidations += len(doomed)
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "generation": self.generation,
+        }
+
+list_cache = ListCache()
+# events published by other workers (outbox backend) reach this process here
+sse.listeners.append(list_cache.invalidate)
@@ -0,0 +1,47 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ... import models, schemas
+from ...changes import current_seq
+from .deps import get_read_db, db_route, CHANGES_PAGE_LIMIT, FIELDS_HELP, INCLUDE_HELP
+from .helpers import json_response, parse_fieldset, project_columns, projects_to_out
+
+router = APIRouter()
+
+@router.get("/changes", response_model=schemas.ProjectChanges)
+@db_route
+def project_changes(
+    since: int = Query(0, ge=0, description="watermark of the previous sync or list page (0: everything)"),
+    limit: int = Query(CHANGES_PAGE_LIMIT, ge=1, le=CHANGES_PAGE_LIMIT),
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    include: Optional[str] = Query(None, description=INCLUDE_HELP),
+    db: Session = Depends(get_read_db),
+):
+    """Projects that changed after `since`, for clients resyncing after a dropped stream.
+
+    Cost follows the number of changes: a range scan of ix_projects_change_seq.
+    Each project appears once, in its current state, ordered by its latest change;
+    `id` and `deleted_at` are returned even when `fields` leaves them out.
+    """
+    # a resyncing client must see deletions whatever it projected
+    fieldset = parse_fieldset(fields, include, always=("id", "deleted_at"))
+    # read the head first: anything committed later gets a larger number and
+    # is left for the next call instead of slipping between page and watermark
+    head = current_seq(db)
+    if since > head:
+        raise HTTPException(status_code=410, detail="Watermark is ahead of the server; reload the list")
+    seq = models.Project.change_seq
+    rows = (
+        db.query(*project_columns(fieldset, seq))
+        .filter(seq > since, seq <= head)
+        .order_by(seq.asc())
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return json_response(schemas.ProjectChanges.model_construct(
+        items=projects_to_out(db, rows, fieldset),
+        watermark=rows[-1].change_seq if has_more else head,
+        has_more=has_more,
+    ), offload_encoding=True)
@@ -1,24 +1,32 @@
-from typing import Optional, List
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from typing import Literal, Optional, List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from ... import models, schemas
-from .deps import get_db, DEFAULT_SORT_BY, DEFAULT_SORT_DIR, DEFAULT_PAGE, DEFAULT_PAGE_SIZE
+from ...changes import current_seq
+from ...config import settings
+from .deps import (
+    get_db, get_read_db, db_route, offload, DEFAULT_SORT_BY, DEFAULT_SORT_DIR, DEFAULT_PAGE, DEFAULT_PAGE_SIZE,
+    FIELDS_HELP, INCLUDE_HELP,
+)
 from .helpers import (
-    build_projects_query, apply_sorting, paginate, project_to_out,
-    require_project, tags_to_str, str_to_tags, now_utc
+    build_projects_query, apply_sorting, is_relevance_sort, paginate, keyset_paginate, estimated_count,
+    encode_cursor, encode_json, projects_to_out, single_project_out, conditional_response, json_response, list_etag,
+    project_etag, if_match_version,
+    log_event, require_project, require_project_row, parse_fieldset, project_columns, sort_column,
+    tags_to_str, str_to_tags, write_project_tags, now_utc
 )
-from .sse import notify
-
-try:
-    from ...events import publish  # optional
-except Exception:  # pragma: no cover
-    publish = None  # type: ignore
+from .cache import dependent_fields, list_cache
+from .readmodel import ReadModel, synced_read_model
+from .sse import notify, project_labels
 
 router = APIRouter()
 
 @router.get("/", response_model=schemas.PaginatedProjects)
+@db_route
 def list_projects(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     q: Optional[str] = Query(None),
     status: Optional[str] = None,
     owner: Optional[str] = None,
@@ -29,19 +37,88 @@ def list_projects(
     sort_dir: str = DEFAULT_SORT_DIR,
     page: int = DEFAULT_PAGE,
     page_size: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page"),
+    total_mode: Literal["exact", "estimate", "none"] = "exact",
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    include: Optional[str] = Query(None, description=INCLUDE_HELP),
+    if_none_match: Optional[str] = Header(None),
+    read_model: ReadModel = Depends(synced_read_model),
 ):
+    fieldset = parse_fieldset(fields, include)
+    watermark = current_seq(db)  # read first: the page then reflects at least this change
+    etag = list_etag(watermark, request.query_params.multi_items())
+    not_modified = conditional_response(response, etag, if_none_match)
+    if not_modified is not None:
+        return not_modified
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    params = dict(
+        q=q, status=status, owner=owner, tag=tag, health=health, include_deleted=include_deleted,
+        sort_by=sort_by, sort_dir=sort_dir.lower(), page=page, page_size=page_size,
+        cursor=cursor, total_mode=total_mode, fields=fieldset.fields, include=tuple(sorted(fieldset.include)),
+    )
+    key = tuple(params.items())
+    body, generation = list_cache.get(key)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    by_relevance = is_relevance_sort(sort_by, q)
+    if by_relevance and cursor:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported for relevance sort")
+    indexed = read_model.query(
+        q=q, status=status, owner=owner, tag=tag, health=health, include_deleted=include_deleted,
+        sort_by=sort_by, sort_dir=sort_dir, page=page, page_size=page_size, cursor=cursor,
+    ) if read_model.enabled else None
+
     query = build_projects_query(
         db, q=q, status=status, owner=owner, tag=tag,
         health=health, include_deleted=include_deleted
     )
-    query = apply_sorting(query, sort_by=sort_by, sort_dir=sort_dir)
-    total, items = paginate(query, page=page, page_size=page_size)
-    return schemas.PaginatedProjects(
-        items=[project_to_out(p) for p in items],
-        total=total, page=page, page_size=page_size
-    )
+    # narrow SELECT of the requested columns (plus the sort key next_cursor encodes)
+    columns = project_columns(fieldset, sort_column(sort_by))
+    sorted_query = apply_sorting(query, sort_by=sort_by, sort_dir=sort_dir, q=q).with_entities(*columns)
+
+    if indexed is not None:
+        # the index chose the page; only its rows are read from the database
+        by_id = {p.id: p for p in db.query(*columns).filter(models.Project.id.in_(indexed.ids))}
+        items = [by_id[pid] for pid in indexed.ids if pid in by_id]
+        total = indexed.total if total_mode != "none" else None
+        total_exact = total is not None  # the index counts every match
+        next_cursor = (
+            encode_cursor(items[-1], sort_by=sort_by, sort_dir=sort_dir) if items and indexed.has_more else None
+        )
+    elif by_relevance or (cursor is None and total_mode == "exact"):
+        total, items = paginate(sorted_query, page=page, page_size=page_size)
+        total_exact = True
+        next_cursor = (
+            encode_cursor(items[-1], sort_by=sort_by, sort_dir=sort_dir)
+            if items and page * page_size < total and not by_relevance else None
+        )
+    else:
+        if cursor is None and page > 1:
+            sorted_query = sorted_query.offset((page - 1) * page_size)
+        items, next_cursor = keyset_paginate(
+            sorted_query, sort_by=sort_by, sort_dir=sort_dir, cursor=cursor, page_size=page_size
+        )
+        if total_mode == "exact":
+            total = query.count()
+        elif total_mode == "estimate":
+            total = estimated_count(query, (q, status, owner, tag, health, include_deleted))
+        else:
+            total = None
+        total_exact = total_mode == "exact"
+
+    body = offload(encode_json, schemas.PaginatedProjects.model_construct(
+        items=projects_to_out(db, items, fieldset),
+        total=total, page=page, page_size=page_size,
+        next_cursor=next_cursor, total_exact=total_exact, watermark=watermark,
+    ))
+    if list_cache.enabled:
+        list_cache.put(key, generation, body, (p.id for p in items), dependent_fields(params))
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.post("/", response_model=schemas.ProjectOut, status_code=201)
+@db_route
 def create_project(payload: schemas.ProjectCreate, db: Session = Depends(get_db)):
     now = now_utc()
     p = models.Project(
@@ -51,52 +128,64 @@ def create_project(payload: schemas.ProjectCreate, db: Session = Depends(get_db)
         status=payload.status,
         health=payload.health,
         tags=tags_to_str(payload.tags),
-        progress=payload.progress,
+        progress=0.0 if settings.derived_progress else payload.progress,  # derived: no milestones yet
         last_updated=now,
     )
     db.add(p); db.flush()
+    write_project_tags(db, p.id, str_to_tags(p.tags))
     for m in getattr(payload, "team", []) or []:
         db.add(models.TeamMember(project_id=p.id, name=m.name, role=m.role, capacity=m.capacity))
-    db.add(models.Event(project_id=p.id, kind="created", message=f"Project '{p.title}' created", at=now))
+    log_event(db, p.id, "created", f"Project '{p.title}' created", at=now)
     db.commit(); db.refresh(p)
 
-    if publish:
-        try: publish("project.created", {"id": p.id})
-        except Exception: pass
-
-    notify({"type": "project_created", "id": p.id})
-    return project_to_out(p)
+    notify({"type": "project_created", "id": p.id}, owner=p.owner, status=p.status)
+    return json_response(single_project_out(db, p), status_code=201)
 
 @router.get("/{project_id}", response_model=schemas.ProjectOut)
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    return project_to_out(require_project(db, project_id))
+@db_route
+def get_project(
+    project_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    include: Optional[str] = Query(None, description=INCLUDE_HELP),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
+    fieldset = parse_fieldset(fields, include)
+    not_modified = conditional_response(response, project_etag(db, project_id), if_none_match)
+    if not_modified is not None:
+        return not_modified
+    row = require_project_row(db, project_id, fieldset)
+    return json_response(single_project_out(db, row, fieldset), response=response)
 
 @router.put("/{project_id}", response_model=schemas.ProjectOut)
+@db_route
 def update_project(
     project_id: int,
     payload: schemas.ProjectUpdate,
     response: Response,
-    if_match: Optional[str] = Header(None, convert_underscores=False),
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
     p = require_project(db, project_id)
 
     # ETag (version) optimistic concurrency
     if if_match:
-        try:
-            expected = int(if_match.strip('"'))
-        except ValueError:
-            expected = None
+        expected = if_match_version(if_match)
         if expected is not None and expected != p.version:
             raise HTTPException(status_code=412, detail="Version mismatch (optimistic concurrency)")
 
     changed: List[str] = []
+    before = project_labels(p)
     data = payload.model_dump(exclude_unset=True)
+    if settings.derived_progress:
+        data.pop("progress", None)  # follows the milestones
 
     if "tags" in data:
         new_tags = tags_to_str(data["tags"])
         if new_tags != p.tags:
             p.tags = new_tags; changed.append("tags")
+            write_project_tags(db, p.id, str_to_tags(new_tags))
         del data["tags"]
 
     for field, val in data.items():
@@ -106,41 +195,37 @@ def update_project(
     if changed:
         p.version += 1
         p.last_updated = now_utc()
-        db.add(models.Event(project_id=p.id, kind="updated", message=f"Updated: {', '.join(changed)}", at=p.last_updated))
+        log_event(db, p.id, "updated", f"Updated: {', '.join(changed)}", at=p.last_updated)
         db.commit(); db.refresh(p)
-        response.headers["ETag"] = f'"{p.version}"'
-        if publish:
-            try: publish("project.updated", {"id": p.id, "changed": changed})
-            except Exception: pass
+        response.headers["ETag"] = project_etag(db, p.id)
         # SSE patch
         patch = {k: getattr(p, k) for k in changed if hasattr(p, k)}
         if "tags" in changed: patch["tags"] = str_to_tags(p.tags)
-        notify({"type": "project_updated", "id": p.id, "changed": changed, "patch": patch})
+        notify(
+            {"type": "project_updated", "id": p.id, "changed": changed, "patch": patch},
+            owner={before["owner"], p.owner}, status={before["status"], p.status},
+        )
 
-    return project_to_out(p)
+    return json_response(single_project_out(db, p), response=response)
 
 @router.delete("/{project_id}", status_code=204)
+@db_route
 def soft_delete(project_id: int, db: Session = Depends(get_db)):
     p = require_project(db, project_id)
     p.deleted_at = now_utc(); p.version += 1
-    db.add(models.Event(project_id=p.id, kind="deleted", message="Soft deleted", at=p.deleted_at))
+    log_event(db, p.id, "deleted", "Soft deleted", at=p.deleted_at)
     db.commit()
-    if publish:
-        try: publish("project.deleted", {"id": p.id})
-        except Exception: pass
-    notify({"type": "project_deleted", "id": p.id})
+    notify({"type": "project_deleted", "id": p.id}, owner=p.owner, status=p.status)
     return
 
 @router.post("/{project_id}/recover", response_model=schemas.ProjectOut)
+@db_route
 def recover(project_id: int, db: Session = Depends(get_db)):
     p = require_project(db, project_id, allow_deleted=True)
     if p.deleted_at is None:
         raise HTTPException(status_code=404, detail="Project not recoverable")
     p.deleted_at = None; p.version += 1; p.last_updated = now_utc()
-    db.add(models.Event(project_id=p.id, kind="recovered", message="Recovered from soft delete", at=p.last_updated))
+    log_event(db, p.id, "recovered", "Recovered from soft delete", at=p.last_updated)
     db.commit(); db.refresh(p)
-    if publish:
-        try: publish("project.recovered", {"id": p.id})
-        except Exception: pass
-    notify({"type": "project_recovered", "id": p.id})
-    return project_to_out(p)
+    notify({"type": "project_recovered", "id": p.id}, owner=p.owner, status=p.status)
+    return json_response(single_project_out(db, p))
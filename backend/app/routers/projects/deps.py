@@ -1,12 +1,37 @@
-from typing import Iterable
+import functools
+import inspect
+from typing import AsyncIterator, Callable, Iterable, TypeVar
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ...database import SessionLocal
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from starlette.concurrency import run_in_threadpool
+from ... import database
+from ...database import ReadSessionLocal, SessionLocal
+
+T = TypeVar("T")
 
 # shared constants
 DEFAULT_SORT_BY = "last_updated"
 DEFAULT_SORT_DIR = "desc"
+RELEVANCE_SORT = "relevance"  # only meaningful together with q
 DEFAULT_PAGE = 1
 DEFAULT_PAGE_SIZE = 10
+RECENT_EVENTS_LIMIT = 10
+EVENTS_PAGE_LIMIT = 200  # max events per GET /projects/{id}/events page
+UNION_CHUNK_SIZE = 200  # per-project subqueries per UNION ALL (SQLite caps compound selects at 500)
+BATCH_MAX_IDS = 200  # projects per POST /projects/batch (one IN list / UNION ALL per relation)
+CHANGES_PAGE_LIMIT = 1000  # max projects per GET /projects/changes page
+COUNT_CACHE_TTL = 30.0  # seconds an estimated total may be reused
+IN_CHUNK_SIZE = 500  # ids per IN list / version CASE in set-based statements
+EXPORT_CHUNK_SIZE = 1000  # projects fetched (and children batch-loaded) per export step
+IMPORT_BATCH_SIZE = 1000  # NDJSON lines inserted per import transaction
+JOB_STALE_AFTER = 30.0  # seconds without a heartbeat before a running bulk job is reclaimed
+STATS_PUSH_DEBOUNCE = 0.05  # seconds mutations are gathered before one stats delta is pushed
+STATS_REFRESH_INTERVAL = 60.0  # seconds between unprompted stats checks (milestones turning overdue)
+
+FIELDS_HELP = "Comma-separated project fields to return (id is always included), e.g. title,owner,status"
+INCLUDE_HELP = "Comma-separated relations to embed: team, recent_events (default: both unless `fields` is set)"
 
 def get_db() -> Iterable[Session]:
     db = SessionLocal()
@@ -14,3 +39,60 @@ def get_db() -> Iterable[Session]:
         yield db
     finally:
         db.close()
+
+def get_read_db() -> Iterable[Session]:
+    """Session on the reader pool (same engine as get_db in the default profile)."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    async with database.AsyncReadSessionLocal() as db:
+        yield db
+
+_ASYNC_DEPENDENCY = {get_db: get_async_db, get_read_db: get_async_read_db}
+
+def db_route(fn: Callable) -> Callable:
+    """Serve a sync `def handler(..., db: Session)` from the async engine when DB_ASYNC is on.
+
+    The handler body is unchanged: it runs through `AsyncSession.run_sync`, so
+    SQL I/O is awaited on the event loop instead of occupying a threadpool slot,
+    and `notify` is a plain in-loop call. Everything else in the body runs on
+    the loop too: blocking I/O belongs in a plain-def dependency (FastAPI runs
+    those in the threadpool) and heavy CPU work goes through `offload`. With
+    DB_ASYNC off the handler is returned as-is and FastAPI runs it in the
+    threadpool as before.
+    """
+    if not database.DB_ASYNC:
+        return fn
+    sig = inspect.signature(fn)
+    params = [
+        p.replace(default=Depends(_ASYNC_DEPENDENCY[p.default.dependency])) if p.name == "db" else p
+        for p in sig.parameters.values()
+    ]
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        adb = kwargs.pop("db")
+        return await adb.run_sync(lambda db: fn(*args, db=db, **kwargs))
+
+    wrapper.__signature__ = sig.replace(parameters=params)  # type: ignore[attr-defined]
+    return wrapper
+
+def offload(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Call `fn` off the event loop when running inside a DB_ASYNC handler.
+
+    Those handlers execute on the loop (see `db_route`); this awaits `fn` in
+    the threadpool through SQLAlchemy's greenlet bridge so other requests keep
+    being served meanwhile. Sync handlers already own a worker thread and call
+    `fn` directly. `fn` must not touch the session.
+    """
+    if database.DB_ASYNC and in_greenlet():
+        return await_only(run_in_threadpool(fn, *args, **kwargs))
+    return fn(*args, **kwargs)
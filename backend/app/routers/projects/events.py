@@ -1,33 +1,63 @@
-from typing import List
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy import and_, or_, select, union_all
 from sqlalchemy.orm import Session
 from ... import models, schemas
-from .deps import get_db
-from .helpers import require_project
+from .deps import get_db, get_read_db, db_route, EVENTS_PAGE_LIMIT
+from .helpers import (
+    conditional_response, decode_event_cursor, encode_event_cursor, event_out, json_response, log_event, now_utc,
+    project_etag, require_project,
+)
+from .sse import notify_event, project_labels
 
 router = APIRouter()
 
+def page_events(db: Session, project_id: int, limit: int, before: Optional[Tuple[datetime, int]] = None) -> list:
+    """Newest-first events of a project across `events` and `events_archive`,
+    strictly older than `before` (at, id). Each table answers from its
+    (project_id, at, id) index; the two short runs are merged by the outer ORDER BY."""
+    parts = []
+    for T in (models.Event, models.EventArchive):
+        q = select(T.id, T.project_id, T.kind, T.message, T.at).where(T.project_id == project_id)
+        if before is not None:
+            at, last_id = before
+            q = q.where(or_(T.at < at, and_(T.at == at, T.id < last_id)))
+        parts.append(select(q.order_by(T.at.desc(), T.id.desc()).limit(limit).subquery()))
+    merged = union_all(*parts).subquery()
+    return db.execute(select(merged).order_by(merged.c.at.desc(), merged.c.id.desc()).limit(limit)).all()
+
 @router.get("/{project_id}/events", response_model=List[schemas.EventOut])
-def list_events(project_id: int, limit: int = Query(20, ge=1, le=200), db: Session = Depends(get_db)):
-    require_project(db, project_id, allow_deleted=True)
-    q = (
-        db.query(models.Event)
-        .filter(models.Event.project_id == project_id)
-        .order_by(models.Event.at.desc(), models.Event.id.desc())
-        .limit(limit)
-    )
-    events = q.all()
-    return [schemas.EventOut(id=e.id, project_id=e.project_id, kind=e.kind, message=e.message, at=e.at) for e in events]
+@db_route
+def list_events(
+    project_id: int,
+    response: Response,
+    limit: int = Query(20, ge=1, le=EVENTS_PAGE_LIMIT),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
+    """Activity newest first, archived events included. When older events
+    exist the response carries an X-Next-Cursor header to pass back as `cursor`."""
+    # the validator covers every event of the project, so it holds for any page
+    etag = project_etag(db, project_id, allow_deleted=True)
+    not_modified = conditional_response(response, etag, if_none_match)
+    if not_modified is not None:
+        return not_modified
+    rows = page_events(db, project_id, limit + 1, decode_event_cursor(cursor) if cursor else None)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_event_cursor(rows[-1].at, rows[-1].id)
+    return json_response([event_out(r) for r in rows], response=response)
 
 @router.post("/{project_id}/events", response_model=schemas.EventOut, status_code=201)
+@db_route
 def add_event(project_id: int, body: schemas.EventCreate, db: Session = Depends(get_db)):
     p = require_project(db, project_id)
-    from .helpers import now_utc
+    labels = project_labels(p)
     now = now_utc()
-    ev = models.Event(project_id=project_id, kind=body.kind, message=body.message, at=now)
-    db.add(ev)
+    ev = log_event(db, project_id, body.kind, body.message, at=now)
     p.last_updated = now  # touch project
-    db.commit(); db.refresh(ev)
-    from .sse import notify
-    notify({"type": "event_created","project_id": project_id,"event": {"id": ev.id, "kind": ev.kind, "message": ev.message, "at": ev.at.isoformat()},})
-    return schemas.EventOut(id=ev.id, project_id=ev.project_id, kind=ev.kind, message=ev.message, at=ev.at)
+    db.commit()
+    notify_event(ev, **labels)
+    return json_response(event_out(ev), status_code=201)
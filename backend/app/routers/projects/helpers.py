@@ -1,9 +1,21 @@
+import base64
+import hashlib
+import json
+import threading
+import time
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
-from sqlalchemy import asc, desc, func, or_
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import DateTime, and_, asc, case, delete, desc, func, insert, or_, select, text, union_all, update
 from sqlalchemy.orm import Session, Query as SAQuery
-from ... import models, schemas
-from .deps import DEFAULT_SORT_BY, DEFAULT_SORT_DIR
+from ... import models, schemas, search
+from ...config import settings
+from .deps import (
+    COUNT_CACHE_TTL, DEFAULT_SORT_BY, DEFAULT_SORT_DIR, RECENT_EVENTS_LIMIT, RELEVANCE_SORT, UNION_CHUNK_SIZE,
+    offload,
+)
 
 def tags_to_str(tags: Optional[List[str]]) -> str:
     if not tags:
@@ -16,41 +28,320 @@ def str_to_tags(s: Optional[str]) -> List[str]:
         return []
     return [t for t in s.split(",") if t]
 
-def project_to_out(p: models.Project) -> schemas.ProjectOut:
-    recent = sorted(p.events, key=lambda e: (e.at, e.id), reverse=True)[:10]
-    return schemas.ProjectOut(
-        id=p.id,
-        title=p.title,
-        description=p.description,
-        owner=p.owner,
-        status=p.status,
-        health=p.health,
-        tags=str_to_tags(p.tags),
-        progress=p.progress,
-        last_updated=p.last_updated,
-        version=p.version,
-        deleted_at=p.deleted_at,
-        team=[
-            schemas.TeamMemberOut(
-                id=m.id, project_id=p.id, name=m.name, role=m.role, capacity=m.capacity
+# ---------- normalized tags (project_tags) ----------
+
+def write_project_tags(db: Session, project_id: int, tags: List[str]) -> None:
+    """Replace one project's rows in project_tags (caller keeps Project.tags in step)."""
+    db.execute(delete(models.ProjectTag).where(models.ProjectTag.project_id == project_id))
+    if tags:
+        db.execute(insert(models.ProjectTag), [{"project_id": project_id, "tag": t} for t in tags])
+
+def tagged_project_ids(db: Session, project_ids: List[int], tag: str) -> set:
+    """Which of `project_ids` carry `tag` (index range scan on (tag, project_id))."""
+    rows = db.execute(
+        select(models.ProjectTag.project_id).where(
+            models.ProjectTag.tag == tag, models.ProjectTag.project_id.in_(project_ids)
+        )
+    )
+    return {pid for (pid,) in rows}
+
+def add_tag_to(db: Session, project_ids: List[int], tag: str) -> None:
+    """Link `tag` to projects in project_tags (caller refreshes Project.tags)."""
+    if project_ids:
+        db.execute(
+            insert(models.ProjectTag).prefix_with("OR IGNORE"),
+            [{"project_id": pid, "tag": tag} for pid in project_ids],
+        )
+
+def remove_tag_from(db: Session, project_ids: List[int], tag: str) -> None:
+    """Unlink `tag` from projects in project_tags (caller refreshes Project.tags)."""
+    if project_ids:
+        db.execute(
+            delete(models.ProjectTag).where(
+                models.ProjectTag.tag == tag, models.ProjectTag.project_id.in_(project_ids)
             )
-            for m in p.team
-        ],
-        recent_events=[
-            schemas.EventOut(
-                id=e.id, project_id=p.id, kind=e.kind, message=e.message, at=e.at
+        )
+
+# Project.tags rebuilt from project_tags, correlated on the projects row being updated
+TAG_STRING_SQL = (
+    "COALESCE(("
+    " SELECT group_concat(tag, ',') FROM ("
+    "  SELECT tag FROM project_tags WHERE project_tags.project_id = projects.id ORDER BY tag"
+    " )), '')"
+)
+
+_REFRESH_TAG_STRINGS = text(f"UPDATE projects SET tags = {TAG_STRING_SQL} WHERE id = :id")
+
+def refresh_tag_strings(db: Session, project_ids: List[int]) -> None:
+    """Rebuild the denormalized Project.tags string from project_tags."""
+    if project_ids:
+        db.execute(_REFRESH_TAG_STRINGS, [{"id": pid} for pid in project_ids])
+
+def chunked(seq: List[Any], size: int) -> Iterable[List[Any]]:
+    """Consecutive slices of at most `size` items (keeps IN lists under SQLite's variable limit)."""
+    for start in range(0, len(seq), size):
+        yield seq[start:start + size]
+
+def load_team(db: Session, project_ids: Iterable[int]) -> Dict[int, List[models.TeamMember]]:
+    """Team members for a whole page of projects in one query."""
+    ids = list(project_ids)
+    by_project: Dict[int, List[models.TeamMember]] = {pid: [] for pid in ids}
+    if not ids:
+        return by_project
+    members = (
+        db.query(models.TeamMember)
+        .filter(models.TeamMember.project_id.in_(ids))
+        .order_by(models.TeamMember.project_id.asc(), models.TeamMember.id.asc())
+        .all()
+    )
+    for m in members:
+        by_project[m.project_id].append(m)
+    return by_project
+
+def load_milestones(db: Session, project_ids: Iterable[int]) -> Dict[int, List[models.Milestone]]:
+    """Milestones for many projects in one query, in GET /{id}/milestones order."""
+    ids = list(project_ids)
+    by_project: Dict[int, List[models.Milestone]] = {pid: [] for pid in ids}
+    if not ids:
+        return by_project
+    milestones = (
+        db.query(models.Milestone)
+        .filter(models.Milestone.project_id.in_(ids))
+        .order_by(models.Milestone.project_id.asc(), models.Milestone.sort.asc(), models.Milestone.id.asc())
+        .all()
+    )
+    for m in milestones:
+        by_project[m.project_id].append(m)
+    return by_project
+
+def load_recent_events(
+    db: Session, project_ids: Iterable[int], *, limit: int = RECENT_EVENTS_LIMIT
+) -> Dict[int, List[models.Event]]:
+    """Newest `limit` events per project.
+
+    One LIMIT subquery per project, glued with UNION ALL: each is a short
+    range scan of ix_events_project_at_id, so the cost does not grow with a
+    project's history the way ranking every event with a window did.
+    """
+    E = models.Event
+    ids = list(project_ids)
+    by_project: Dict[int, List[models.Event]] = {pid: [] for pid in ids}
+    events: List[models.Event] = []
+    for part in chunked(ids, UNION_CHUNK_SIZE):
+        newest = union_all(*[
+            select(
+                select(E.id).where(E.project_id == pid).order_by(E.at.desc(), E.id.desc()).limit(limit).subquery()
             )
-            for e in recent
-        ],
+            for pid in part
+        ])
+        events += db.query(E).filter(E.id.in_(newest)).order_by(E.project_id, E.at.desc(), E.id.desc()).all()
+    for e in events:
+        by_project[e.project_id].append(e)
+    return by_project
+
+# ---------- sparse fieldsets (?fields= / ?include=) ----------
+
+PROJECT_RELATIONS = ("team", "recent_events")
+PROJECT_FIELDS = tuple(f for f in schemas.ProjectOut.model_fields if f not in PROJECT_RELATIONS)
+
+class Fieldset:
+    """ProjectOut scalars (all projects columns) and relations one request returns."""
+
+    __slots__ = ("fields", "include")
+
+    def __init__(self, fields: Tuple[str, ...], include: FrozenSet[str]) -> None:
+        self.fields = fields
+        self.include = include
+
+FULL_FIELDSET = Fieldset(PROJECT_FIELDS, frozenset(PROJECT_RELATIONS))
+
+def _names(value: str) -> List[str]:
+    return [n.strip() for n in value.split(",") if n.strip()]
+
+def parse_fieldset(
+    fields: Optional[str], include: Optional[str], always: Tuple[str, ...] = ("id",),
+) -> Fieldset:
+    """`fields` picks ProjectOut fields (relations allowed), `include` adds relations.
+
+    Without `fields` every scalar is returned, and every relation unless
+    `include` names a subset (`include=` alone drops them all). With
+    `fields`, relations come only from the two lists. The `always` scalars
+    (`id` by default) are kept regardless.
+    """
+    picked = _names(fields) if fields is not None else list(PROJECT_FIELDS)
+    if include is not None:
+        relations = _names(include)
+    else:
+        relations = [] if fields is not None else list(PROJECT_RELATIONS)
+    unknown = [n for n in picked if n not in PROJECT_FIELDS and n not in PROJECT_RELATIONS]
+    unknown += [n for n in relations if n not in PROJECT_RELATIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(unknown)}")
+    scalars = tuple(f for f in PROJECT_FIELDS if f in picked or f in always)
+    return Fieldset(scalars, frozenset(relations).union(n for n in picked if n in PROJECT_RELATIONS))
+
+def project_columns(fieldset: Fieldset, *extra: Any) -> List[Any]:
+    """Narrow SELECT list for `fieldset`, plus `extra` columns (e.g. the sort key a cursor encodes)."""
+    columns = [getattr(models.Project, f) for f in fieldset.fields]
+    return columns + [c for c in extra if c.key not in fieldset.fields]
+
+# ---------- serialization ----------
+# Rows coming from our own tables are trusted: output models are built with
+# model_construct (no validation) and encoded once by pydantic-core, instead
+# of validate -> re-validate against response_model -> jsonable_encoder -> json.
+
+def team_member_out(m) -> schemas.TeamMemberOut:
+    return schemas.TeamMemberOut.model_construct(
+        id=m.id, project_id=m.project_id, name=m.name, role=m.role, capacity=m.capacity
+    )
+
+def milestone_out(m) -> schemas.MilestoneOut:
+    return schemas.MilestoneOut.model_construct(
+        id=m.id, project_id=m.project_id, title=m.title, done=m.done, due_at=m.due_at, sort=m.sort
     )
 
+def event_out(e) -> schemas.EventOut:
+    return schemas.EventOut.model_construct(
+        id=e.id, project_id=e.project_id, kind=e.kind, message=e.message, at=e.at
+    )
+
+def project_to_out(
+    p: Any,
+    team: Optional[List[models.TeamMember]] = None,
+    recent_events: Optional[List[models.Event]] = None,
+    fields: Tuple[str, ...] = PROJECT_FIELDS,
+) -> schemas.ProjectOut:
+    """`p` is a Project or a narrow row holding `fields`; relations are set only when given.
+
+    Unselected fields stay unset, so dumping with exclude_unset returns exactly the fieldset.
+    """
+    data = {f: getattr(p, f) for f in fields}
+    if "tags" in data:
+        data["tags"] = str_to_tags(data["tags"])
+    if team is not None:
+        data["team"] = [team_member_out(m) for m in team]
+    if recent_events is not None:
+        data["recent_events"] = [event_out(e) for e in recent_events]
+    return schemas.ProjectOut.model_construct(**data)
+
+def encode_json(content: Any) -> bytes:
+    """A single model is dumped with exclude_unset, which drops fields a sparse fieldset left out."""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(exclude_unset=True).encode()
+    return to_json(content)
+
+def json_response(
+    content: Any, *, response: Optional[Response] = None, status_code: int = 200, offload_encoding: bool = False
+) -> Response:
+    """Encode output models (or lists of them) straight to JSON bytes.
+
+    Returning a Response skips FastAPI's response_model pass (the declared
+    model still documents the endpoint). Headers already set on the
+    injected `response` (ETag, X-Next-Cursor) are carried over. Bodies with
+    many projects pass `offload_encoding` to encode off the event loop.
+    """
+    body = offload(encode_json, content) if offload_encoding else encode_json(content)
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=dict(response.headers) if response is not None else None,
+    )
+
+def projects_to_out(
+    db: Session, projects: List[Any], fieldset: Fieldset = FULL_FIELDSET
+) -> List[schemas.ProjectOut]:
+    """Serialize a page of projects with a constant number of queries (no lazy loads).
+    Relations outside `fieldset.include` are not queried at all. The rows are
+    fully loaded first, so building several models can be offloaded."""
+    ids = [p.id for p in projects]
+    team = load_team(db, ids) if "team" in fieldset.include else {}
+    events = load_recent_events(db, ids) if "recent_events" in fieldset.include else {}
+
+    def build() -> List[schemas.ProjectOut]:
+        return [project_to_out(p, team.get(p.id), events.get(p.id), fieldset.fields) for p in projects]
+
+    return offload(build) if len(projects) > 1 else build()
+
+def single_project_out(db: Session, p: Any, fieldset: Fieldset = FULL_FIELDSET) -> schemas.ProjectOut:
+    return projects_to_out(db, [p], fieldset)[0]
+
 def require_project(db: Session, project_id: int, *, allow_deleted: bool = False) -> models.Project:
     p = db.get(models.Project, project_id)
     if not p or (not allow_deleted and p.deleted_at is not None):
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Project not found")
     return p
 
+def require_project_row(db: Session, project_id: int, fieldset: Fieldset) -> Any:
+    """require_project reading only the columns of `fieldset`."""
+    row = (
+        db.query(*project_columns(fieldset))
+        .filter(models.Project.id == project_id, models.Project.deleted_at.is_(None))
+        .first()
+    )
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return row
+
+# ---------- conditional GET (ETag / If-None-Match) ----------
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 7232 weak comparison of an If-None-Match header against our ETag."""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+
+def conditional_response(response: Response, etag: str, if_none_match: Optional[str]) -> Optional[Response]:
+    """A 304 if the client already holds `etag`, else None (and `etag` is set on `response`)."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+def if_match_version(if_match: str) -> Optional[int]:
+    """Project version an If-Match header expects, or None for `*`.
+
+    Accepts the plain version or a GET validator (`"<version>.<event id>"`).
+    A weak tag never matches under If-Match (412); anything else is a 400.
+    """
+    tag = if_match.strip()
+    if tag == "*":
+        return None
+    if tag.startswith("W/"):
+        raise HTTPException(status_code=412, detail="Weak ETags cannot be used with If-Match")
+    try:
+        return int(tag.strip('"').split(".")[0])
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Malformed If-Match header")
+
+def project_etag(db: Session, project_id: int, *, allow_deleted: bool = False) -> str:
+    """Validator for a project and its sub-resources: `"<version>.<newest event id>"`.
+
+    Project fields bump `version`; team, milestone and event changes all
+    write an activity event. Costs one primary-key lookup plus one MAX on
+    the events(project_id) index, so it is safe to run before every GET.
+    """
+    newest_event = (
+        select(func.max(models.Event.id)).where(models.Event.project_id == models.Project.id).scalar_subquery()
+    )
+    row = db.execute(
+        select(models.Project.version, models.Project.deleted_at, newest_event).where(models.Project.id == project_id)
+    ).first()
+    if row is None or (not allow_deleted and row.deleted_at is not None):
+        raise HTTPException(status_code=404, detail="Project not found")
+    return f'"{row.version}.{row[2] or 0}"'
+
+def list_etag(watermark: int, params: Iterable[Tuple[str, str]]) -> str:
+    """Validator for a list query: the change-sequence watermark hashed with the query params.
+
+    Every write to a project or its team/milestones/events takes a new change
+    number (app/changes.py), so the watermark moves whenever any list could change.
+    """
+    digest = hashlib.sha1(repr((watermark, sorted(params))).encode()).hexdigest()[:24]
+    return f'"{digest}"'
+
 def build_projects_query(
     db: Session,
     *,
@@ -64,7 +355,11 @@ def build_projects_query(
     query = db.query(models.Project)
     if not include_deleted:
         query = query.filter(models.Project.deleted_at.is_(None))
-    if q:
+    match = search.match_expression(q) if q and search.enabled else None
+    if match:
+        fts = search.projects_fts
+        query = query.join(fts, fts.c.rowid == models.Project.id).filter(search.match_clause(match))
+    elif q:
         like = f"%{q.lower()}%"
         query = query.filter(
             or_(
@@ -79,19 +374,162 @@ def build_projects_query(
     if owner:
         query = query.filter(models.Project.owner == owner)
     if tag:
-        query = query.filter(models.Project.tags.like(f"%{tag}%"))
+        query = query.filter(
+            models.Project.id.in_(
+                select(models.ProjectTag.project_id).where(models.ProjectTag.tag == tag)
+            )
+        )
     if health:
         query = query.filter(models.Project.health == health)
     return query
 
-def apply_sorting(query: SAQuery, *, sort_by: str = DEFAULT_SORT_BY, sort_dir: str = DEFAULT_SORT_DIR) -> SAQuery:
-    sort_col = getattr(models.Project, sort_by, models.Project.last_updated)
-    return query.order_by(desc(sort_col) if sort_dir.lower() == "desc" else asc(sort_col))
+def sort_column(sort_by: str):
+    if sort_by in models.Project.__table__.c:
+        return getattr(models.Project, sort_by)
+    return models.Project.last_updated
+
+def is_relevance_sort(sort_by: str, q: Optional[str]) -> bool:
+    return sort_by == RELEVANCE_SORT and bool(q and search.enabled and search.match_expression(q))
+
+def apply_sorting(
+    query: SAQuery, *, sort_by: str = DEFAULT_SORT_BY, sort_dir: str = DEFAULT_SORT_DIR,
+    q: Optional[str] = None,
+) -> SAQuery:
+    if is_relevance_sort(sort_by, q):
+        # bm25 rank: lower is better, so "desc" (most relevant first) is rank ASC
+        rank = search.projects_fts.c.rank
+        if sort_dir.lower() == "desc":
+            return query.order_by(asc(rank), desc(models.Project.id))
+        return query.order_by(desc(rank), asc(models.Project.id))
+    sort_col = sort_column(sort_by)
+    # id breaks ties so the order is total (required by keyset pagination)
+    if sort_dir.lower() == "desc":
+        return query.order_by(desc(sort_col), desc(models.Project.id))
+    return query.order_by(asc(sort_col), asc(models.Project.id))
 
 def paginate(query: SAQuery, *, page: int, page_size: int) -> Tuple[int, List[models.Project]]:
     total = query.count()
     items = query.offset((page - 1) * page_size).limit(page_size).all()
     return total, items
 
+# ---------- keyset (cursor) pagination ----------
+
+def encode_cursor(p: models.Project, *, sort_by: str, sort_dir: str) -> str:
+    value = getattr(p, sort_column(sort_by).key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort_by, sort_dir.lower(), value, p.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, *, sort_by: str, sort_dir: str) -> Tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        c_sort_by, c_sort_dir, value, last_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if c_sort_by != sort_by or c_sort_dir != sort_dir.lower():
+        raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+    col = sort_column(sort_by)
+    if value is not None and isinstance(col.type, DateTime):
+        value = datetime.fromisoformat(value)
+    return value, int(last_id)
+
+def encode_event_cursor(at: datetime, event_id: int) -> str:
+    raw = json.dumps([at.isoformat(), event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_event_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        at, last_id = json.loads(raw)
+        return datetime.fromisoformat(at), int(last_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_paginate(
+    query: SAQuery, *, sort_by: str, sort_dir: str, cursor: Optional[str], page_size: int
+) -> Tuple[List[models.Project], Optional[str]]:
+    """One page after `cursor` in apply_sorting order; O(page_size) regardless of depth."""
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by=sort_by, sort_dir=sort_dir)
+        col, pid = sort_column(sort_by), models.Project.id
+        # SQLite sorts NULLs first ascending and last descending
+        if sort_dir.lower() == "desc":
+            if value is None:
+                query = query.filter(and_(col.is_(None), pid < last_id))
+            else:
+                query = query.filter(or_(col < value, and_(col == value, pid < last_id), col.is_(None)))
+        else:
+            if value is None:
+                query = query.filter(or_(and_(col.is_(None), pid > last_id), col.isnot(None)))
+            else:
+                query = query.filter(or_(col > value, and_(col == value, pid > last_id)))
+    rows = query.limit(page_size + 1).all()
+    items = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        next_cursor = encode_cursor(items[-1], sort_by=sort_by, sort_dir=sort_dir)
+    return items, next_cursor
+
+# ---------- totals ----------
+
+_count_cache: Dict[Hashable, Tuple[float, int]] = {}
+_count_lock = threading.Lock()
+
+def estimated_count(query: SAQuery, key: Hashable) -> int:
+    """`query.count()` served from a short-lived cache keyed on the filter parameters."""
+    now = time.monotonic()
+    with _count_lock:
+        hit = _count_cache.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+    total = query.count()
+    with _count_lock:
+        if len(_count_cache) >= 1024:
+            _count_cache.clear()
+        _count_cache[key] = (now + COUNT_CACHE_TTL, total)
+    return total
+
+# ---------- activity log ----------
+
+_EVENT_RETURNING = (models.Event.id, models.Event.project_id, models.Event.kind, models.Event.message, models.Event.at)
+
+def log_event(db: Session, project_id: int, kind: str, message: str, at: Optional[datetime] = None):
+    """Append one activity event inside the caller's transaction.
+
+    A single INSERT ... RETURNING hands back the stored row (id, project_id,
+    kind, message, at) as a plain Row: it stays readable after the caller's
+    one commit, so `sse.notify_event` can broadcast it without reading it back.
+    """
+    return db.execute(
+        insert(models.Event)
+        .values(project_id=project_id, kind=kind, message=message, at=at or now_utc())
+        .returning(*_EVENT_RETURNING)
+    ).one()
+
+# ---------- milestone counters ----------
+
+def progress_from_counts(total: int, done: int) -> float:
+    """Derived progress (PROGRESS_MODE=derived): percentage of done milestones."""
+    return 100.0 * done / total if total else 0.0
+
+def bump_milestone_counters(db: Session, project_id: int, total: int = 0, done: int = 0) -> Dict[str, Any]:
+    """Apply milestone count deltas to a project inside the caller's transaction.
+
+    In derived mode progress is recomputed in the same UPDATE. Returns the
+    new values, ready to use as an SSE patch.
+    """
+    P = models.Project
+    new_total, new_done = P.milestones_total + total, P.milestones_done + done
+    values: Dict[Any, Any] = {P.milestones_total: new_total, P.milestones_done: new_done}
+    if settings.derived_progress:
+        values[P.progress] = case((new_total > 0, 100.0 * new_done / new_total), else_=0.0)
+    row = db.execute(
+        update(P).where(P.id == project_id).values(values)
+        .returning(P.milestones_total, P.milestones_done, P.progress)
+        .execution_options(synchronize_session=False)
+    ).one()
+    return dict(row._mapping)
+
 def now_utc():
     return datetime.now(timezone.utc)
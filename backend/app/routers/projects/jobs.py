@@ -0,0 +1,211 @@
+import bisect
+import threading
+import uuid
+from datetime import timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+from ... import models, schemas
+from ...config import settings
+from ...database import SessionLocal
+from .bulk import BulkConflictError, apply_bulk_action, bulk_targets, current_rows, notify_bulk, version_conflicts
+from .deps import JOB_STALE_AFTER, get_db, get_read_db, db_route
+from .helpers import build_projects_query, now_utc
+from .sse import notify
+
+router = APIRouter()
+
+def _progress_event(job: models.BulkJob) -> dict:
+    return {
+        "type": "bulk_job_progress", "job_id": job.id, "status": job.status,
+        "total": job.total, "processed": job.processed, "updated": job.updated,
+        "conflicts": len(job.conflicts or []),
+    }
+
+class BulkJobRunner:
+    """Background thread that claims bulk jobs and runs them chunk by chunk.
+
+    Each chunk's project changes, activity events and the job's cursor are
+    committed together, so a job interrupted by a restart resumes at the
+    first unhandled id. A job is claimed with a conditional UPDATE; a
+    `running` job whose heartbeat is older than JOB_STALE_AFTER is assumed
+    orphaned and may be claimed by any process (or worker).
+    """
+
+    def __init__(self, chunk_size: int = settings.bulk_job_chunk_size) -> None:
+        self.chunk_size = max(1, chunk_size)
+        self.token = uuid.uuid4().hex
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="bulk-jobs", daemon=True)
+        self._thread.start()
+        self._wake.set()  # pick up jobs left over by a previous run
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def kick(self) -> None:
+        self._wake.set()
+
+    # ---------- scheduling ----------
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(timeout=JOB_STALE_AFTER)
+            self._wake.clear()
+            while not self._stop.is_set():
+                job_id = self._claim()
+                if job_id is None:
+                    break
+                self._run(job_id)
+
+    def _claim(self) -> Optional[int]:
+        J = models.BulkJob
+        now = now_utc()
+        claimable = or_(
+            J.status == "pending",
+            (J.status == "running") & (J.heartbeat_at < now - timedelta(seconds=JOB_STALE_AFTER)),
+        )
+        with SessionLocal() as db:
+            job_id = db.execute(select(J.id).where(claimable).order_by(J.id).limit(1)).scalar()
+            if job_id is None:
+                return None
+            claimed = db.execute(
+                update(J).where(J.id == job_id, claimable)
+                .values(status="running", worker=self.token, heartbeat_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+        return job_id if claimed else self._claim()
+
+    def _run(self, job_id: int) -> None:
+        while not self._stop.is_set():
+            with SessionLocal() as db:
+                job = db.get(models.BulkJob, job_id)
+                if job is None or job.status != "running" or job.worker != self.token:
+                    return  # finished, or taken over after we looked stale
+                try:
+                    if self._step(db, job):
+                        return
+                except Exception as exc:
+                    db.rollback()
+                    job = db.get(models.BulkJob, job_id)
+                    job.status, job.error, job.finished_at = "failed", str(exc), now_utc()
+                    db.commit()
+                    notify(_progress_event(job))
+                    return
+
+    # ---------- one chunk ----------
+    def _next_ids(self, db: Session, job: models.BulkJob) -> List[int]:
+        selector = job.selector or {}
+        if "ids" in selector:
+            ids = selector["ids"]  # stored sorted
+            start = bisect.bisect_right(ids, job.cursor or 0)
+            return ids[start:start + self.chunk_size]
+        query = build_projects_query(db, **(selector.get("filter") or {}))
+        rows = (
+            query.with_entities(models.Project.id)
+            .filter(models.Project.id > (job.cursor or 0))
+            .order_by(models.Project.id.asc())
+            .limit(self.chunk_size)
+        )
+        return [pid for (pid,) in rows]
+
+    def _step(self, db: Session, job: models.BulkJob) -> bool:
+        """Handle the next chunk and commit it; True once the job is finished."""
+        ids = self._next_ids(db, job)
+        if not ids:
+            job.status, job.finished_at, job.heartbeat_at = "done", now_utc(), now_utc()
+            db.commit()
+            notify(_progress_event(job))
+            return True
+
+        params = job.params or {}
+        raw_versions = (job.selector or {}).get("versions")
+        versions = {int(k): v for k, v in raw_versions.items()} if raw_versions is not None else None
+        current = current_rows(db, ids)
+        conflicts = []
+        if versions is not None:
+            conflicts = version_conflicts(ids, versions, current)
+            stale = {c.id for c in conflicts}
+            ids_ok = [pid for pid in ids if pid not in stale]
+        else:
+            ids_ok = [pid for pid in ids if pid in current]
+        targets = bulk_targets(
+            db, job.action, current, ids_ok, new_status=params.get("new_status"), tag=params.get("tag")
+        )
+        try:
+            changed = apply_bulk_action(
+                db, job.action, targets, versions=versions,
+                new_status=params.get("new_status"), tag=params.get("tag"),
+            )
+        except BulkConflictError:
+            db.rollback()  # raced with another writer: redo this chunk
+            return False
+
+        job.cursor = ids[-1]
+        job.processed = (job.processed or 0) + len(ids)
+        job.updated = (job.updated or 0) + len(changed)
+        if conflicts:
+            job.conflicts = list(job.conflicts or []) + [c.model_dump() for c in conflicts]
+        job.heartbeat_at = now_utc()
+        db.commit()
+
+        notify_bulk(job.action, changed, {pid: status for pid, (_, status) in current.items()})
+        notify(_progress_event(job))
+        return False
+
+runner = BulkJobRunner()
+
+@router.post("/bulk/jobs", response_model=schemas.BulkJobOut, status_code=202)
+@db_route
+def create_bulk_job(payload: schemas.BulkJobCreate, db: Session = Depends(get_db)):
+    if payload.action == "update_status" and not payload.new_status:
+        raise HTTPException(status_code=400, detail="new_status is required")
+    if payload.action in ("add_tag", "remove_tag") and not payload.tag:
+        raise HTTPException(status_code=400, detail="tag is required")
+    if (payload.ids is None) == (payload.filter is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of ids or filter")
+    if payload.versions is not None and payload.ids is None:
+        raise HTTPException(status_code=400, detail="versions requires ids")
+
+    if payload.ids is not None:
+        ids = sorted(set(payload.ids))
+        selector = {"ids": ids}
+        if payload.versions is not None:
+            selector["versions"] = {str(k): v for k, v in payload.versions.items()}
+        total = len(ids)
+    else:
+        flt = payload.filter.model_dump()
+        selector = {"filter": flt}
+        total = build_projects_query(db, **flt).count()
+
+    job = models.BulkJob(
+        action=payload.action,
+        params={"new_status": payload.new_status, "tag": payload.tag},
+        selector=selector,
+        total=total,
+        conflicts=[],
+    )
+    db.add(job)
+    db.commit(); db.refresh(job)
+    runner.kick()
+    notify(_progress_event(job))
+    return job
+
+@router.get("/bulk/jobs/{job_id}", response_model=schemas.BulkJobOut)
+@db_route
+def get_bulk_job(job_id: int, db: Session = Depends(get_read_db)):
+    job = db.get(models.BulkJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Bulk job not found")
+    return job
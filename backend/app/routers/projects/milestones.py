@@ -1,89 +1,88 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 from ... import models, schemas
-from .deps import get_db
-from .helpers import require_project, now_utc
-from .sse import notify
+from .deps import get_db, get_read_db, db_route
+from .helpers import (
+    bump_milestone_counters, conditional_response, json_response, log_event, milestone_out, project_etag, require_project
+)
+from .sse import notify, notify_event, project_labels
 
 router = APIRouter()
 
+def _notify_counters(project_id: int, counters: dict, labels: dict) -> None:
+    """Push the project's new milestone counters (and derived progress) to list/detail views."""
+    notify({"type": "project_updated", "id": project_id, "changed": list(counters), "patch": counters}, **labels)
+
 @router.get("/{project_id}/milestones", response_model=List[schemas.MilestoneOut])
-def list_milestones(project_id: int, db: Session = Depends(get_db)):
-    require_project(db, project_id, allow_deleted=True)
+@db_route
+def list_milestones(
+    project_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
+    etag = project_etag(db, project_id, allow_deleted=True)
+    not_modified = conditional_response(response, etag, if_none_match)
+    if not_modified is not None:
+        return not_modified
     ms = (
         db.query(models.Milestone)
         .filter(models.Milestone.project_id == project_id)
         .order_by(models.Milestone.sort.asc(), models.Milestone.id.asc())
         .all()
     )
-    return [
-        schemas.MilestoneOut(
-            id=m.id, project_id=m.project_id, title=m.title, done=m.done, due_at=m.due_at, sort=m.sort
-        )
-        for m in ms
-    ]
+    return json_response([milestone_out(m) for m in ms], response=response)
 
 @router.post("/{project_id}/milestones", response_model=schemas.MilestoneOut, status_code=201)
+@db_route
 def add_milestone(project_id: int, body: schemas.MilestoneCreate, db: Session = Depends(get_db)):
-    require_project(db, project_id)
+    labels = project_labels(require_project(db, project_id))
     m = models.Milestone(project_id=project_id, title=body.title, done=body.done, due_at=body.due_at, sort=body.sort)
     db.add(m); db.flush()
-    now = now_utc()
-    db.add(models.Event(project_id=project_id, kind="milestone", message=f"Added milestone '{m.title}'", at=now))
-    db.commit(); db.refresh(m)
-    ev = (
-        db.query(models.Event)
-        .filter(models.Event.project_id == project_id, models.Event.at == now)
-        .order_by(models.Event.id.desc())
-        .first()
-    )
-    if ev:
-        notify({"type": "event_created","project_id": project_id,"event": {"id": ev.id, "kind": ev.kind, "message": ev.message, "at": ev.at.isoformat()},})
-    return schemas.MilestoneOut(id=m.id, project_id=m.project_id, title=m.title, done=m.done, due_at=m.due_at, sort=m.sort)
+    out = milestone_out(m)
+    counters = bump_milestone_counters(db, project_id, total=1, done=int(bool(m.done)))
+    ev = log_event(db, project_id, "milestone", f"Added milestone '{m.title}'")
+    db.commit()
+    _notify_counters(project_id, counters, labels)
+    notify_event(ev, **labels)
+    return json_response(out, status_code=201)
 
 @router.put("/{project_id}/milestones/{milestone_id}", response_model=schemas.MilestoneOut)
+@db_route
 def update_milestone(project_id: int, milestone_id: int, body: schemas.MilestoneUpdate, db: Session = Depends(get_db)):
-    require_project(db, project_id)
+    labels = project_labels(require_project(db, project_id))
     m = db.get(models.Milestone, milestone_id)
     if not m or m.project_id != project_id:
         raise HTTPException(status_code=404, detail="Milestone not found")
     before = (m.title, m.done, m.due_at, m.sort)
+    was_done = bool(m.done)
     for k, v in body.model_dump(exclude_unset=True).items():
         setattr(m, k, v)
-    db.commit(); db.refresh(m)
-    after = (m.title, m.done, m.due_at, m.sort)
-    if before != after:
-        now = now_utc()
-        db.add(models.Event(project_id=project_id, kind="milestone", message=f"Updated milestone '{m.title}'", at=now))
-        db.commit()
-        ev = (
-            db.query(models.Event)
-            .filter(models.Event.project_id == project_id, models.Event.at == now)
-            .order_by(models.Event.id.desc())
-            .first()
-        )
-        if ev:
-            notify({"type": "event_created","project_id": project_id,"event": {"id": ev.id, "kind": ev.kind, "message": ev.message, "at": ev.at.isoformat()},})
-    return schemas.MilestoneOut(id=m.id, project_id=m.project_id, title=m.title, done=m.done, due_at=m.due_at, sort=m.sort)
+    out = milestone_out(m)
+    counters = ev = None
+    if bool(m.done) != was_done:
+        counters = bump_milestone_counters(db, project_id, done=1 if m.done else -1)
+    if (m.title, m.done, m.due_at, m.sort) != before:
+        ev = log_event(db, project_id, "milestone", f"Updated milestone '{m.title}'")
+    db.commit()
+    if counters:
+        _notify_counters(project_id, counters, labels)
+    if ev is not None:
+        notify_event(ev, **labels)
+    return json_response(out)
 
 @router.delete("/{project_id}/milestones/{milestone_id}", status_code=204)
+@db_route
 def delete_milestone(project_id: int, milestone_id: int, db: Session = Depends(get_db)):
-    require_project(db, project_id)
+    labels = project_labels(require_project(db, project_id))
     m = db.get(models.Milestone, milestone_id)
     if not m or m.project_id != project_id:
         raise HTTPException(status_code=404, detail="Milestone not found")
-    title = m.title
     db.delete(m)
-    now = now_utc()
-    db.add(models.Event(project_id=project_id, kind="milestone", message=f"Removed milestone '{title}'", at=now))
+    counters = bump_milestone_counters(db, project_id, total=-1, done=-int(bool(m.done)))
+    ev = log_event(db, project_id, "milestone", f"Removed milestone '{m.title}'")
     db.commit()
-    ev = (
-        db.query(models.Event)
-        .filter(models.Event.project_id == project_id, models.Event.at == now)
-        .order_by(models.Event.id.desc())
-        .first()
-    )
-    if ev:
-        notify({"type": "event_created","project_id": project_id,"event": {"id": ev.id, "kind": ev.kind, "message": ev.message, "at": ev.at.isoformat()},})
+    _notify_counters(project_id, counters, labels)
+    notify_event(ev, **labels)
     return
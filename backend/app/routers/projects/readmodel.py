@@ -0,0 +1,285 @@
+import bisect
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ... import models
+from ...config import settings
+from ...database import ReadSessionLocal
+from ...realtime import EventMeta, sse
+from .deps import IN_CHUNK_SIZE
+from .helpers import chunked, decode_cursor, is_relevance_sort, sort_column, str_to_tags
+
+SORTABLE = ("last_updated", "title", "progress")
+INDEXED = ("status", "owner", "health")
+# events that never change a project row
+_NEUTRAL_EVENTS = {"bulk_job_progress", "stats_updated"}
+
+_COLUMNS = (
+    models.Project.id, models.Project.title, models.Project.owner, models.Project.status,
+    models.Project.health, models.Project.tags, models.Project.progress, models.Project.last_updated,
+)
+
+# (not null, value, id): SQLite orders NULLs first ascending, ties broken by id
+OrderKey = Tuple[bool, Any, int]
+
+class ProjectRow:
+    """The columns list queries filter and sort on, for one live project."""
+
+    __slots__ = ("id", "title", "owner", "status", "health", "tags", "progress", "last_updated")
+
+    def __init__(self, id, title, owner, status, health, tags, progress, last_updated) -> None:
+        self.id = id
+        self.title = title
+        self.owner = owner
+        self.status = status
+        self.health = health
+        self.tags = tuple(str_to_tags(tags))
+        self.progress = progress
+        self.last_updated = last_updated
+
+    def key(self, column: str) -> OrderKey:
+        value = getattr(self, column)
+        return (value is not None, value, self.id)
+
+    def as_tuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+class Page:
+    __slots__ = ("ids", "total", "has_more")
+
+    def __init__(self, ids: List[int], total: int, has_more: bool) -> None:
+        self.ids = ids
+        self.total = total
+        self.has_more = has_more
+
+class ReadModel:
+    """In-memory index of non-deleted projects answering filter + sort + page.
+
+    Records live in a dict by id with set indexes per status/owner/health/tag
+    and a sorted (key, id) list per sortable column, mirroring apply_sorting.
+    Mutations only mark ids dirty (from `notify` and from events delivered by
+    other workers); the next query re-reads those rows by primary key before
+    answering, so a writer always sees its own change. Queries the index
+    cannot answer (full-text `q`, deleted rows, other sort columns) return
+    None and fall back to SQL.
+    """
+
+    def __init__(self, enabled: bool = settings.read_model) -> None:
+        self.enabled = enabled
+        self._lock = threading.RLock()
+        self._clear()
+        self._reload = True  # nothing loaded yet
+        self._dirty: Set[int] = set()
+        self.served = 0
+        self.fallbacks = 0
+        self.synced_rows = 0
+
+    def _clear(self) -> None:
+        self.rows: Dict[int, ProjectRow] = {}
+        self._index: Dict[str, Dict[str, Set[int]]] = {name: {} for name in INDEXED + ("tag",)}
+        self._orders: Dict[str, List[OrderKey]] = {column: [] for column in SORTABLE}
+
+    # ---------- maintenance ----------
+    def _add(self, row: ProjectRow) -> None:
+        self.rows[row.id] = row
+        for name in INDEXED:
+            self._index[name].setdefault(getattr(row, name), set()).add(row.id)
+        for tag in row.tags:
+            self._index["tag"].setdefault(tag, set()).add(row.id)
+        for column in SORTABLE:
+            bisect.insort(self._orders[column], row.key(column))
+
+    def _remove(self, project_id: int) -> None:
+        row = self.rows.pop(project_id, None)
+        if row is None:
+            return
+        for name in INDEXED:
+            self._discard(name, (getattr(row, name),), project_id)
+        self._discard("tag", row.tags, project_id)
+        for column in SORTABLE:
+            order = self._orders[column]
+            i = bisect.bisect_left(order, row.key(column))
+            if i < len(order) and order[i][2] == project_id:
+                del order[i]
+
+    def _discard(self, name: str, values: Iterable[Any], project_id: int) -> None:
+        index = self._index[name]
+        for value in values:
+            ids = index.get(value)
+            if ids is not None:
+                ids.discard(project_id)
+                if not ids:
+                    del index[value]
+
+    def load(self, db: Session) -> None:
+        """(Re)build everything from the projects table."""
+        rows = db.execute(select(*_COLUMNS).where(models.Project.deleted_at.is_(None)))
+        with self._lock:
+            self._clear()
+            for r in rows:
+                row = ProjectRow(*r)
+                self.rows[row.id] = row
+                for name in INDEXED:
+                    self._index[name].setdefault(getattr(row, name), set()).add(row.id)
+                for tag in row.tags:
+                    self._index["tag"].setdefault(tag, set()).add(row.id)
+            for column in SORTABLE:
+                self._orders[column] = sorted(row.key(column) for row in self.rows.values())
+            self._reload = False
+            self._dirty.clear()
+
+    def mark(self, meta: EventMeta) -> None:
+        """Note which projects an event touched; they are re-read on the next query."""
+        if not self.enabled or meta.type in _NEUTRAL_EVENTS:
+            return
+        with self._lock:
+            if meta.project_ids:
+                self._dirty |= meta.project_ids
+            else:  # e.g. imports: no ids to go by
+                self._reload = True
+
+    def sync(self) -> None:
+        """Re-read dirty rows. Uses its own session: the caller's read transaction
+        may predate the commits that marked them."""
+        with self._lock:
+            if not (self._reload or self._dirty):
+                return
+            with ReadSessionLocal() as db:
+                if self._reload:
+                    self.load(db)
+                    return
+                dirty, self._dirty = sorted(self._dirty), set()
+                for part in chunked(dirty, IN_CHUNK_SIZE):
+                    fresh = {
+                        r.id: r for r in db.execute(
+                            select(*_COLUMNS).where(models.Project.id.in_(part), models.Project.deleted_at.is_(None))
+                        )
+                    }
+                    for pid in part:
+                        self._remove(pid)
+                        if pid in fresh:
+                            self._add(ProjectRow(*fresh[pid]))
+                    self.synced_rows += len(part)
+
+    # ---------- queries ----------
+    def query(
+        self,
+        *,
+        q: Optional[str] = None,
+        status: Optional[str] = None,
+        owner: Optional[str] = None,
+        tag: Optional[str] = None,
+        health: Optional[str] = None,
+        include_deleted: bool = False,
+        sort_by: str,
+        sort_dir: str,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+    ) -> Optional[Page]:
+        """Ids of one page in apply_sorting order, or None if SQL has to answer.
+
+        Pending changes are not applied here: handlers depend on `synced_read_model`,
+        which calls `sync()` before they run."""
+        column = sort_column(sort_by).key
+        if not self.enabled or q or include_deleted or column not in SORTABLE or is_relevance_sort(sort_by, q):
+            self.fallbacks += 1
+            return None
+        start: Optional[OrderKey] = None
+        if cursor:
+            value, last_id = decode_cursor(cursor, sort_by=sort_by, sort_dir=sort_dir)
+            start = (value is not None, value, last_id)
+        desc = sort_dir.lower() == "desc"
+
+        with self._lock:
+            filters = [(name, value) for name, value in
+                       (("status", status), ("owner", owner), ("tag", tag), ("health", health)) if value]
+            candidates: Optional[Set[int]] = None
+            for name, value in sorted(filters, key=lambda f: len(self._index[f[0]].get(f[1], ()))):
+                ids = self._index[name].get(value, set())
+                candidates = set(ids) if candidates is None else candidates & ids
+            order = self._orders[column]
+            if candidates is None:
+                total, seq, member = len(order), order, None
+            elif len(candidates) * 8 < len(order):
+                # selective filter: sorting the matches beats scanning the full order
+                total, member = len(candidates), None
+                seq = sorted(self.rows[pid].key(column) for pid in candidates)
+            else:
+                total, seq, member = len(candidates), order, candidates
+
+            skip = 0 if cursor else (page - 1) * page_size
+            ids: List[int] = []
+            for key in self._walk(seq, desc, start):
+                if member is not None and key[2] not in member:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                ids.append(key[2])
+                if len(ids) > page_size:
+                    break
+            self.served += 1
+        has_more = len(ids) > page_size if cursor else page * page_size < total
+        return Page(ids[:page_size], total, has_more)
+
+    @staticmethod
+    def _walk(seq: List[OrderKey], desc: bool, start: Optional[OrderKey]) -> Iterator[OrderKey]:
+        if desc:
+            i = len(seq) - 1 if start is None else bisect.bisect_left(seq, start) - 1
+            while i >= 0:
+                yield seq[i]
+                i -= 1
+        else:
+            i = 0 if start is None else bisect.bisect_right(seq, start)
+            while i < len(seq):
+                yield seq[i]
+                i += 1
+
+    # ---------- verification ----------
+    def check_consistency(self, db: Session) -> List[str]:
+        """Differences between the index and the database (empty list = consistent)."""
+        fresh = ReadModel(enabled=True)
+        fresh.load(db)
+        problems: List[str] = []
+        with self._lock:
+            self.sync()
+            for pid in self.rows.keys() - fresh.rows.keys():
+                problems.append(f"project {pid} indexed but deleted or missing")
+            for pid in fresh.rows.keys() - self.rows.keys():
+                problems.append(f"project {pid} missing from the index")
+            for pid in self.rows.keys() & fresh.rows.keys():
+                if self.rows[pid].as_tuple() != fresh.rows[pid].as_tuple():
+                    problems.append(f"project {pid} differs: {self.rows[pid].as_tuple()} != {fresh.rows[pid].as_tuple()}")
+            for name in INDEXED + ("tag",):
+                if self._index[name] != fresh._index[name]:
+                    problems.append(f"{name} index differs")
+            for column in SORTABLE:
+                if self._orders[column] != fresh._orders[column]:
+                    problems.append(f"{column} order differs")
+        return problems
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "enabled": int(self.enabled),
+            "rows": len(self.rows),
+            "served": self.served,
+            "fallbacks": self.fallbacks,
+            "synced_rows": self.synced_rows,
+        }
+
+read_model = ReadModel()
+
+def synced_read_model() -> ReadModel:
+    """Dependency: the read model with pending changes applied.
+
+    `sync()` reads through its own blocking session, so this is a plain def:
+    FastAPI runs it in the threadpool, never on the event loop (DB_ASYNC
+    handlers themselves run on the loop)."""
+    if read_model.enabled:
+        read_model.sync()
+    return read_model
+# events published by other workers (outbox backend) reach this process here
+sse.listeners.append(read_model.mark)
@@ -1,10 +1,47 @@
-import anyio
-from ...realtime import sse as sse_backend
-
-def notify(payload: dict) -> None:
-    """Fire-and-forget SSE broadcast (works from sync routes)."""
-    try:
-        anyio.from_thread.run(sse_backend.broadcast, payload)
-    except RuntimeError:
-        import asyncio
-        asyncio.create_task(sse_backend.broadcast(payload))
+from typing import Iterable, List, Tuple
+from ...events import pipeline
+from ...realtime import EventMeta, Labels, _labels
+from .cache import list_cache
+from .readmodel import read_model
+from .stats import stats_feed
+
+def notify(payload: dict, *, owner: Labels = None, status: Labels = None) -> None:
+    """Fire-and-forget SSE broadcast through the event pipeline.
+
+    `owner`/`status` are the project's routing labels for filtered /stream
+    subscribers (pass old and new values when they change). Safe to call
+    from sync routes (worker thread) and from the event loop (DB_ASYNC);
+    events are coalesced for a few milliseconds before they go out.
+    Cached list pages and read-model rows the event affects are invalidated
+    right away, so the mutating client's next GET never misses its own write,
+    and the stats feed is told to push a fresh delta.
+    """
+    _invalidate([EventMeta(payload)])
+    pipeline.emit(payload, owner, status)
+
+def notify_event(event, *, owner: Labels = None, status: Labels = None) -> None:
+    """Broadcast an activity row returned by `helpers.log_event` (call after commit)."""
+    notify(
+        {
+            "type": "event_created",
+            "project_id": event.project_id,
+            "event": {"id": event.id, "kind": event.kind, "message": event.message, "at": event.at.isoformat()},
+        },
+        owner=owner, status=status,
+    )
+
+def notify_many(events: Iterable[Tuple[dict, Labels, Labels]]) -> None:
+    """`notify` for many (payload, owner, status) triples, handed over in one go."""
+    items = [(payload, _labels(owner), _labels(status)) for payload, owner, status in events]
+    _invalidate([EventMeta(payload) for payload, _, _ in items])
+    pipeline.emit_many(items)
+
+def _invalidate(metas: List[EventMeta]) -> None:
+    list_cache.invalidate_many(metas)
+    for meta in metas:
+        read_model.mark(meta)
+        stats_feed.mark(meta.type)
+
+def project_labels(p) -> dict:
+    """Routing labels of a project, captured before commit expires the instance."""
+    return {"owner": p.owner, "status": p.status}
@@ -0,0 +1,110 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from ... import schemas
+from ...database import ReadSessionLocal
+from ...events import pipeline
+from ...stats import read_stats
+from .deps import get_read_db, db_route, STATS_PUSH_DEBOUNCE, STATS_REFRESH_INTERVAL
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# events that never move an aggregate
+_NEUTRAL_EVENTS = {"bulk_job_progress", "stats_updated"}
+
+def stats_delta(old: Dict[str, object], new: Dict[str, object]) -> Dict[str, object]:
+    """Fields of `new` that differ from `old`; maps carry only changed keys (0 = gone)."""
+    delta: Dict[str, object] = {}
+    for name, value in new.items():
+        before = old.get(name)
+        if isinstance(value, dict):
+            before = before or {}
+            changed = {k: value.get(k, 0) for k in before.keys() | value.keys() if before.get(k, 0) != value.get(k, 0)}
+            if changed:
+                delta[name] = changed
+        elif value != before:
+            delta[name] = value
+    return delta
+
+class StatsFeed:
+    """Background thread pushing `stats_updated` deltas over /stream.
+
+    `notify` marks the feed after every mutation; the thread waits
+    STATS_PUSH_DEBOUNCE so a burst of writes yields one delta, reads the
+    summary table and publishes what changed since its last snapshot. It also
+    re-checks every STATS_REFRESH_INTERVAL, which is how milestones passing
+    their due date reach clients. Values in a delta are absolute, so a client
+    applying them twice (or out of order across workers) converges anyway.
+    A failed refresh (e.g. "database is locked") is logged and retried on the
+    next round; the thread keeps running.
+    """
+
+    def __init__(self, debounce: float = STATS_PUSH_DEBOUNCE, interval: float = STATS_REFRESH_INTERVAL) -> None:
+        self.debounce = debounce
+        self.interval = interval
+        self._last: Optional[Dict[str, object]] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.pushes = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="stats-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def mark(self, event_type: Optional[str] = None) -> None:
+        if event_type not in _NEUTRAL_EVENTS:
+            self._wake.set()
+
+    def _loop(self) -> None:
+        self._refresh()  # baseline
+        while not self._stop.is_set():
+            if self._wake.wait(timeout=self.interval) and self._stop.wait(self.debounce):
+                break
+            self._wake.clear()
+            self._refresh()
+
+    def _refresh(self) -> None:
+        try:
+            self.publish()
+        except Exception:
+            # the last snapshot is kept, so the next successful round pushes the full difference
+            self.errors += 1
+            logger.exception("stats feed refresh failed")
+
+    def publish(self) -> None:
+        """Push the difference between the summary table and the last snapshot."""
+        with ReadSessionLocal() as db:
+            current = read_stats(db)
+        previous, self._last = self._last, current
+        if previous is None:
+            return
+        delta = stats_delta(previous, current)
+        if delta:
+            self.pushes += 1
+            pipeline.emit({"type": "stats_updated", "changes": delta})
+
+    def metrics(self) -> Dict[str, int]:
+        return {"pushes": self.pushes, "errors": self.errors}
+
+stats_feed = StatsFeed()
+
+@router.get("/stats", response_model=schemas.ProjectStats)
+@db_route
+def project_stats(db: Session = Depends(get_read_db)):
+    """Counts by status/health/owner/tag, progress average and histogram, overdue
+    milestones and team capacity, read from the trigger-maintained summary table."""
+    return read_stats(db)
@@ -0,0 +1,32 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ... import models, schemas
+from .deps import get_read_db, db_route
+from .helpers import build_projects_query
+
+router = APIRouter()
+
+@router.get("/tags", response_model=List[schemas.TagCount])
+@db_route
+def tag_counts(
+    db: Session = Depends(get_read_db),
+    q: Optional[str] = Query(None),
+    status: Optional[str] = None,
+    owner: Optional[str] = None,
+    health: Optional[str] = None,
+    include_deleted: bool = False,
+):
+    """Tag facet: number of matching projects per tag (same filters as GET /projects)."""
+    matching = build_projects_query(
+        db, q=q, status=status, owner=owner, health=health, include_deleted=include_deleted
+    ).with_entities(models.Project.id)
+    rows = (
+        db.query(models.ProjectTag.tag, func.count().label("count"))
+        .filter(models.ProjectTag.project_id.in_(matching))
+        .group_by(models.ProjectTag.tag)
+        .order_by(func.count().desc(), models.ProjectTag.tag.asc())
+        .all()
+    )
+    return [schemas.TagCount(tag=tag, count=count) for tag, count in rows]
@@ -1,90 +1,73 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 from ... import models, schemas
-from .deps import get_db
-from .helpers import require_project, now_utc
-from .sse import notify
+from .deps import get_db, get_read_db, db_route
+from .helpers import conditional_response, json_response, log_event, project_etag, require_project, team_member_out
+from .sse import notify_event, project_labels
 
 router = APIRouter()
 
 @router.get("/{project_id}/team", response_model=List[schemas.TeamMemberOut])
-def list_team(project_id: int, db: Session = Depends(get_db)):
-    require_project(db, project_id, allow_deleted=True)
+@db_route
+def list_team(
+    project_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
+    etag = project_etag(db, project_id, allow_deleted=True)
+    not_modified = conditional_response(response, etag, if_none_match)
+    if not_modified is not None:
+        return not_modified
     members = (
         db.query(models.TeamMember)
         .filter(models.TeamMember.project_id == project_id)
         .order_by(models.TeamMember.id.asc())
         .all()
     )
-    return [
-        schemas.TeamMemberOut(
-            id=m.id, project_id=m.project_id, name=m.name, role=m.role, capacity=m.capacity
-        )
-        for m in members
-    ]
+    return json_response([team_member_out(m) for m in members], response=response)
 
 @router.post("/{project_id}/team", response_model=schemas.TeamMemberOut, status_code=201)
+@db_route
 def add_team_member(project_id: int, body: schemas.TeamMemberCreate, db: Session = Depends(get_db)):
-    require_project(db, project_id)
+    labels = project_labels(require_project(db, project_id))
     m = models.TeamMember(project_id=project_id, name=body.name, role=body.role, capacity=body.capacity)
     db.add(m); db.flush()
-    now = now_utc()
-    db.add(models.Event(project_id=project_id, kind="team", message=f"Added {body.name} ({body.role})", at=now))
-    db.commit(); db.refresh(m)
-
-    ev = (
-        db.query(models.Event)
-        .filter(models.Event.project_id == project_id, models.Event.at == now)
-        .order_by(models.Event.id.desc())
-        .first()
-    )
-    if ev:
-        notify({"type": "event_created","project_id": project_id,"event": {"id": ev.id, "kind": ev.kind, "message": ev.message, "at": ev.at.isoformat()},})
-    return schemas.TeamMemberOut(id=m.id, project_id=m.project_id, name=m.name, role=m.role, capacity=m.capacity)
+    out = team_member_out(m)
+    ev = log_event(db, project_id, "team", f"Added {body.name} ({body.role})")
+    db.commit()
+    notify_event(ev, **labels)
+    return json_response(out, status_code=201)
 
 @router.put("/{project_id}/team/{member_id}", response_model=schemas.TeamMemberOut)
+@db_route
 def update_team_member(project_id: int, member_id: int, body: schemas.TeamMemberUpdate, db: Session = Depends(get_db)):
-    require_project(db, project_id)
+    labels = project_labels(require_project(db, project_id))
     m = db.get(models.TeamMember, member_id)
     if not m or m.project_id != project_id:
         raise HTTPException(status_code=404, detail="Team member not found")
     before = (m.name, m.role, m.capacity)
     for k, v in body.model_dump(exclude_unset=True).items():
         setattr(m, k, v)
-    db.commit(); db.refresh(m)
-    after = (m.name, m.role, m.capacity)
-    if before != after:
-        now = now_utc()
-        db.add(models.Event(project_id=project_id, kind="team", message=f"Updated member {m.name}", at=now))
-        db.commit()
-        ev = (
-            db.query(models.Event)
-            .filter(models.Event.project_id == project_id, models.Event.at == now)
-            .order_by(models.Event.id.desc())
-            .first()
-        )
-        if ev:
-            notify({"type": "event_created","project_id": project_id,"event": {"id": ev.id, "kind": ev.kind, "message": ev.message, "at": ev.at.isoformat()},})
-    return schemas.TeamMemberOut(id=m.id, project_id=m.project_id, name=m.name, role=m.role, capacity=m.capacity)
+    out = team_member_out(m)
+    ev = None
+    if (m.name, m.role, m.capacity) != before:
+        ev = log_event(db, project_id, "team", f"Updated member {m.name}")
+    db.commit()
+    if ev is not None:
+        notify_event(ev, **labels)
+    return json_response(out)
 
 @router.delete("/{project_id}/team/{member_id}", status_code=204)
+@db_route
 def delete_team_member(project_id: int, member_id: int, db: Session = Depends(get_db)):
-    require_project(db, project_id)
+    labels = project_labels(require_project(db, project_id))
     m = db.get(models.TeamMember, member_id)
     if not m or m.project_id != project_id:
         raise HTTPException(status_code=404, detail="Team member not found")
-    name = m.name
     db.delete(m)
-    now = now_utc()
-    db.add(models.Event(project_id=project_id, kind="team", message=f"Removed member {name}", at=now))
+    ev = log_event(db, project_id, "team", f"Removed member {m.name}")
     db.commit()
-    ev = (
-        db.query(models.Event)
-        .filter(models.Event.project_id == project_id, models.Event.at == now)
-        .order_by(models.Event.id.desc())
-        .first()
-    )
-    if ev:
-        notify({"type": "event_created","project_id": project_id,"event": {"id": ev.id, "kind": ev.kind, "message": ev.message, "at": ev.at.isoformat()},})
+    notify_event(ev, **labels)
     return
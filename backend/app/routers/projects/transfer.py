@@ -0,0 +1,176 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from ... import models, schemas
+from ...config import settings
+from ...database import ReadSessionLocal, SessionLocal
+from .deps import EXPORT_CHUNK_SIZE, IMPORT_BATCH_SIZE, IN_CHUNK_SIZE
+from .helpers import build_projects_query, chunked, now_utc, progress_from_counts, str_to_tags, tags_to_str
+from .sse import notify
+
+router = APIRouter()
+
+P = models.Project
+PROJECT_COLUMNS = (
+    P.id, P.title, P.description, P.owner, P.status, P.health, P.tags,
+    P.progress, P.last_updated, P.version, P.deleted_at,
+)
+TEAM_COLUMNS = (models.TeamMember.name, models.TeamMember.role, models.TeamMember.capacity)
+MILESTONE_COLUMNS = (models.Milestone.title, models.Milestone.done, models.Milestone.due_at, models.Milestone.sort)
+EVENT_COLUMNS = (models.Event.kind, models.Event.message, models.Event.at)
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _children(db: Session, model, columns: Sequence, ids: List[int], order_by: Sequence) -> Dict[int, List[dict]]:
+    """Child rows of a chunk of projects as plain dicts, one query per IN chunk."""
+    by_project: Dict[int, List[dict]] = {pid: [] for pid in ids}
+    names = [c.key for c in columns]
+    for part in chunked(ids, IN_CHUNK_SIZE):
+        rows = db.execute(
+            select(model.project_id, *columns).where(model.project_id.in_(part)).order_by(model.project_id, *order_by)
+        )
+        for pid, *values in rows:
+            by_project[pid].append(dict(zip(names, values)))
+    return by_project
+
+def _encode_chunk(db: Session, rows: List[Any]) -> str:
+    ids = [r.id for r in rows]
+    team = _children(db, models.TeamMember, TEAM_COLUMNS, ids, (models.TeamMember.id,))
+    milestones = _children(db, models.Milestone, MILESTONE_COLUMNS, ids, (models.Milestone.sort, models.Milestone.id))
+    events = _children(db, models.Event, EVENT_COLUMNS, ids, (models.Event.at, models.Event.id))
+    lines = []
+    for r in rows:
+        record = r._asdict()
+        record["tags"] = str_to_tags(r.tags)
+        record["team"] = team[r.id]
+        record["milestones"] = milestones[r.id]
+        record["events"] = events[r.id]
+        lines.append(json.dumps(record, default=_json_default))
+    lines.append("")
+    return "\n".join(lines)
+
+@router.get("/export")
+def export_projects(
+    q: Optional[str] = Query(None),
+    status: Optional[str] = None,
+    owner: Optional[str] = None,
+    tag: Optional[str] = None,
+    health: Optional[str] = None,
+    include_deleted: bool = False,
+):
+    """Stream matching projects as NDJSON (one project with team, milestones and events per line).
+
+    Rows come from a cursor read EXPORT_CHUNK_SIZE at a time and children
+    are batch-loaded per chunk, so memory stays flat however many projects
+    match. The session lives inside the generator because the response
+    outlives any request-scoped dependency.
+    """
+    def lines() -> Iterator[str]:
+        db = ReadSessionLocal()
+        try:
+            rows = (
+                build_projects_query(
+                    db, q=q, status=status, owner=owner, tag=tag, health=health, include_deleted=include_deleted
+                )
+                .with_entities(*PROJECT_COLUMNS)
+                .order_by(P.id.asc())
+                .yield_per(EXPORT_CHUNK_SIZE)
+            )
+            batch: List[Any] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= EXPORT_CHUNK_SIZE:
+                    yield _encode_chunk(db, batch)
+                    batch = []
+            if batch:
+                yield _encode_chunk(db, batch)
+        finally:
+            db.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def _parse_line(raw: bytes, line_no: int) -> schemas.ProjectRecord:
+    try:
+        return schemas.ProjectRecord.model_validate_json(raw)
+    except ValidationError as exc:
+        err = exc.errors()[0]
+        loc = ".".join(str(part) for part in err["loc"])
+        raise HTTPException(status_code=422, detail=f"line {line_no}: {loc}: {err['msg']}")
+
+def _insert_batch(records: List[schemas.ProjectRecord]) -> List[int]:
+    """Insert one batch of projects and their children in a single transaction."""
+    now = now_utc()
+    rows = []
+    for r in records:
+        total, done = len(r.milestones), sum(1 for m in r.milestones if m.done)
+        rows.append({
+            "title": r.title, "description": r.description, "owner": r.owner,
+            "status": r.status, "health": r.health, "tags": tags_to_str(r.tags),
+            "progress": progress_from_counts(total, done) if settings.derived_progress else r.progress,
+            "milestones_total": total, "milestones_done": done,
+            "last_updated": r.last_updated or now, "version": r.version, "deleted_at": r.deleted_at,
+        })
+    with SessionLocal() as db:
+        ids = db.execute(insert(P).returning(P.id, sort_by_parameter_order=True), rows).scalars().all()
+        tags, team, milestones, events = [], [], [], []
+        for pid, r in zip(ids, records):
+            tags += [{"project_id": pid, "tag": t} for t in str_to_tags(tags_to_str(r.tags))]
+            team += [{"project_id": pid, **m.model_dump()} for m in r.team]
+            milestones += [{"project_id": pid, **m.model_dump()} for m in r.milestones]
+            events += [
+                {"project_id": pid, "kind": e.kind, "message": e.message, "at": e.at or now} for e in r.events
+            ]
+        for model, rows in (
+            (models.ProjectTag, tags), (models.TeamMember, team),
+            (models.Milestone, milestones), (models.Event, events),
+        ):
+            if rows:
+                db.execute(insert(model), rows)
+        db.commit()
+    return ids
+
+@router.post("/import", response_model=schemas.ImportResult)
+async def import_projects(request: Request):
+    """Bulk-insert projects from a streamed NDJSON body (the format of GET /projects/export).
+
+    The body is parsed as it arrives and written IMPORT_BATCH_SIZE lines per
+    transaction; ids in the file are ignored and new ones assigned. A bad
+    line stops the import with 422 naming the line; batches before it stay
+    committed.
+    """
+    imported = batches = line_no = 0
+    pending: List[schemas.ProjectRecord] = []
+
+    async def flush() -> None:
+        nonlocal imported, batches, pending
+        ids = await run_in_threadpool(_insert_batch, pending)
+        imported += len(ids)
+        batches += 1
+        pending = []
+        notify({"type": "projects_imported", "count": len(ids), "first_id": ids[0], "last_id": ids[-1]})
+
+    buf = b""
+    async for chunk in request.stream():
+        buf += chunk
+        *complete, buf = buf.split(b"\n")
+        for raw in complete:
+            line_no += 1
+            if raw.strip():
+                pending.append(_parse_line(raw, line_no))
+                if len(pending) >= IMPORT_BATCH_SIZE:
+                    await flush()
+    if buf.strip():
+        pending.append(_parse_line(buf, line_no + 1))
+    if pending:
+        await flush()
+    return schemas.ImportResult(imported=imported, batches=batches)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -111,6 +111,8 @@ class ProjectUpdate(BaseModel):
 class ProjectOut(ProjectBase):
     id: int
     progress: float
+    milestones_total: int = 0
+    milestones_done: int = 0
     last_updated: datetime
     version: int
     deleted_at: Optional[datetime] = None
@@ -123,14 +125,101 @@ class ProjectOut(ProjectBase):
         from_attributes = True
 
 
+# =========================
+# Batch read
+# =========================
+BatchRelation = Literal["team", "milestones", "events"]
+
+class ProjectBatchRequest(BaseModel):
+    ids: List[int]
+    include: List[BatchRelation] = ["team", "milestones", "events"]
+    fields: Optional[str] = None  # sparse fieldset of the project itself, as in GET /projects/{id}
+    events_limit: int = Field(default=10, ge=1, le=200)
+    include_deleted: bool = False
+
+
+class ProjectBatchItem(BaseModel):
+    project: ProjectOut
+    # only the relations asked for are present
+    team: List[TeamMemberOut] = []
+    milestones: List[MilestoneOut] = []
+    events: List[EventOut] = []
+
+
+class ProjectBatchResponse(BaseModel):
+    projects: Dict[int, ProjectBatchItem]  # keyed by project id
+    missing: List[int]  # requested ids that do not exist (or are soft-deleted)
+
+
+# =========================
+# Export / import (one NDJSON line per project)
+# =========================
+class TeamMemberRecord(TeamMemberBase):
+    capacity: float = Field(default=1.0, ge=0.0, le=1.0)
+
+
+class EventRecord(BaseModel):
+    kind: str = "update"
+    message: str = ""
+    at: Optional[datetime] = None
+
+
+class ProjectRecord(ProjectBase):
+    progress: float = 0.0
+    last_updated: Optional[datetime] = None
+    version: int = 1
+    deleted_at: Optional[datetime] = None
+    team: List[TeamMemberRecord] = []
+    milestones: List[MilestoneBase] = []
+    events: List[EventRecord] = []
+
+
+class ImportResult(BaseModel):
+    imported: int
+    batches: int
+
+
 # =========================
 # List wrapper
 # =========================
 class PaginatedProjects(BaseModel):
     items: List[ProjectOut]
-    total: int
+    total: Optional[int]  # None when the caller asked to skip counting
     page: int
     page_size: int
+    # opaque keyset cursor for the page after this one (None on the last page)
+    next_cursor: Optional[str] = None
+    total_exact: bool = True
+    # change sequence the page reflects at least; pass to GET /projects/changes as `since`
+    watermark: Optional[int] = None
+
+
+class ProjectChanges(BaseModel):
+    """Projects created, updated, soft-deleted or recovered after `since`, oldest change first."""
+    items: List[ProjectOut]  # current state; soft-deleted projects carry deleted_at
+    watermark: int  # the `since` for the next call
+    has_more: bool  # page was full: call again with `watermark`
+
+
+# =========================
+# Facets
+# =========================
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+class ProjectStats(BaseModel):
+    """Dashboard aggregates over non-deleted projects."""
+    total: int
+    by_status: Dict[str, int]
+    by_health: Dict[str, int]
+    by_owner: Dict[str, int]
+    by_tag: Dict[str, int]
+    progress_avg: Optional[float] = None
+    progress_histogram: Dict[str, int]  # "0-9" ... "90-100"
+    overdue_milestones: int
+    team_members: int
+    team_capacity: float
 
 
 # =========================
@@ -141,3 +230,40 @@ class BulkUpdateRequest(BaseModel):
     set_status: Optional[str] = None
     add_tag: Optional[str] = None
     remove_tag: Optional[str] = None
+
+
+# =========================
+# Bulk jobs
+# =========================
+class BulkJobFilter(BaseModel):
+    """Same predicates as GET /projects."""
+    q: Optional[str] = None
+    status: Optional[str] = None
+    owner: Optional[str] = None
+    tag: Optional[str] = None
+    health: Optional[str] = None
+    include_deleted: bool = False
+
+class BulkJobCreate(BaseModel):
+    action: Literal["update_status", "add_tag", "remove_tag"]
+    new_status: Optional[str] = None
+    tag: Optional[str] = None
+    # exactly one of: explicit ids (optionally version-checked) or a filter
+    ids: Optional[List[int]] = None
+    versions: Optional[Dict[int, int]] = None
+    filter: Optional[BulkJobFilter] = None
+
+class BulkJobOut(BaseModel):
+    id: int
+    action: str
+    status: str
+    total: int
+    processed: int
+    updated: int
+    conflicts: List[Dict[str, int]]
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,87 @@
+# app/search.py
+"""SQLite FTS5 index over the searchable project columns.
+
+`projects_fts` is an external-content table: it stores only the inverted
+index and reads column values back from `projects`. Triggers keep it in sync
+with every INSERT/UPDATE/DELETE, so routers (and bulk SQL) never touch it.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, literal_column, text
+from sqlalchemy.engine import Connection, Engine
+
+# Not part of Base.metadata: create_all must not try to create a plain table.
+_fts_metadata = MetaData()
+projects_fts = Table(
+    "projects_fts",
+    _fts_metadata,
+    Column("rowid", Integer, primary_key=True),
+    Column("title", Text),
+    Column("description", Text),
+    Column("tags", Text),
+    Column("owner", Text),
+    Column("rank", Text),  # FTS5 hidden column (bm25 by default)
+)
+
+INDEXED_COLUMNS = ("title", "description", "tags", "owner")
+
+_cols = ", ".join(INDEXED_COLUMNS)
+_new = ", ".join(f"new.{c}" for c in INDEXED_COLUMNS)
+_old = ", ".join(f"old.{c}" for c in INDEXED_COLUMNS)
+
+DDL = [
+    f"""CREATE VIRTUAL TABLE projects_fts USING fts5(
+        {_cols}, content='projects', content_rowid='id', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, {_cols}) VALUES (new.id, {_new});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, {_cols}) VALUES ('delete', old.id, {_old});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE OF {_cols} ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, {_cols}) VALUES ('delete', old.id, {_old});
+        INSERT INTO projects_fts(rowid, {_cols}) VALUES (new.id, {_new});
+    END""",
+]
+
+enabled = False
+
+def _fts5_supported(conn: Connection) -> bool:
+    if conn.dialect.name != "sqlite":
+        return False
+    opts = {row[0] for row in conn.execute(text("PRAGMA compile_options"))}
+    return "ENABLE_FTS5" in opts
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the FTS table and triggers if missing; backfill on first creation."""
+    global enabled
+    with engine.begin() as conn:
+        if not _fts5_supported(conn):
+            enabled = False
+            return
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'")
+        ).first()
+        if not exists:
+            conn.execute(text(DDL[0]))
+        for stmt in DDL[1:]:
+            conn.execute(text(stmt))
+        if not exists:
+            conn.execute(text("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"))
+    enabled = True
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+def match_expression(q: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every term must match as a prefix."""
+    terms = _TOKEN.findall(q)
+    if not terms:
+        return None
+    return " ".join(f'"{t}"*' for t in terms)
+
+def match_clause(expr: str):
+    return literal_column("projects_fts").op("MATCH")(expr)
@@ -1,140 +1,261 @@
+"""Synthetic data generator for demos and load tests.
+
+    python -m app.seed                                   # 5 demo projects
+    python -m app.seed --projects 1000000 --seed 7       # a load-test dataset
+
+Output depends only on --seed, --projects and --anchor, so two runs of the
+same command against empty databases write identical rows. Distributions
+aim at a real portfolio: owners follow a Zipf curve (a few people own most
+projects), team size and milestone counts vary around small means, event
+history has a long tail, and a few percent of projects are soft-deleted.
+Progress of a project with milestones follows them in either progress
+mode (a realistic starting point, and what derived mode would compute);
+only projects without milestones get a random manual value.
+
+Rows are generated --batch projects at a time and written with Core
+executemany inserts, one transaction per batch, so memory stays flat for
+any N. Ids are assigned up front from the current maxima, so children
+reference their project without a RETURNING round trip; run it while no
+other writer is active. Event ids also start above events_archive and the
+AUTOINCREMENT sequence, so an id compaction already moved is never
+reused. Triggers keep search, stats and the change sequence current as
+with any other write.
+"""
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import argparse
+import math
 import random
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, insert, select, text
 
-from .database import SessionLocal
+from .database import engine, init_db
 from . import models
+from .config import settings
+from .routers.projects.helpers import progress_from_counts
 
-# ---------- Demo data ----------
-PROJECT_TITLES = [
-    "Project Alpha", "Project Beta", "Project Gamma",
-    "Project Delta", "Project Epsilon"
+# ---------- Vocabulary ----------
+ADJECTIVES = [
+    "Apollo", "Atlas", "Blue", "Cobalt", "Delta", "Ember", "Falcon", "Granite", "Harbor", "Indigo",
+    "Juniper", "Keystone", "Lumen", "Meridian", "Nimbus", "Orion", "Polar", "Quartz", "Redwood", "Summit",
+]
+NOUNS = [
+    "Migration", "Portal", "Platform", "Redesign", "Rollout", "Integration", "Dashboard", "Pipeline",
+    "Upgrade", "Audit", "Launch", "Onboarding", "Refactor", "Gateway", "Analytics",
+]
+FIRST_NAMES = [
+    "Alice", "Bob", "Charlie", "Diana", "Eve", "Farah", "George", "Hana", "Ivan", "Julia",
+    "Kenji", "Lena", "Marco", "Nadia", "Omar", "Priya", "Quinn", "Rosa", "Sam", "Tariq",
+]
+LAST_NAMES = [
+    "Adams", "Baker", "Chen", "Dubois", "Evans", "Fischer", "Garcia", "Hughes", "Ito", "Jensen",
+    "Kowalski", "Lopez", "Moreau", "Novak", "Okafor", "Petrov", "Rossi", "Silva", "Tanaka", "Weber",
+]
+TAGS = [
+    "backend", "frontend", "infra", "mobile", "data", "security", "compliance", "research", "urgent",
+    "customer", "internal", "q1", "q2", "q3", "q4", "ml", "api", "design", "ops", "billing",
+    "growth", "platform", "migration", "legacy", "performance", "accessibility", "i18n", "payments",
+    "search", "reporting",
+]
+ROLES = ["PM", "Dev", "Dev", "Dev", "QA", "Designer", "Analyst", "DevOps"]
+MILESTONE_TITLES = [
+    "Kickoff", "Discovery", "Requirements", "Design", "Prototype", "MVP", "Alpha", "Beta",
+    "Security review", "Load test", "Launch", "Handover", "Retrospective",
 ]
 
-OWNERS = ["Alice", "Bob", "Charlie", "Diana", "Eve"]
 STATUSES = ["active", "planning", "completed", "inactive"]
+STATUS_WEIGHTS = [55, 15, 20, 10]
 HEALTHS = ["green", "yellow", "red"]
-TAGS = ["frontend", "backend", "demo", "urgent", "research"]
-ROLES = ["PM", "Dev", "QA", "Designer"]
-
-
-# ---------- Helpers ----------
-def pick_tags_str(k: int = 2) -> str:
-    # DB field expects a comma-separated string
-    return ",".join(sorted(random.sample(TAGS, k=k)))
-
-
-def make_team_members(project_id: int) -> list[models.TeamMember]:
-    members: list[models.TeamMember] = []
-    # always at least a PM + 1 dev
-    base = [
-        ("Owner/PM", "PM", 1.0),
-        ("Dev A", "Dev", round(random.uniform(0.6, 1.0), 1)),
-    ]
-    # optionally add 1-2 more from pool
-    extra_cnt = random.randint(0, 2)
-    for _ in range(extra_cnt):
-        name = random.choice(OWNERS)
-        role = random.choice(ROLES)
-        cap = round(random.uniform(0.5, 1.0), 1)
-        base.append((name, role, cap))
-
-    for name, role, cap in base:
-        members.append(
-            models.TeamMember(project_id=project_id, name=name, role=role, capacity=cap)
-        )
-    return members
-
-
-def make_events(project_id: int) -> list[models.Event]:
-    now = datetime.now(timezone.utc)
-    kinds = ["created", "updated", "comment", "progress"]
-    events: list[models.Event] = [
-        models.Event(
-            project_id=project_id,
-            kind="created",
-            message="Project created",
-            at=now - timedelta(days=random.randint(5, 15)),
-        )
-    ]
-    # 2–4 additional events
-    for _ in range(random.randint(2, 4)):
-        k = random.choice(kinds[1:])
-        msg = {
-            "updated": "Fields updated",
-            "comment": "Discussion note added",
-            "progress": f"Progress changed to {random.randint(10,90)}%",
-        }[k]
-        events.append(
-            models.Event(
-                project_id=project_id,
-                kind=k,
-                message=msg,
-                at=now - timedelta(days=random.randint(0, 10)),
-            )
-        )
-    # ensure chronological order is plausible
-    events.sort(key=lambda e: e.at)
-    return events
-
-
-def make_milestones(project_id: int) -> list[models.Milestone]:
-    """
-    Create 3–4 milestones; 1–2 done to give a derived % > 0 sometimes.
-    """
-    titles = ["Kickoff", "Design", "MVP", "Beta", "Launch"]
-    random.shuffle(titles)
-    count = random.randint(3, 4)
-    chosen = titles[:count]
-    ms: list[models.Milestone] = []
-    base_due = datetime.now(timezone.utc) + timedelta(days=7)
-    for i, t in enumerate(chosen, start=1):
-        done = i <= random.randint(1, 2)  # mark first 1–2 as done
-        due = base_due + timedelta(days=7 * (i - 1))
-        ms.append(
-            models.Milestone(
-                project_id=project_id,
-                title=t,
-                done=done,
-                due_at=due,
-                sort=i,
-            )
+HEALTH_WEIGHTS = [60, 25, 15]
+EVENT_KINDS = ["updated", "comment", "progress", "team", "milestone"]
+EVENT_KIND_WEIGHTS = [40, 35, 10, 8, 7]
+TAG_COUNT_WEIGHTS = [10, 25, 30, 20, 10, 5]  # projects with 0..5 tags
+
+OWNER_SKEW = 1.1  # Zipf exponent: higher = fewer owners hold more projects
+TAG_SKEW = 0.8
+HISTORY_DAYS = 730  # projects were created within this many days before the anchor
+DELETED_SHARE = 0.02
+MAX_EVENTS = 2000
+
+_ANCHOR_FORMAT = "%Y-%m-%d"
+
+
+def _zipf_cum_weights(n: int, s: float) -> List[float]:
+    return list(accumulate(1 / (rank + 1) ** s for rank in range(n)))
+
+
+def owner_names(n: int) -> List[str]:
+    """`n` distinct, stable person names ("Alice Adams", ..., "Alice Adams 2", ...)."""
+    names = []
+    pairs = len(FIRST_NAMES) * len(LAST_NAMES)
+    for i in range(n):
+        first, row = i % len(FIRST_NAMES), i // len(FIRST_NAMES)
+        name = f"{FIRST_NAMES[first]} {LAST_NAMES[(first + row) % len(LAST_NAMES)]}"
+        names.append(f"{name} {i // pairs + 1}" if i >= pairs else name)
+    return names
+
+
+class Generator:
+    """Deterministic stream of project batches (rows for every table, ids pre-assigned)."""
+
+    def __init__(self, projects: int, seed: int, anchor: datetime, first_ids: Dict[str, int]) -> None:
+        self.rng = random.Random(seed)
+        self.anchor = anchor
+        self.next_id = dict(first_ids)
+        self.owners = owner_names(max(5, min(int(math.sqrt(projects)), 5000)))
+        self.owner_weights = _zipf_cum_weights(len(self.owners), OWNER_SKEW)
+        self.tag_weights = _zipf_cum_weights(len(TAGS), TAG_SKEW)
+
+    def _take_id(self, table: str) -> int:
+        value = self.next_id[table]
+        self.next_id[table] = value + 1
+        return value
+
+    def batch(self, count: int) -> Dict[str, List[dict]]:
+        rows: Dict[str, List[dict]] = {name: [] for name, _ in TABLES}
+        for owner in self.rng.choices(self.owners, cum_weights=self.owner_weights, k=count):
+            self._project(owner, rows)
+        return rows
+
+    def _project(self, owner: str, rows: Dict[str, List[dict]]) -> None:
+        rng = self.rng
+        pid = self._take_id("projects")
+        status = rng.choices(STATUSES, weights=STATUS_WEIGHTS)[0]
+        created = self.anchor - timedelta(days=HISTORY_DAYS * rng.random() ** 1.5)  # skewed towards recent
+        title = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"
+
+        tag_count = rng.choices(range(6), weights=TAG_COUNT_WEIGHTS)[0]
+        tags = sorted(set(rng.choices(TAGS, cum_weights=self.tag_weights, k=tag_count)))
+        rows["project_tags"] += [{"project_id": pid, "tag": t} for t in tags]
+
+        team_size = min(1 + int(rng.expovariate(1 / 3)), 25)
+        rows["team_members"].append(
+            {"id": self._take_id("team_members"), "project_id": pid, "name": owner, "role": "PM", "capacity": 1.0}
         )
-    return ms
-
-
-# ---------- Seed ----------
-def main():
-    created = 0
-    with SessionLocal() as db:
-        for title in PROJECT_TITLES:
-            p = models.Project(
-                title=title,
-                description=f"This is {title}",
-                owner=random.choice(OWNERS),
-                status=random.choice(STATUSES),
-                health=random.choice(HEALTHS),
-                tags=pick_tags_str(),
-                progress=random.randint(0, 100),  # independent from milestones for now
-                last_updated=datetime.now(timezone.utc),
-            )
-            db.add(p)
-            db.flush()  # get p.id
-
-            # team
-            db.add_all(make_team_members(p.id))
-            # milestones
-            if hasattr(models, "Milestone"):
-                db.add_all(make_milestones(p.id))
-            # activity events
-            db.add_all(make_events(p.id))
-
-            created += 1
-
-        db.commit()
-
-    print(f"Seeded {created} demo projects with team, milestones, and events successfully!")
+        for _ in range(team_size - 1):
+            rows["team_members"].append({
+                "id": self._take_id("team_members"), "project_id": pid,
+                "name": rng.choice(self.owners), "role": rng.choice(ROLES),
+                "capacity": round(rng.uniform(0.2, 1.0), 1),
+            })
+
+        milestone_count = max(0, min(int(rng.gauss(5, 2.5)), len(MILESTONE_TITLES)))
+        done_count = 0
+        for sort, m_title in enumerate(sorted(rng.sample(MILESTONE_TITLES, milestone_count), key=MILESTONE_TITLES.index)):
+            due = created + timedelta(days=14 * (sort + 1) + rng.randint(-3, 10))
+            done = status == "completed" or rng.random() < (0.85 if due < self.anchor else 0.1)
+            done_count += done
+            rows["milestones"].append({
+                "id": self._take_id("milestones"), "project_id": pid, "title": m_title,
+                "done": done, "due_at": due, "sort": sort + 1,
+            })
+
+        # long-tailed history: median ~10 events, a few projects with hundreds
+        event_count = min(int(rng.lognormvariate(2.3, 1.0)), MAX_EVENTS)
+        span = (self.anchor - created).total_seconds()
+        times = sorted(created + timedelta(seconds=span * rng.random()) for _ in range(event_count))
+        kinds = rng.choices(EVENT_KINDS, weights=EVENT_KIND_WEIGHTS, k=event_count)
+        events = [{"id": self._take_id("events"), "project_id": pid, "kind": "created",
+                   "message": f"Project '{title}' created", "at": created}]
+        for at, kind in zip(times, kinds):
+            events.append({"id": self._take_id("events"), "project_id": pid, "kind": kind,
+                           "message": self._message(kind), "at": at})
+        last_updated = events[-1]["at"]
+        deleted_at = None
+        if rng.random() < DELETED_SHARE:
+            deleted_at = last_updated + timedelta(hours=rng.randint(1, 72))
+            events.append({"id": self._take_id("events"), "project_id": pid, "kind": "deleted",
+                           "message": "Soft deleted", "at": deleted_at})
+        rows["events"] += events
+
+        if settings.derived_progress or milestone_count:  # see the module docstring
+            progress = progress_from_counts(milestone_count, done_count)
+        else:
+            progress = 100.0 if status == "completed" else float(rng.randint(0, 95))
+        rows["projects"].append({
+            "id": pid, "title": title, "description": f"{title} for {owner.split()[0]}'s team",
+            "owner": owner, "status": status, "health": rng.choices(HEALTHS, weights=HEALTH_WEIGHTS)[0],
+            "tags": ",".join(tags), "progress": progress,
+            "milestones_total": milestone_count, "milestones_done": done_count,
+            "last_updated": last_updated, "version": 1 + kinds.count("updated"), "deleted_at": deleted_at,
+        })
+
+    def _message(self, kind: str) -> str:
+        rng = self.rng
+        if kind == "updated":
+            return f"Updated: {rng.choice(['status', 'health', 'description', 'tags', 'owner'])}"
+        if kind == "progress":
+            return f"Progress changed to {rng.randint(5, 95)}%"
+        if kind == "team":
+            return f"Added {rng.choice(self.owners)} ({rng.choice(ROLES)})"
+        if kind == "milestone":
+            return f"Updated milestone '{rng.choice(MILESTONE_TITLES)}'"
+        return "Discussion note added"
+
+
+# parents first: the stats and change-sequence triggers on child tables look up their project
+TABLES = [
+    ("projects", models.Project), ("project_tags", models.ProjectTag), ("team_members", models.TeamMember),
+    ("milestones", models.Milestone), ("events", models.Event),
+]
+
+
+def first_ids() -> Dict[str, int]:
+    with engine.connect() as conn:
+        ids = {
+            name: (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+            for name, model in TABLES if name != "project_tags"
+        }
+        archived = conn.execute(select(func.max(models.EventArchive.id))).scalar() or 0
+        issued = conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'events'")).scalar() or 0
+    ids["events"] = max(ids["events"], archived + 1, issued + 1)
+    return ids
+
+
+def seed(projects: int, seed: int = 1, batch: int = 2000, anchor: Optional[datetime] = None) -> Dict[str, int]:
+    """Write `projects` generated projects; returns rows written per table."""
+    anchor = anchor or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    gen = Generator(projects, seed, anchor, first_ids())
+    written = {name: 0 for name, _ in TABLES}
+    started = time.perf_counter()
+    done = 0
+    while done < projects:
+        count = min(batch, projects - done)
+        rows = gen.batch(count)
+        with engine.begin() as conn:
+            for name, model in TABLES:
+                if rows[name]:
+                    conn.execute(insert(model), rows[name])
+                    written[name] += len(rows[name])
+        done += count
+        elapsed = time.perf_counter() - started
+        total = sum(written.values())
+        print(f"{done}/{projects} projects, {total} rows, {total / elapsed:,.0f} rows/s", flush=True)
+    return written
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.seed", description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=5, help="number of projects to generate (default: 5)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed; same seed, same data (default: 1)")
+    parser.add_argument("--batch", type=int, default=2000, help="projects per transaction (default: 2000)")
+    parser.add_argument(
+        "--anchor", type=lambda s: datetime.strptime(s, _ANCHOR_FORMAT).replace(tzinfo=timezone.utc),
+        default=None, help="date the history ends at, YYYY-MM-DD (default: today, UTC)",
+    )
+    args = parser.parse_args(argv)
+
+    init_db()
+    started = time.perf_counter()
+    written = seed(args.projects, seed=args.seed, batch=max(1, args.batch), anchor=args.anchor)
+    elapsed = time.perf_counter() - started
+    total = sum(written.values())
+    print(", ".join(f"{n} {name}" for name, n in written.items()))
+    print(f"Seeded {total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,214 @@
+# app/stats.py
+"""Trigger-maintained dashboard aggregates.
+
+`project_stats` holds one (dim, key) row per aggregated value with a signed
+count `n` and a running `total`:
+
+    status / health / owner / tag   n = live projects with that value
+    progress                        n, total = projects and summed progress per
+                                    10-point bucket ('00'..'09', '' = unset)
+    capacity                        n, total = team members and summed capacity
+    milestone_due                   n = open milestones per due_at value
+
+Only non-deleted projects (and the children of non-deleted projects) count.
+Triggers on projects, project_tags, team_members and milestones apply +1/-1
+deltas on every write, so routers (and bulk SQL) never touch the table and
+reads are a scan of a few hundred rows instead of GROUP BY over projects.
+Overdue milestones are the `milestone_due` rows with a key before now.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+# same text format SQLAlchemy's SQLite DateTime stores, so keys compare as strings
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+COUNTED = ("status", "health", "owner")
+PROGRESS_BUCKETS = [f"{i * 10}-{i * 10 + 9 if i < 9 else 100}" for i in range(10)]
+
+def _bump(dim: str, key: str, n: str, total: str = "0", where: str = "1", source: str = "") -> str:
+    return (
+        f"INSERT INTO project_stats (dim, key, n, total) SELECT '{dim}', {key}, {n}, {total} {source} "
+        f"WHERE {where} ON CONFLICT (dim, key) DO UPDATE SET n = n + excluded.n, total = total + excluded.total;"
+    )
+
+def _progress_key(row: str) -> str:
+    return (
+        f"CASE WHEN {row}.progress IS NULL THEN '' "
+        f"ELSE printf('%02d', min(max(CAST({row}.progress / 10 AS INTEGER), 0), 9)) END"
+    )
+
+def _live(row: str) -> str:
+    return f"{row}.deleted_at IS NULL"
+
+def _project_live(row: str) -> str:
+    return f"EXISTS (SELECT 1 FROM projects WHERE id = {row}.project_id AND deleted_at IS NULL)"
+
+def _project_rows(row: str, sign: str) -> str:
+    """Bumps for one project row's own columns (status/health/owner/progress)."""
+    stmts = [_bump(dim, f"coalesce({row}.{dim}, '')", sign) for dim in COUNTED]
+    stmts.append(_bump("progress", _progress_key(row), sign, f"{sign} * coalesce({row}.progress, 0)"))
+    return "\n".join(stmts)
+
+def _children(pid: str, sign: str) -> str:
+    """Bumps for everything hanging off a project, when it is deleted or recovered."""
+    return "\n".join([
+        _bump("tag", "tag", sign, source="FROM project_tags", where=f"project_id = {pid}"),
+        _bump("capacity", "''", sign, f"{sign} * coalesce(capacity, 0)",
+              source="FROM team_members", where=f"project_id = {pid}"),
+        _bump("milestone_due", "due_at", sign, source="FROM milestones",
+              where=f"project_id = {pid} AND coalesce(done, 0) = 0 AND due_at IS NOT NULL"),
+    ])
+
+_MOVED = "(old.deleted_at IS NULL) <> (new.deleted_at IS NULL)"  # deleted or recovered
+
+def _open_due(row: str) -> str:
+    return f"coalesce({row}.done, 0) = 0 AND {row}.due_at IS NOT NULL AND {_project_live(row)}"
+
+DDL = [
+    """CREATE TABLE IF NOT EXISTS project_stats (
+        dim TEXT NOT NULL,
+        key TEXT NOT NULL,
+        n INTEGER NOT NULL DEFAULT 0,
+        total REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (dim, key)
+    ) WITHOUT ROWID""",
+    # ---- projects ----
+    f"""CREATE TRIGGER IF NOT EXISTS projects_stats_ai AFTER INSERT ON projects
+        WHEN {_live('new')} BEGIN
+        {_project_rows('new', '1')}
+    END""",
+    # BEFORE: children are still there even when a FK cascade removes them
+    f"""CREATE TRIGGER IF NOT EXISTS projects_stats_bd BEFORE DELETE ON projects
+        WHEN {_live('old')} BEGIN
+        {_project_rows('old', '-1')}
+        {_children('old.id', '-1')}
+    END""",
+    *[
+        f"""CREATE TRIGGER IF NOT EXISTS projects_stats_au_{dim} AFTER UPDATE OF {dim}, deleted_at ON projects
+            WHEN old.{dim} IS NOT new.{dim} OR {_MOVED} BEGIN
+            {_bump(dim, f"coalesce(old.{dim}, '')", '-1', where=_live('old'))}
+            {_bump(dim, f"coalesce(new.{dim}, '')", '1', where=_live('new'))}
+        END"""
+        for dim in COUNTED
+    ],
+    f"""CREATE TRIGGER IF NOT EXISTS projects_stats_au_progress AFTER UPDATE OF progress, deleted_at ON projects
+        WHEN old.progress IS NOT new.progress OR {_MOVED} BEGIN
+        {_bump('progress', _progress_key('old'), '-1', '-coalesce(old.progress, 0)', where=_live('old'))}
+        {_bump('progress', _progress_key('new'), '1', 'coalesce(new.progress, 0)', where=_live('new'))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS projects_stats_au_live AFTER UPDATE OF deleted_at ON projects
+        WHEN {_MOVED} BEGIN
+        {_children('new.id', "CASE WHEN new.deleted_at IS NULL THEN 1 ELSE -1 END")}
+    END""",
+    # ---- project_tags ----
+    f"""CREATE TRIGGER IF NOT EXISTS project_tags_stats_ai AFTER INSERT ON project_tags BEGIN
+        {_bump('tag', 'new.tag', '1', where=_project_live('new'))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS project_tags_stats_ad AFTER DELETE ON project_tags BEGIN
+        {_bump('tag', 'old.tag', '-1', where=_project_live('old'))}
+    END""",
+    # ---- team_members ----
+    f"""CREATE TRIGGER IF NOT EXISTS team_members_stats_ai AFTER INSERT ON team_members BEGIN
+        {_bump('capacity', "''", '1', 'coalesce(new.capacity, 0)', where=_project_live('new'))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS team_members_stats_ad AFTER DELETE ON team_members BEGIN
+        {_bump('capacity', "''", '-1', '-coalesce(old.capacity, 0)', where=_project_live('old'))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS team_members_stats_au AFTER UPDATE OF capacity, project_id ON team_members
+        WHEN old.capacity IS NOT new.capacity OR old.project_id IS NOT new.project_id BEGIN
+        {_bump('capacity', "''", '-1', '-coalesce(old.capacity, 0)', where=_project_live('old'))}
+        {_bump('capacity', "''", '1', 'coalesce(new.capacity, 0)', where=_project_live('new'))}
+    END""",
+    # ---- milestones ----
+    f"""CREATE TRIGGER IF NOT EXISTS milestones_stats_ai AFTER INSERT ON milestones BEGIN
+        {_bump('milestone_due', 'new.due_at', '1', where=_open_due('new'))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS milestones_stats_ad AFTER DELETE ON milestones BEGIN
+        {_bump('milestone_due', 'old.due_at', '-1', where=_open_due('old'))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS milestones_stats_au AFTER UPDATE OF done, due_at, project_id ON milestones
+        WHEN old.done IS NOT new.done OR old.due_at IS NOT new.due_at OR old.project_id IS NOT new.project_id BEGIN
+        {_bump('milestone_due', 'old.due_at', '-1', where=_open_due('old'))}
+        {_bump('milestone_due', 'new.due_at', '1', where=_open_due('new'))}
+    END""",
+]
+
+_LIVE_PROJECTS = "SELECT * FROM projects WHERE deleted_at IS NULL"
+_LIVE_IDS = "SELECT id FROM projects WHERE deleted_at IS NULL"
+
+REBUILD = [
+    "DELETE FROM project_stats",
+    *[
+        f"INSERT INTO project_stats (dim, key, n, total) "
+        f"SELECT '{dim}', coalesce({dim}, ''), count(*), 0 FROM ({_LIVE_PROJECTS}) GROUP BY 2"
+        for dim in COUNTED
+    ],
+    f"""INSERT INTO project_stats (dim, key, n, total)
+        SELECT 'progress', {_progress_key('p')}, count(*), coalesce(sum(p.progress), 0)
+        FROM ({_LIVE_PROJECTS}) AS p GROUP BY 2""",
+    f"""INSERT INTO project_stats (dim, key, n, total)
+        SELECT 'tag', tag, count(*), 0 FROM project_tags WHERE project_id IN ({_LIVE_IDS}) GROUP BY tag""",
+    f"""INSERT INTO project_stats (dim, key, n, total)
+        SELECT 'capacity', '', count(*), coalesce(sum(capacity), 0)
+        FROM team_members WHERE project_id IN ({_LIVE_IDS})""",
+    f"""INSERT INTO project_stats (dim, key, n, total)
+        SELECT 'milestone_due', due_at, count(*), 0 FROM milestones
+        WHERE coalesce(done, 0) = 0 AND due_at IS NOT NULL AND project_id IN ({_LIVE_IDS}) GROUP BY due_at""",
+]
+
+def rebuild_stats(conn: Connection) -> None:
+    """Recompute every aggregate from the base tables (initial fill / repair)."""
+    for stmt in REBUILD:
+        conn.execute(text(stmt))
+
+def ensure_stats(engine: Engine) -> None:
+    """Create the summary table and triggers if missing; fill it on first creation."""
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_stats'")
+        ).first()
+        for stmt in DDL:
+            conn.execute(text(stmt))
+        if not exists:
+            rebuild_stats(conn)
+
+def read_stats(conn, now: Optional[datetime] = None) -> Dict[str, object]:
+    """The aggregates in the shape of schemas.ProjectStats (`conn`: Connection or Session)."""
+    by: Dict[str, Dict[str, int]] = {dim: {} for dim in COUNTED + ("tag",)}
+    buckets = dict.fromkeys(PROGRESS_BUCKETS, 0)
+    progress_n, progress_sum = 0, 0.0
+    members, capacity = 0, 0.0
+    rows = conn.execute(
+        text("SELECT dim, key, n, total FROM project_stats WHERE dim != 'milestone_due' AND n != 0")
+    )
+    for dim, key, n, total in rows:
+        if dim in by:
+            by[dim][key] = n
+        elif dim == "progress":
+            if key:
+                buckets[PROGRESS_BUCKETS[int(key)]] = n
+                progress_n += n
+                progress_sum += total
+        elif dim == "capacity":
+            members, capacity = n, total
+    overdue = conn.execute(
+        text("SELECT coalesce(sum(n), 0) FROM project_stats WHERE dim = 'milestone_due' AND key < :now"),
+        {"now": (now or datetime.now(timezone.utc)).strftime(_DATETIME_FORMAT)},
+    ).scalar_one()
+    return {
+        "total": sum(by["status"].values()),
+        "by_status": by["status"],
+        "by_health": by["health"],
+        "by_owner": by["owner"],
+        "by_tag": by["tag"],
+        "progress_avg": round(progress_sum / progress_n, 2) if progress_n else None,
+        "progress_histogram": buckets,
+        "overdue_milestones": int(overdue),
+        "team_members": members,
+        "team_capacity": round(capacity, 4),
+    }
@@ -0,0 +1,72 @@
+"""Reproducible benchmarks for the backend's hot paths.
+
+Run from backend/, one module per measurement, e.g.
+
+    python -m bench.search --projects 100000,1000000
+    python -m bench.serialization
+
+Every benchmark works on a throwaway SQLite file (or an explicit --db) and
+prints a before/after table. Settings are read once at import time, so each
+module calls `use_database()` before importing anything from `app`.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+def use_database(path: Optional[str] = None, **env: str) -> str:
+    """Point the app at `path` (a fresh temp file by default) plus extra settings."""
+    path = path or os.path.join(tempfile.mkdtemp(prefix="pm-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.update(env)
+    return path
+
+
+def sizes(raw: str) -> List[int]:
+    """"100,10000" -> [100, 10000] (argparse type for size lists)."""
+    return [int(part) for part in raw.split(",") if part.strip()]
+
+
+def timed(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Median wall time of `repeat` calls, in seconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def percentiles(samples: Sequence[float], points: Sequence[int] = (50, 90, 99)) -> Dict[int, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {p: float("nan") for p in points}
+    return {p: ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in points}
+
+
+def grow_to(projects: int, seed: int = 7) -> None:
+    """Top the database up to `projects` generated projects (app.seed, quietly)."""
+    import contextlib
+    import io
+
+    from app import models, seed as seeding
+    from app.database import engine
+    from sqlalchemy import func, select
+
+    with engine.connect() as conn:
+        have = conn.execute(select(func.count()).select_from(models.Project)).scalar_one()
+    if have < projects:
+        with contextlib.redirect_stdout(io.StringIO()):
+            seeding.seed(projects - have, seed=seed + have, batch=5000)
+
+
+def table(headers: Sequence[str], rows: Sequence[Sequence[object]]) -> str:
+    cells = [[str(h) for h in headers]] + [[str(c) for c in row] for row in rows]
+    widths = [max(len(r[i]) for r in cells) for i in range(len(headers))]
+    lines = ["  ".join(c.rjust(w) for c, w in zip(row, widths)) for row in cells]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
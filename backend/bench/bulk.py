@@ -0,0 +1,93 @@
+"""POST /projects/bulk execution: per-row ORM (before) vs set-based (after).
+
+    python -m bench.bulk --ids 100,10000,100000
+
+Times the database work of one `update_status` bulk request on the first
+N projects, commit included. "before" is the pre-rewrite path: load every
+row as an ORM object, mutate it, add one Event each, commit, then `db.get`
+every changed id to build the SSE patch. "after" is what the endpoint runs
+now: current_rows + bulk_targets + apply_bulk_action. SSE delivery itself
+is left out of both.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from . import grow_to, sizes, table, use_database
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.bulk", description=__doc__.splitlines()[0])
+    parser.add_argument("--ids", type=sizes, default=[100, 10_000, 100_000], help="comma-separated id counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db", default=None, help="reuse this SQLite file (default: a temp file)")
+    args = parser.parse_args(argv)
+    use_database(args.db)
+
+    from sqlalchemy import select, update
+
+    from app import models
+    from app.database import SessionLocal, init_db
+    from app.routers.projects.bulk import apply_bulk_action, bulk_targets, current_rows
+    from app.routers.projects.helpers import now_utc
+
+    def orm_per_row(db, ids, new_status):
+        projects = db.query(models.Project).filter(models.Project.id.in_(ids)).all()
+        now = now_utc()
+        changed = []
+        for p in projects:
+            if p.status != new_status:
+                p.status = new_status
+                p.version += 1
+                p.last_updated = now
+                db.add(models.Event(project_id=p.id, kind="bulk", message="Bulk updated: status", at=now))
+                changed.append(p.id)
+        db.commit()
+        for pid in changed:
+            p = db.get(models.Project, pid)
+            _ = {"status": p.status}, p.owner
+        return len(changed)
+
+    def set_based(db, ids, new_status):
+        current = current_rows(db, ids)
+        targets = bulk_targets(db, "update_status", current, ids, new_status=new_status)
+        changed = apply_bulk_action(
+            db, "update_status", targets,
+            versions={pid: version for pid, (version, _) in current.items()}, new_status=new_status,
+        )
+        db.commit()
+        return len(changed)
+
+    init_db()
+    grow_to(max(args.ids))
+    with SessionLocal() as db:
+        all_ids = db.execute(select(models.Project.id).order_by(models.Project.id)).scalars().all()
+
+    rows = []
+    for n in args.ids:
+        ids = list(all_ids[:n])
+        result = {}
+        for name, fn in (("before", orm_per_row), ("after", set_based)):
+            samples = []
+            for _ in range(args.repeat):
+                with SessionLocal() as db:
+                    db.execute(update(models.Project).where(models.Project.id.in_(
+                        select(models.Project.id).order_by(models.Project.id).limit(n)
+                    )).values(status="planning"))
+                    db.commit()
+                with SessionLocal() as db:
+                    started = time.perf_counter()
+                    assert fn(db, ids, "active") == n
+                    samples.append(time.perf_counter() - started)
+            result[name] = sorted(samples)[len(samples) // 2]
+        rows.append((
+            f"{n:,}", f"{result['before'] * 1000:,.0f}", f"{n / result['before']:,.0f}",
+            f"{result['after'] * 1000:,.0f}", f"{n / result['after']:,.0f}",
+            f"{result['before'] / result['after']:.1f}x",
+        ))
+    print(table(("ids", "before ms", "before rows/s", "after ms", "after rows/s", "speedup"), rows))
+
+
+if __name__ == "__main__":
+    main()
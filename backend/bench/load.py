@@ -0,0 +1,141 @@
+"""HTTP load test: threadpool handlers (DB_ASYNC=0) vs the async engine (DB_ASYNC=1).
+
+    python -m bench.load --projects 5000 --concurrency 50,500 --duration 10
+
+For each mode a uvicorn worker serves the same seeded database while
+`--concurrency` clients loop over a mix of list pages, project reads and
+event writes. Besides throughput and latency, a probe opens GET /stream
+(served on the event loop in both modes) every 50 ms and times the first
+byte: if handlers block the loop, that number grows with load.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from . import grow_to, percentiles, sizes, table, use_database
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(db: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env={**os.environ, "DATABASE_URL": f"sqlite:///{db}", **env},
+    )
+
+
+async def _wait_ready(client, url: str) -> None:
+    for _ in range(200):
+        try:
+            if (await client.get(f"{url}/health")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.1)
+    raise SystemExit("server did not start")
+
+
+async def _drive(url: str, ids: List[int], concurrency: int, duration: float):
+    import httpx
+
+    latencies: List[float] = []
+    probes: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency + 5, max_keepalive_connections=concurrency + 5)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        await _wait_ready(client, url)
+        deadline = time.perf_counter() + duration
+
+        async def user(rng: random.Random) -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                roll = rng.random()
+                started = time.perf_counter()
+                try:
+                    if roll < 0.6:
+                        r = await client.get("/projects/", params={"page": rng.randint(1, 50), "page_size": 20})
+                    elif roll < 0.9:
+                        r = await client.get(f"/projects/{rng.choice(ids)}")
+                    else:
+                        r = await client.post(f"/projects/{rng.choice(ids)}/events", json={"message": "load"})
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                errors += r.status_code >= 400
+
+        async def probe() -> None:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    async with client.stream("GET", "/stream") as r:
+                        async for _ in r.aiter_raw():
+                            probes.append(time.perf_counter() - started)
+                            break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(probe(), *(user(random.Random(i)) for i in range(concurrency)))
+    return latencies, probes, errors
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.load", description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--concurrency", type=sizes, default=[50, 500], help="comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--list-cache", type=int, default=0, help="LIST_CACHE_SIZE for the server (default: off)")
+    parser.add_argument("--profile", default="production", help="DB_PROFILE for the server (default: production)")
+    args = parser.parse_args(argv)
+    seeded = use_database()
+
+    from sqlalchemy import select
+
+    from app import models
+    from app.database import SessionLocal, init_db
+
+    init_db()
+    grow_to(args.projects)
+    with SessionLocal() as db:
+        ids = db.execute(select(models.Project.id).where(models.Project.deleted_at.is_(None))).scalars().all()
+
+    rows = []
+    for concurrency in args.concurrency:
+        for mode in ("0", "1"):
+            db = f"{seeded}.{mode}.{concurrency}"
+            shutil.copyfile(seeded, db)  # every run starts from the same data
+            port = _free_port()
+            server = _serve(db, port, {"DB_ASYNC": mode, "DB_PROFILE": args.profile, "LIST_CACHE_SIZE": str(args.list_cache)})
+            try:
+                lat, probes, errors = asyncio.run(_drive(f"http://127.0.0.1:{port}", ids, concurrency, args.duration))
+            finally:
+                server.terminate()
+                server.wait()
+            pct, lag = percentiles(lat), percentiles(probes)
+            rows.append((
+                "async" if mode == "1" else "threadpool", concurrency, f"{len(lat) / args.duration:,.0f}", errors,
+                f"{pct[50] * 1000:.0f}", f"{pct[99] * 1000:.0f}", f"{lag[50] * 1000:.1f}", f"{lag[99] * 1000:.1f}",
+            ))
+    print(table(
+        ("mode", "clients", "req/s", "errors", "p50 ms", "p99 ms", "loop probe p50 ms", "loop probe p99 ms"), rows
+    ))
+
+
+if __name__ == "__main__":
+    main()
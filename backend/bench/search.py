@@ -0,0 +1,60 @@
+"""`q` search: LIKE scan (before) vs the FTS5 index (after).
+
+    python -m bench.search --projects 100000,1000000
+
+For each size the same database is grown with app.seed, then every query
+runs the list endpoint's work (count + first page, newest first) once with
+the FTS index disabled, i.e. four `lower(col) LIKE '%q%'` filters, and once
+through `projects_fts MATCH`.
+"""
+from __future__ import annotations
+
+import argparse
+
+from . import grow_to, sizes, table, timed, use_database
+
+QUERIES = ["migration", "apollo portal", "tanaka", "secur", "zzzz"]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.search", description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=sizes, default=[100_000, 1_000_000], help="comma-separated sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db", default=None, help="reuse this SQLite file (default: a temp file)")
+    args = parser.parse_args(argv)
+    use_database(args.db)
+
+    from app import search
+    from app.database import SessionLocal, init_db
+    from app.routers.projects.helpers import apply_sorting, build_projects_query
+
+    init_db()
+    if not search.enabled:
+        raise SystemExit("this SQLite build has no FTS5")
+
+    def run(q: str, use_fts: bool):
+        search.enabled = use_fts
+        try:
+            with SessionLocal() as db:
+                query = build_projects_query(db, q=q)
+                total = query.count()
+                apply_sorting(query, q=q).limit(20).all()
+                return total
+        finally:
+            search.enabled = True
+
+    rows = []
+    for n in args.projects:
+        grow_to(n)
+        for q in QUERIES:
+            like = timed(lambda: run(q, False), args.repeat)
+            fts = timed(lambda: run(q, True), args.repeat)
+            rows.append((
+                f"{n:,}", repr(q), run(q, False), run(q, True),
+                f"{like * 1000:.1f}", f"{fts * 1000:.1f}", f"{like / fts:.1f}x",
+            ))
+    print(table(("projects", "q", "like hits", "fts hits", "like ms", "fts ms", "speedup"), rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Response serialization cost per project: validated (before) vs trusted (after).
+
+    python -m bench.serialization --projects 2000
+
+Rows (projects with their team and 10 recent events) are loaded once; only
+the Python work is timed. "before" is the pre-change path: validated
+ProjectOut/TeamMemberOut/EventOut construction, then FastAPI's own
+serialize_response against the response_model and a JSONResponse.
+"after" is what handlers do now: model_construct plus one pydantic-core
+to_json.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from typing import List
+
+from . import grow_to, table, timed, use_database
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.serialization", description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=2000, help="projects serialized per run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    use_database()
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from pydantic_core import to_json
+
+    from app import models, schemas
+    from app.database import SessionLocal, init_db
+    from app.routers.projects.helpers import (
+        PROJECT_FIELDS, load_recent_events, load_team, project_to_out, str_to_tags,
+    )
+
+    def validated(p, team, events):
+        data = {f: getattr(p, f) for f in PROJECT_FIELDS}
+        data["tags"] = str_to_tags(data["tags"])
+        return schemas.ProjectOut(
+            **data,
+            team=[schemas.TeamMemberOut(id=m.id, project_id=p.id, name=m.name, role=m.role, capacity=m.capacity)
+                  for m in team],
+            recent_events=[schemas.EventOut(id=e.id, project_id=p.id, kind=e.kind, message=e.message, at=e.at)
+                           for e in events],
+        )
+
+    response_field = create_model_field("Response_list_projects", List[schemas.ProjectOut], mode="serialization")
+
+    init_db()
+    grow_to(args.projects)
+    with SessionLocal() as db:
+        projects = db.query(models.Project).limit(args.projects).all()
+        ids = [p.id for p in projects]
+        team, events = load_team(db, ids), load_recent_events(db, ids)
+        db.expunge_all()
+    rows = [(p, team.get(p.id, []), events.get(p.id, [])) for p in projects]
+
+    def before():
+        outs = [validated(*row) for row in rows]
+        content = asyncio.run(serialize_response(field=response_field, response_content=outs))
+        return JSONResponse(content).body
+
+    def after():
+        return to_json([project_to_out(*row) for row in rows])
+
+    assert json.loads(before()) == json.loads(after())
+    n = len(rows)
+    t_before, t_after = timed(before, args.repeat), timed(after, args.repeat)
+    print(table(
+        ("projects", "before us/project", "after us/project", "speedup"),
+        [(f"{n:,}", f"{t_before / n * 1e6:.1f}", f"{t_after / n * 1e6:.1f}", f"{t_before / t_after:.1f}x")],
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""SSE fan-out: delivery latency and reach across worker processes.
+
+    python -m bench.sse_fanout --workers 4 --events 500
+
+Each worker process runs an SSEManager behind a broadcast backend, like a
+uvicorn worker with a connected client. The parent publishes timestamped
+events through its own broadcaster and every process (the publisher
+included) records publish-to-delivery latency. With the in-process backend
+(before) only the publishing process delivers anything; the SQLite outbox
+(after) reaches every worker.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import time
+from typing import List
+
+from . import percentiles, table, use_database
+
+
+def _timed_manager(latencies: List[float], capacity: int):
+    from app.realtime import SSEManager
+
+    class TimedManager(SSEManager):
+        def deliver(self, seq, payload, meta):
+            latencies.append(time.time() - json.loads(payload)["t"])
+            super().deliver(seq, payload, meta)
+
+    manager = TimedManager(capacity=max(capacity, 1))
+    manager.subscribe()
+    return manager
+
+
+def _broadcaster(backend: str, manager, db: str, poll_ms: int):
+    from app.broadcast import InProcessBroadcaster, SQLiteOutboxBroadcaster
+
+    if backend == "sqlite":
+        return SQLiteOutboxBroadcaster(manager, f"sqlite:///{db}", poll_interval=poll_ms / 1000, retention=100_000)
+    return InProcessBroadcaster(manager)
+
+
+def _worker(db: str, backend: str, poll_ms: int, events: int, ready, results) -> None:
+    use_database(db)
+    latencies: List[float] = []
+
+    async def run() -> None:
+        broadcaster = _broadcaster(backend, _timed_manager(latencies, events), db, poll_ms)
+        await broadcaster.start()
+        ready.put(True)
+        deadline = time.monotonic() + 10 + events / 100
+        while len(latencies) < events and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        await broadcaster.stop()
+
+    asyncio.run(run())
+    results.put(latencies)
+
+
+async def _publish(backend: str, db: str, poll_ms: int, events: int, rate: float) -> List[float]:
+    latencies: List[float] = []
+    broadcaster = _broadcaster(backend, _timed_manager(latencies, events), db, poll_ms)
+    await broadcaster.start()
+    for n in range(events):
+        broadcaster.publish_many([({"type": "bench", "n": n, "t": time.time()}, frozenset(), frozenset())])
+        await asyncio.sleep(1 / rate)
+    await asyncio.sleep(0.5)
+    await broadcaster.stop()
+    return latencies
+
+
+def measure(backend: str, db: str, args):
+    ctx = mp.get_context("spawn")
+    ready, results = ctx.Queue(), ctx.Queue()
+    procs = [
+        ctx.Process(target=_worker, args=(db, backend, args.poll_ms, args.events, ready, results))
+        for _ in range(args.workers)
+    ]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        ready.get(timeout=60)
+    own = asyncio.run(_publish(backend, db, args.poll_ms, args.events, args.rate))
+    others = [results.get(timeout=120) for _ in procs]
+    for p in procs:
+        p.join()
+    return own, others
+
+
+def _row(backend: str, where: str, per_process: List[List[float]], events: int):
+    received = [lat for lats in per_process for lat in lats]
+    pct = percentiles(received)
+    return (
+        backend, where, f"{sum(len(l) == events for l in per_process)}/{len(per_process)}",
+        f"{len(received)}/{events * len(per_process)}", *(f"{pct[p] * 1000:.1f}" if received else "-" for p in (50, 90, 99)),
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.sse_fanout", description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=200.0, help="events published per second")
+    parser.add_argument("--poll-ms", type=int, default=50, help="outbox poll interval (SSE_POLL_INTERVAL_MS)")
+    args = parser.parse_args(argv)
+    db = use_database()
+
+    rows = []
+    for backend in ("memory", "sqlite"):
+        own, others = measure(backend, db, args)
+        rows.append(_row(backend, "publisher", [own], args.events))
+        rows.append(_row(backend, "other workers", others, args.events))
+    print(table(("backend", "process", "reached", "deliveries", "p50 ms", "p90 ms", "p99 ms"), rows))
+
+
+if __name__ == "__main__":
+    main()
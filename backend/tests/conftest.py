@@ -0,0 +1,81 @@
+"""Shared fixtures: the app on a throwaway SQLite file.
+
+Settings are read once at import time, so the environment is set before
+anything from `app` is imported.
+"""
+import os
+import tempfile
+import threading
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def indexed_reads(client):
+    """Serve GET /projects from the in-memory read model for one test."""
+    from app.routers.projects.readmodel import read_model
+
+    read_model.enabled, read_model._reload = True, True  # rebuilt on the next query
+    yield read_model
+    read_model.enabled = False
+
+
+@pytest.fixture
+def flush_events(client):
+    """Publish whatever the event pipeline has buffered, on the app's loop."""
+    from app.events import pipeline
+
+    # queued behind any emit already handed to the loop, so those are included
+    return lambda: client.portal.call(pipeline.flush)
+
+
+@pytest.fixture
+def make_project(client):
+    def make(**fields):
+        body = {"title": "Project", "owner": "owner", **fields}
+        r = client.post("/projects/", json=body)
+        assert r.status_code == 201, r.text
+        return r.json()
+    return make
+
+
+def serving_read_engine():
+    """The engine GET handlers query (the async engine's sync facade under DB_ASYNC)."""
+    from app import database
+
+    return database.async_read_engine.sync_engine if database.DB_ASYNC else database.read_engine
+
+
+# the app's background workers query on their own schedule; their statements are not the request's
+BACKGROUND_THREADS = {"stats-feed", "bulk-jobs", "event-compactor"}
+
+
+class StatementCounter:
+    """Counts SQL statements sent to an engine by request handling while active."""
+
+    def __init__(self, engine) -> None:
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        if threading.current_thread().name not in BACKGROUND_THREADS:
+            self.count += 1
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
@@ -0,0 +1,58 @@
+import time
+from datetime import timedelta
+
+from app import models
+from app.database import SessionLocal
+from app.routers.projects.deps import JOB_STALE_AFTER
+from app.routers.projects.helpers import now_utc
+from app.routers.projects.jobs import BulkJobRunner
+
+
+def wait_for_job(client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/projects/bulk/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+def tags(client, pid):
+    return client.get(f"/projects/{pid}").json()["tags"]
+
+
+def test_job_runs_to_completion(client, make_project):
+    ids = [make_project(title=f"Job {i}")["id"] for i in range(3)]
+    r = client.post("/projects/bulk/jobs", json={
+        "action": "update_status", "new_status": "inactive", "ids": ids,
+        "versions": {str(ids[0]): 1, str(ids[1]): 1, str(ids[2]): 99},
+    })
+    assert r.status_code == 202, r.text
+
+    job = wait_for_job(client, r.json()["id"])
+    assert (job["status"], job["total"], job["processed"], job["updated"]) == ("done", 3, 3, 2)
+    assert [c["id"] for c in job["conflicts"]] == [ids[2]]
+    assert [client.get(f"/projects/{pid}").json()["status"] for pid in ids] == ["inactive", "inactive", "active"]
+
+
+def test_job_resumes_after_a_crash(client, make_project):
+    ids = [make_project(title=f"Resume {i}")["id"] for i in range(3)]
+    # a worker handled the first chunk, committed its cursor, then died
+    with SessionLocal() as db:
+        job = models.BulkJob(
+            action="add_tag", params={"tag": "resumed"}, selector={"ids": ids}, total=3, conflicts=[],
+            status="running", worker="crashed", cursor=ids[0], processed=1, updated=1,
+            heartbeat_at=now_utc() - timedelta(seconds=JOB_STALE_AFTER + 1),
+        )
+        db.add(job)
+        db.commit()
+        job_id = job.id
+
+    runner = BulkJobRunner(chunk_size=1)
+    assert runner._claim() == job_id  # stale heartbeat: claimable by anyone
+    runner._run(job_id)
+
+    job = wait_for_job(client, job_id)
+    assert (job["status"], job["processed"], job["updated"]) == ("done", 3, 3)
+    # work resumed after the cursor: the first project's chunk was not redone
+    assert [("resumed" in tags(client, pid)) for pid in ids] == [False, True, True]
@@ -0,0 +1,32 @@
+def changes(client, **params):
+    r = client.get("/projects/changes", params=params)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def head(client):
+    return client.get("/projects/", params={"page_size": 1}).json()["watermark"]
+
+
+def test_delta_sync_pages_updates_and_deletes(client, make_project):
+    since = head(client)
+    updated, deleted, created = (make_project(title=f"Delta {i}") for i in range(3))
+    assert client.put(f"/projects/{updated['id']}", json={"title": "Delta updated"}).status_code == 200
+    assert client.delete(f"/projects/{deleted['id']}").status_code == 204
+
+    first = changes(client, since=since, limit=2, fields="title")
+    assert first["has_more"] is True
+    assert [p["id"] for p in first["items"]] == [created["id"], updated["id"]]
+    assert first["items"][1] == {"id": updated["id"], "title": "Delta updated", "deleted_at": None}
+
+    rest = changes(client, since=first["watermark"], limit=2, fields="title")
+    assert rest["has_more"] is False
+    [gone] = rest["items"]
+    assert gone["id"] == deleted["id"] and gone["deleted_at"] is not None
+
+    assert changes(client, since=rest["watermark"])["items"] == []
+
+
+def test_watermark_ahead_of_head_is_gone(client):
+    r = client.get("/projects/changes", params={"since": head(client) + 1000})
+    assert r.status_code == 410
@@ -0,0 +1,45 @@
+from app.events import coalesce
+
+
+def updated(pid, title="t"):
+    return ({"type": "project_updated", "id": pid, "changed": ["title"], "patch": {"title": title}},
+            frozenset(("o",)), frozenset(("active",)))
+
+
+def other(kind, pid):
+    return ({"type": kind, "id": pid}, frozenset(("o",)), frozenset(("active",)))
+
+
+def summary(items):
+    return [(data["type"], data.get("ids") or data["id"]) for data, _, _ in items]
+
+
+def test_update_is_not_grouped_past_its_projects_delete():
+    out = coalesce([updated(1), other("project_deleted", 1), updated(2)])
+    assert summary(out) == [("project_updated", 1), ("project_deleted", 1), ("project_updated", 2)]
+
+
+def test_group_lands_before_a_later_delete_of_a_member():
+    out = coalesce([updated(1), updated(2), other("project_deleted", 1), updated(3)])
+    assert summary(out) == [("projects_updated", [1, 2]), ("project_deleted", 1), ("project_updated", 3)]
+
+
+def test_updates_are_not_merged_across_delete_and_recover():
+    out = coalesce([
+        updated(1, "a"), other("project_deleted", 1), other("project_recovered", 1), updated(1, "b"),
+    ])
+    assert summary(out) == [
+        ("project_updated", 1), ("project_deleted", 1), ("project_recovered", 1), ("project_updated", 1),
+    ]
+    assert [data["patch"] for data, _, _ in out if data["type"] == "project_updated"] == [{"title": "a"}, {"title": "b"}]
+
+
+def test_update_after_create_stays_after_it():
+    out = coalesce([updated(1), other("project_created", 2), updated(2), updated(1)])
+    assert summary(out) == [("project_created", 2), ("projects_updated", [1, 2])]
+
+
+def test_unrelated_events_do_not_split_groups():
+    progress = ({"type": "bulk_job_progress", "job_id": 1}, frozenset(), frozenset())
+    out = coalesce([updated(1), progress, updated(2)])
+    assert summary(out[1:]) == [("projects_updated", [1, 2])]
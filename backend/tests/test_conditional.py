@@ -0,0 +1,40 @@
+def test_if_none_match_returns_304_until_the_project_changes(client, make_project):
+    p = make_project(title="Etag")
+    r = client.get(f"/projects/{p['id']}")
+    etag = r.headers["ETag"]
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}'):
+        r = client.get(f"/projects/{p['id']}", headers={"If-None-Match": header})
+        assert r.status_code == 304 and r.headers["ETag"] == etag and r.content == b""
+
+    client.post(f"/projects/{p['id']}/events", json={"message": "new activity"})
+    r = client.get(f"/projects/{p['id']}", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["ETag"] != etag
+
+
+def test_list_if_none_match(client, make_project):
+    make_project(title="Etag list", tags=["etag-list"])
+    etag = client.get("/projects/", params={"tag": "etag-list"}).headers["ETag"]
+    r = client.get("/projects/", params={"tag": "etag-list"}, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+    make_project(title="Etag list 2", tags=["etag-list"])
+    r = client.get("/projects/", params={"tag": "etag-list"}, headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.json()["total"] == 2
+
+
+def test_if_match_on_update(client, make_project):
+    p = make_project(title="If-Match")
+    url = f"/projects/{p['id']}"
+    etag = client.get(url).headers["ETag"]
+
+    assert client.put(url, json={"title": "v2"}, headers={"If-Match": etag}).status_code == 200
+    stale = client.put(url, json={"title": "v3"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+
+    assert client.put(url, json={"title": "x"}, headers={"If-Match": "nonsense"}).status_code == 400
+    assert client.put(url, json={"title": "x"}, headers={"If-Match": 'W/"x"'}).status_code == 412
+    assert client.get(url).json()["title"] == "v2"
+
+    assert client.put(url, json={"title": "v3"}, headers={"If-Match": '"2"'}).status_code == 200
+    assert client.put(url, json={"title": "v4"}, headers={"If-Match": "*"}).status_code == 200
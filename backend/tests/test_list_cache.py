@@ -0,0 +1,79 @@
+import pytest
+
+from app.config import settings
+from app.realtime import EventMeta
+from app.routers.projects.cache import ListCache, list_cache
+
+
+def cached(cache, key, ids, fields):
+    _, generation = cache.get(key)
+    cache.put(key, generation, b"{}", ids, frozenset(fields))
+
+
+def test_update_drops_pages_sorted_by_columns_it_bumps():
+    cache = ListCache(max_entries=8, ttl=60)
+    for column in ("version", "last_updated", "change_seq"):
+        cached(cache, column, ids=[5], fields=[column])
+    cached(cache, "title", ids=[5], fields=["title"])
+
+    cache.invalidate(EventMeta({"type": "project_updated", "id": 1, "changed": ["status"]}))
+
+    assert cache.get("title")[0] is not None
+    assert all(cache.get(column)[0] is None for column in ("version", "last_updated", "change_seq"))
+
+
+def test_update_drops_pages_showing_the_project_or_filtering_on_the_change():
+    cache = ListCache(max_entries=8, ttl=60)
+    cached(cache, "shows", ids=[1], fields=["title"])
+    cached(cache, "filters", ids=[2], fields=["status", "title"])
+    cached(cache, "other", ids=[2], fields=["owner", "title"])
+
+    cache.invalidate(EventMeta({"type": "project_updated", "id": 1, "changed": ["status"]}))
+
+    assert cache.get("shows")[0] is None and cache.get("filters")[0] is None
+    assert cache.get("other")[0] is not None
+
+
+def test_neutral_and_structural_events():
+    cache = ListCache(max_entries=8, ttl=60)
+    cached(cache, "page", ids=[1], fields=["title"])
+    cache.invalidate(EventMeta({"type": "stats_updated"}))
+    assert cache.get("page")[0] is not None
+
+    cache.invalidate(EventMeta({"type": "project_deleted", "id": 9}))
+    assert cache.get("page")[0] is None
+
+
+def test_read_racing_a_write_is_not_stored():
+    cache = ListCache(max_entries=8, ttl=60)
+    _, generation = cache.get("page")
+    cache.invalidate(EventMeta({"type": "project_updated", "id": 1, "changed": ["title"]}))
+    cache.put("page", generation, b"{}", [2], frozenset(["title"]))
+    assert cache.get("page")[0] is None
+
+
+def test_cached_version_order_follows_an_update(client, make_project, flush_events):
+    if not list_cache.enabled:
+        pytest.skip("LIST_CACHE_SIZE=0")
+    if settings.sse_backend != "memory":
+        pytest.skip("outbox deliveries invalidate on the poller's schedule")
+    low = make_project(title="Cache low", tags=["cache-version"])
+    high = make_project(title="Cache high", tags=["cache-version"])
+    client.put(f"/projects/{high['id']}", json={"title": "Cache high v2"})
+    flush_events()  # the published events invalidate again; let that happen before caching
+    params = {"tag": "cache-version", "sort_by": "version", "sort_dir": "desc", "page_size": 1}
+
+    def top():
+        r = client.get("/projects/", params=params)
+        assert r.status_code == 200
+        item = r.json()["items"][0]
+        return item["id"], item["version"]
+
+    assert top() == (high["id"], 2)
+    hits = list_cache.hits
+    assert top() == (high["id"], 2) and list_cache.hits == hits + 1
+
+    for i in range(2):
+        r = client.put(f"/projects/{low['id']}", json={"title": f"Cache low v{i + 2}"})
+        assert r.status_code == 200
+    assert top() == (low["id"], 3)
@@ -0,0 +1,31 @@
+from .conftest import StatementCounter, serving_read_engine
+
+
+def test_list_query_count_does_not_grow_with_page_size(client, make_project, flush_events):
+    for i in range(50):
+        p = make_project(title=f"Batch {i}", tags=["batch"], team=[{"name": "n", "role": "Dev", "capacity": 0.5}])
+        for j in range(12):
+            client.post(f"/projects/{p['id']}/events", json={"message": f"m{j}"})
+    # settle the writes' side effects (published events, READ_MODEL=1 sync) outside the count
+    flush_events()
+    client.get("/projects/", params={"tag": "batch", "page_size": 2})
+
+    counts = {}
+    for page_size in (1, 10, 50):
+        with StatementCounter(serving_read_engine()) as counter:
+            r = client.get("/projects/", params={"tag": "batch", "page_size": page_size})
+        assert r.status_code == 200
+        items = r.json()["items"]
+        assert len(items) == page_size
+        assert all(len(p["team"]) == 1 and len(p["recent_events"]) == 10 for p in items)
+        counts[page_size] = counter.count
+
+    assert 0 < counts[1] == counts[10] == counts[50], counts
+
+
+def test_detail_embeds_newest_events_first(client, make_project):
+    p = make_project(title="Detail")
+    for j in range(15):
+        client.post(f"/projects/{p['id']}/events", json={"message": f"m{j}"})
+    events = client.get(f"/projects/{p['id']}").json()["recent_events"]
+    assert [e["message"] for e in events] == [f"m{j}" for j in range(14, 4, -1)]
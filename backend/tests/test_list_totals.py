@@ -0,0 +1,24 @@
+def list_page(client, **params):
+    r = client.get("/projects/", params={"tag": "totals", "page_size": 2, **params})
+    assert r.status_code == 200
+    return r.json()
+
+
+def test_total_exact_follows_the_path_that_counted(client, make_project, indexed_reads):
+    for i in range(5):
+        make_project(title=f"Totals {i}", tags=["totals"])
+
+    page = list_page(client, total_mode="estimate")
+    assert indexed_reads.served > 0
+    assert (page["total"], page["total_exact"]) == (5, True)
+
+    assert list_page(client, total_mode="none")["total_exact"] is False
+
+
+def test_total_exact_from_sql(client, make_project):
+    make_project(title="Totals sql", tags=["totals"])
+    exact = list_page(client, total_mode="exact")
+    assert exact["total_exact"] is True
+    assert list_page(client, total_mode="estimate")["total_exact"] is False
+    none = list_page(client, total_mode="none")
+    assert none["total"] is None and none["total_exact"] is False
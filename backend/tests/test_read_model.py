@@ -0,0 +1,30 @@
+from app.database import SessionLocal
+
+
+def test_read_model_matches_sql_after_mutations(client, make_project, indexed_reads):
+    a = make_project(title="Index A", owner="ana", tags=["rm", "x"])
+    b = make_project(title="Index B", owner="ben", tags=["rm"], team=[{"name": "t", "role": "Dev", "capacity": 1}])
+    c = make_project(title="Index C", owner="cy", status="planning")
+    client.get("/projects/", params={"tag": "rm"})  # index loaded before the writes below
+
+    r = client.put(f"/projects/{a['id']}", json={"status": "completed", "owner": "ben", "tags": ["y"], "progress": 40})
+    assert r.status_code == 200, r.text
+    member = client.post(f"/projects/{b['id']}/team", json={"name": "n", "role": "QA", "capacity": 0.5}).json()
+    assert client.put(f"/projects/{b['id']}/team/{member['id']}", json={"capacity": 0.8}).status_code == 200
+    assert client.delete(f"/projects/{b['id']}/team/{member['id']}").status_code == 204
+    milestone = client.post(f"/projects/{c['id']}/milestones", json={"title": "M1"}).json()
+    assert client.put(f"/projects/{c['id']}/milestones/{milestone['id']}", json={"done": True}).status_code == 200
+    assert client.post(f"/projects/{c['id']}/events", json={"message": "note"}).status_code == 201
+    assert client.delete(f"/projects/{b['id']}").status_code == 204
+    version = client.get(f"/projects/{c['id']}").json()["version"]
+    r = client.post("/projects/bulk", json={"action": "add_tag", "ids": [c["id"]], "versions": {c["id"]: version}, "tag": "rm"})
+    assert r.json()["updated_count"] == 1
+
+    listed = client.get("/projects/", params={"tag": "rm"}).json()
+    assert indexed_reads.served > 0
+    assert [p["id"] for p in listed["items"]] == [c["id"]]
+
+    assert client.post(f"/projects/{b['id']}/recover").status_code == 200
+    with SessionLocal() as db:
+        assert indexed_reads.check_consistency(db) == []
+        assert b["id"] in indexed_reads.rows
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from app import database, migrations, models
+from app.retention import compact_events
+
+OLD = datetime(2000, 1, 1)
+
+
+def test_archive_insert_archive_keeps_every_event(client, make_project):
+    p = make_project(title="Retention")
+    assert client.post(f"/projects/{p['id']}/events", json={"message": "live"}).status_code == 201
+    with database.SessionLocal() as db:
+        imported = models.Event(project_id=p["id"], kind="import", message="imported", at=OLD)
+        db.add(imported)
+        db.commit()
+        archived_id = imported.id
+    assert compact_events(database.engine, timedelta(days=30)) >= 1
+
+    # the newest id now lives only in the archive; a new event must not reuse it
+    new = client.post(f"/projects/{p['id']}/events", json={"message": "after"}).json()
+    assert new["id"] > archived_id
+    with database.engine.begin() as conn:
+        conn.execute(text("UPDATE events SET at = :at WHERE id = :id"), {"at": OLD, "id": new["id"]})
+    assert compact_events(database.engine, timedelta(days=30)) >= 1
+
+    messages = {e["message"] for e in client.get(f"/projects/{p['id']}/events", params={"limit": 50}).json()}
+    assert {"live", "imported", "after"} <= messages
+
+
+def test_events_table_rebuilt_as_autoincrement(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    database.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        # the table as create_all made it before events were AUTOINCREMENT
+        conn.execute(text("DROP TABLE events"))
+        conn.execute(text(
+            "CREATE TABLE events (id INTEGER NOT NULL PRIMARY KEY, project_id INTEGER REFERENCES projects (id) "
+            "ON DELETE CASCADE, kind VARCHAR(50), message TEXT, at DATETIME)"
+        ))
+        conn.execute(text("CREATE INDEX ix_events_project_at_id ON events (project_id, at, id)"))
+        conn.execute(text("CREATE TRIGGER events_probe AFTER INSERT ON events BEGIN SELECT 1; END"))
+        conn.execute(text("INSERT INTO events (id, project_id, kind, message, at) VALUES (1, 1, 'k', 'live', :at)"), {"at": OLD})
+        conn.execute(text("INSERT INTO events_archive (id, project_id, kind, message, at) VALUES (7, 1, 'k', 'old', :at)"), {"at": OLD})
+
+    migrations.add_events_autoincrement(engine)
+    migrations.add_events_autoincrement(engine)  # idempotent
+
+    with engine.begin() as conn:
+        ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'events'")).scalar_one()
+        assert "AUTOINCREMENT" in ddl
+        names = set(conn.execute(text("SELECT name FROM sqlite_master WHERE tbl_name = 'events'")).scalars())
+        assert {"events_probe", "ix_events_project_at_id"} <= names
+        assert conn.execute(text("SELECT message FROM events")).scalars().all() == ["live"]
+        new_id = conn.execute(
+            text("INSERT INTO events (project_id, kind, message, at) VALUES (1, 'k', 'new', :at) RETURNING id"), {"at": OLD}
+        ).scalar_one()
+    assert new_id == 8
+    engine.dispose()
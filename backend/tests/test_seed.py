@@ -0,0 +1,25 @@
+import contextlib
+import io
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app import database, models, seed
+from app.retention import compact_events
+
+
+def test_seed_event_ids_skip_archived_ids(make_project):
+    p = make_project(title="Seed after compaction")
+    with database.SessionLocal() as db:
+        old = models.Event(project_id=p["id"], kind="import", message="old", at=datetime(2000, 1, 1))
+        db.add(old)
+        db.commit()
+        archived_id = old.id
+    compact_events(database.engine, timedelta(days=30))
+
+    assert seed.first_ids()["events"] > archived_id
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed.seed(2, seed=3, anchor=datetime(2026, 1, 1))
+    with database.SessionLocal() as db:
+        assert db.get(models.EventArchive, archived_id).message == "old"
+        assert db.scalar(select(func.min(models.Event.id)).where(models.Event.project_id > p["id"])) > archived_id
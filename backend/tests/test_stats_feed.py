@@ -0,0 +1,28 @@
+import threading
+
+from sqlalchemy.exc import OperationalError
+
+from app.routers.projects.stats import StatsFeed
+
+
+def test_stats_feed_survives_a_failed_refresh(caplog):
+    feed = StatsFeed(debounce=0.01, interval=0.02)
+    calls = []
+    recovered = threading.Event()
+
+    def publish():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OperationalError("SELECT", {}, Exception("database is locked"))
+        if len(calls) >= 3:
+            recovered.set()
+
+    feed.publish = publish
+    feed.start()
+    try:
+        assert recovered.wait(timeout=5)
+        assert feed._thread is not None and feed._thread.is_alive()
+    finally:
+        feed.stop()
+    assert feed.metrics()["errors"] == 1
+    assert "stats feed refresh failed" in caplog.text
@@ -0,0 +1,36 @@
+from app.events import coalesce
+from app.realtime import Filter, SSEManager
+
+
+def updated(pid, status="active", owner="o"):
+    return ({"type": "project_updated", "id": pid, "changed": ["status"], "patch": {"status": status}},
+            frozenset((owner,)), frozenset((status,)))
+
+
+def publish_all(manager, items):
+    for data, owners, statuses in items:
+        manager.publish(data, owners=owners, statuses=statuses)
+
+
+def test_coalesced_update_reaches_type_filtered_subscriber():
+    manager = SSEManager(capacity=16)
+    by_type = manager.subscribe(flt=Filter(types=["project_updated"]))
+    by_project = manager.subscribe(flt=Filter(project_ids=[2]))
+    other_type = manager.subscribe(flt=Filter(types=["project_deleted"]))
+
+    items = coalesce([updated(1), updated(2), updated(3)])
+    assert [data["type"] for data, _, _ in items] == ["projects_updated"]
+    publish_all(manager, items)
+
+    frames = manager.drain(by_type)
+    assert len(frames) == 1 and '"ids": [1, 2, 3]' in frames[0]
+    assert manager.drain(by_project) == frames
+    assert manager.drain(other_type) == []
+
+
+def test_single_update_still_matches_by_type():
+    manager = SSEManager(capacity=16)
+    sub = manager.subscribe(flt=Filter(types=["project_updated"], status="done"))
+    publish_all(manager, coalesce([updated(1, status="done"), updated(2, status="active", owner="x")]))
+    frames = manager.drain(sub)
+    assert len(frames) == 1 and '"id": 1' in frames[0]
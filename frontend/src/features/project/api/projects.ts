@@ -8,6 +8,10 @@ import {
   EventItem,
   ProjectsBulkRequest,
   ProjectsBulkResponse,
+  ProjectStats,
+  ProjectBatchRequest,
+  ProjectBatchResponse,
+  ProjectChanges,
 } from "../types/project";
 import { toTagArray } from "../utils/tags";
 
@@ -22,6 +26,8 @@ const normalizeProject = (p: any): Project => ({
   health: p.health ?? "green",
   tags: toTagArray(p.tags),
   progress: typeof p.progress === "number" ? p.progress : 0,
+  milestones_total: p.milestones_total ?? 0,
+  milestones_done: p.milestones_done ?? 0,
   last_updated: p.last_updated ?? "",
   deleted_at: p.deleted_at ?? null,
   version: p.version ?? 1,
@@ -66,6 +72,9 @@ const buildProjectListQuery = (params: ProjectListParams): string => {
   if (params.health) searchParams.set("health", params.health);
   if (params.search) searchParams.set("search", params.search);
   if (params.include_deleted) searchParams.set("include_deleted", "true");
+  if (params.fields) searchParams.set("fields", params.fields);
+  // list cards never show team / recent events, so skip loading them by default
+  searchParams.set("include", params.include ?? "");
 
   const query = searchParams.toString();
   return query ? `?${query}` : "";
@@ -82,6 +91,8 @@ export const getProjects = async (
     total: number;
     page: number;
     page_size: number;
+    next_cursor?: string | null;
+    watermark?: number;
   }>(`/projects/${query}`);
 
   return {
@@ -89,6 +100,24 @@ export const getProjects = async (
     page: data.page ?? params.page ?? 1,
     page_size: data.page_size ?? params.page_size ?? 10,
     items: Array.isArray(data.items) ? data.items.map(normalizeProject) : [],
+    next_cursor: data.next_cursor ?? null,
+    watermark: data.watermark,
+  };
+};
+
+export const getProjectChanges = async (
+  since: number,
+  limit?: number
+): Promise<ProjectChanges> => {
+  const searchParams = new URLSearchParams({ since: String(since), include: "" });
+  if (limit != null) searchParams.set("limit", String(limit));
+  const data = await http<{ items: any[]; watermark: number; has_more: boolean }>(
+    `/projects/changes?${searchParams}`
+  );
+  return {
+    items: Array.isArray(data.items) ? data.items.map(normalizeProject) : [],
+    watermark: data.watermark,
+    has_more: !!data.has_more,
   };
 };
 
@@ -131,6 +160,29 @@ export const bulkUpdateProjects = async (
   });
 };
 
+export const getProjectStats = async (): Promise<ProjectStats> => {
+  return http<ProjectStats>("/projects/stats");
+};
+
+export const getProjectsBatch = async (
+  payload: ProjectBatchRequest
+): Promise<ProjectBatchResponse> => {
+  const data = await http<{ projects: Record<string, any>; missing: number[] }>(
+    "/projects/batch",
+    { method: "POST", body: JSON.stringify(payload) }
+  );
+  const projects: ProjectBatchResponse["projects"] = {};
+  for (const [id, item] of Object.entries(data.projects ?? {})) {
+    projects[Number(id)] = {
+      project: normalizeProject(item.project),
+      team: item.team?.map(normalizeTeamMember),
+      milestones: item.milestones?.map(normalizeMilestone),
+      events: item.events?.map(normalizeEvent),
+    };
+  }
+  return { projects, missing: data.missing ?? [] };
+};
+
 export const getMilestones = async (
   projectId: number | string
 ): Promise<Milestone[]> => {
@@ -77,8 +77,21 @@ export function useProject(id?: string) {
   useEffect(() => {
     if (!numericId) return;
 
-    const close = openSSE(`${BASE_URL}/stream`, (msg) => {
-      if (msg.type === "project_updated" && msg.id === numericId) {
+    // Server-side filter: only this project's traffic reaches the page.
+    const streamUrl = `${BASE_URL}/stream?project_id=${numericId}`;
+    const close = openSSE(streamUrl, (msg) => {
+      if (msg.type === "resync") {
+        queryClient.invalidateQueries({ queryKey: ["project", numericId] });
+        queryClient.invalidateQueries({ queryKey: ["milestones", numericId] });
+        queryClient.invalidateQueries({ queryKey: ["team", numericId] });
+        queryClient.invalidateQueries({ queryKey: ["events", numericId] });
+        return;
+      }
+
+      if (
+        (msg.type === "project_updated" && msg.id === numericId) ||
+        (msg.type === "projects_updated" && msg.ids.includes(numericId))
+      ) {
         queryClient.setQueryData(
           ["project", numericId],
           (old: Project | undefined) => {
@@ -2,6 +2,7 @@
 import { useEffect, useState } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import {
+  Project,
   ProjectListParams,
   ProjectListResponse,
   ProjectStatus,
@@ -9,6 +10,7 @@ import {
 } from "../types/project";
 import {
   getProjects,
+  getProjectChanges,
   deleteProject,
   bulkUpdateProjects,
 } from "../api/projects";
@@ -47,9 +49,60 @@ export function useProjects(initial: ProjectListParams = {}) {
 
   /* ------------------------- SSE (live updates) ------------------------- */
 
+  // Patch the current page from GET /projects/changes. Falls back to a full
+  // refetch when a change may move projects in or out of the page (or the
+  // page has no watermark / the server no longer knows it).
+  const resyncFromChanges = async () => {
+    const current = queryClient.getQueryData<ProjectListResponse>(["projects", params]);
+    if (current?.watermark == null) {
+      queryClient.invalidateQueries({ queryKey: ["projects"] });
+      return;
+    }
+    try {
+      let since = current.watermark;
+      const changed = new Map<number, Project>();
+      for (;;) {
+        const page = await getProjectChanges(since);
+        page.items.forEach((p) => changed.set(p.id, p));
+        since = page.watermark;
+        if (!page.has_more) break;
+      }
+      const onPage = new Set(current.items.map((p) => p.id));
+      // like the SSE patches: in-place updates only, membership changes refetch
+      const patchable = [...changed.values()].every(
+        (p) => onPage.has(p.id) && !p.deleted_at
+      );
+      if (!patchable) {
+        queryClient.invalidateQueries({ queryKey: ["projects"] });
+        return;
+      }
+      queryClient.setQueryData(
+        ["projects", params],
+        (old: ProjectListResponse | undefined) =>
+          old && {
+            ...old,
+            watermark: since,
+            items: old.items.map((p) => changed.get(p.id) ?? p),
+          }
+      );
+    } catch {
+      queryClient.invalidateQueries({ queryKey: ["projects"] });
+    }
+  };
+
   useEffect(() => {
     const close = openSSE(`${BASE_URL}/stream`, (msg) => {
-      if (msg.type === "project_created" || msg.type === "project_recovered") {
+      if (msg.type === "resync") {
+        // Missed events: ask only for what changed since the page was loaded
+        resyncFromChanges();
+        return;
+      }
+
+      if (
+        msg.type === "project_created" ||
+        msg.type === "project_recovered" ||
+        msg.type === "projects_imported"
+      ) {
         // Refetch all lists (current filters still applied via params in queryKey)
         queryClient.invalidateQueries({ queryKey: ["projects"] });
         return;
@@ -85,6 +138,24 @@ export function useProjects(initial: ProjectListParams = {}) {
             };
           }
         );
+        return;
+      }
+
+      if (msg.type === "projects_updated") {
+        // Same patch for several projects (e.g. a bulk status change)
+        const ids = new Set(msg.ids);
+        queryClient.setQueryData(
+          ["projects", params],
+          (old: ProjectListResponse | undefined) => {
+            if (!old) return old;
+            return {
+              ...old,
+              items: old.items.map((p) =>
+                ids.has(p.id) ? { ...p, ...(msg.patch ?? {}) } : p
+              ),
+            };
+          }
+        );
       }
     });
 
@@ -12,6 +12,9 @@ export interface Project {
   health: ProjectHealth;
   tags: string[];
   progress: number;
+  /** Denormalized milestone counts (progress derives from them when PROGRESS_MODE=derived) */
+  milestones_total: number;
+  milestones_done: number;
   last_updated: string; // ISO date string
   deleted_at?: string | null;
 
@@ -63,6 +66,10 @@ export interface ProjectListParams {
   tag?: string;
   health?: ProjectHealth;
   include_deleted?: boolean;
+  /** Comma-separated project fields to return (sparse fieldset) */
+  fields?: string;
+  /** Comma-separated relations to embed (team, recent_events); "" for none */
+  include?: string;
 }
 
 export interface ProjectListResponse {
@@ -70,6 +77,19 @@ export interface ProjectListResponse {
   total: number;
   page: number;
   page_size: number;
+  /** Opaque keyset cursor for the next page (null on the last page) */
+  next_cursor?: string | null;
+  /** Change sequence the page reflects; `since` for GET /projects/changes */
+  watermark?: number;
+}
+
+/** GET /projects/changes — projects changed after a watermark, oldest change first */
+export interface ProjectChanges {
+  /** Current state; soft-deleted projects carry deleted_at */
+  items: Project[];
+  watermark: number;
+  /** The page was full: call again with `watermark` */
+  has_more: boolean;
 }
 
 /* ------------------------- Bulk Operations Types ------------------------- */
@@ -102,3 +122,50 @@ export interface ProjectsBulkResponse {
 
 /** Useful locally in the UI for selections (id -> version) */
 export type SelectedVersionMap = Map<number, number>;
+
+/* ------------------------- Dashboard Stats Types ------------------------- */
+
+/** GET /projects/stats — aggregates over non-deleted projects */
+export interface ProjectStats {
+  total: number;
+  by_status: Record<string, number>;
+  by_health: Record<string, number>;
+  by_owner: Record<string, number>;
+  by_tag: Record<string, number>;
+  progress_avg: number | null;
+  /** "0-9" ... "90-100" -> number of projects */
+  progress_histogram: Record<string, number>;
+  overdue_milestones: number;
+  team_members: number;
+  team_capacity: number;
+}
+
+/* ------------------------- Batch Read Types ------------------------- */
+
+export type ProjectBatchRelation = "team" | "milestones" | "events";
+
+/** POST /projects/batch — many projects and their sub-resources at once */
+export interface ProjectBatchRequest {
+  ids: number[];
+  /** Relations to return per project (default: all three) */
+  include?: ProjectBatchRelation[];
+  /** Comma-separated project fields, as in GET /projects/{id}?fields= */
+  fields?: string;
+  /** Newest events per project (default 10) */
+  events_limit?: number;
+  include_deleted?: boolean;
+}
+
+export interface ProjectBatchItem {
+  project: Project;
+  team?: TeamMember[];
+  milestones?: Milestone[];
+  events?: EventItem[];
+}
+
+export interface ProjectBatchResponse {
+  /** Keyed by project id */
+  projects: Record<number, ProjectBatchItem>;
+  /** Requested ids that do not exist (or are soft-deleted) */
+  missing: number[];
+}
@@ -14,9 +14,33 @@ export type SSEMessage =
       changed?: string[];
       patch?: Record<string, any>;
     }
+  // The same change applied to several projects (coalesced on the server).
+  | {
+      type: "projects_updated";
+      ids: number[];
+      changed?: string[];
+      patch?: Record<string, any>;
+    }
   | { type: "project_deleted"; id: number }
   | { type: "project_recovered"; id: number }
-  | { type: "event_created"; project_id: number; event: any };
+  | { type: "event_created"; project_id: number; event: any }
+  // One committed batch of POST /projects/import.
+  | { type: "projects_imported"; count: number; first_id: number; last_id: number }
+  // Progress of a background bulk job (POST /projects/bulk/jobs).
+  | {
+      type: "bulk_job_progress";
+      job_id: number;
+      status: "pending" | "running" | "done" | "failed";
+      total: number;
+      processed: number;
+      updated: number;
+      conflicts: number;
+    }
+  // Changed dashboard aggregates (GET /projects/stats shape, changed fields only;
+  // map entries carry their new value, 0 = gone).
+  | { type: "stats_updated"; changes: Record<string, any> }
+  // Server could not replay what we missed (buffer overrun / restart): refetch.
+  | { type: "resync" };
 
 // ---------------------------------------------------------------------------
 // openSSE
@@ -25,6 +49,7 @@ export type SSEMessage =
 //   - connects to the given SSE URL
 //   - parses JSON messages
 //   - calls onMessage ONLY for objects that have a `type` field
+//   - unwraps `batch` frames (several events sent together) in order
 //   - returns a cleanup function that closes the connection
 //
 // In the rest of the app, onMessage receives an SSEMessage, so you can
@@ -44,6 +69,14 @@ export function openSSE(url: string, onMessage: (msg: SSEMessage) => void) {
         return;
       }
 
+      // A backlog of events arrives as one frame; deliver them one by one.
+      if (raw.type === "batch" && Array.isArray(raw.events)) {
+        for (const ev of raw.events) {
+          if (ev && typeof ev.type === "string") onMessage(ev as SSEMessage);
+        }
+        return;
+      }
+
       // At this point we trust the backend to send something matching SSEMessage.
       // TypeScript sees this as SSEMessage, so narrowing by `msg.type` works.
       onMessage(raw as SSEMessage);